@@ -8,6 +8,7 @@ import logging
 import os
 import shutil
 import sys
+from collections import deque
 from datetime import datetime, timezone
 
 # Third-party packages
@@ -18,8 +19,6 @@ from termcolor import colored
 
 # Elastic packages
 from elasticsearch import helpers
-from elasticsearch.helpers import BulkIndexError
-from concurrent.futures import ThreadPoolExecutor
 
 # Local packages
 sys.path.insert(0, os.path.abspath("src"))
@@ -33,8 +32,12 @@ from server.models import *
 load_dotenv()
 
 CWD = os.path.dirname(os.path.abspath(__file__))
-CHUNK_SIZE_ASSETS = 500 # esrs-studio assets
-CHUNK_SIZE_DATA = 50 # content
+CHUNK_BYTES_ASSETS = 5 * 1024 * 1024 # esrs-studio assets
+CHUNK_BYTES_DATA = 2 * 1024 * 1024 # content, which can have large text fields or vectors
+CHUNK_SIZE_MAX = 5000 # docs per bulk request, when the docs are small
+BULK_THREADS = max(1, min(4, (os.cpu_count() or 2) - 1))
+BULK_QUEUE_SIZE = 4 # chunks read ahead of the bulk threads
+PROGRESS_LOG_PERCENT = 5
 SAMPLE_DATA_DIRECTORY = os.path.join(CWD, "sample-data")
 SAMPLE_DATA_INDEX_PREFIX = "esrs-sample-data-"
 SAMPLE_DATASETS = [
@@ -204,25 +207,15 @@ logger.addHandler(ColoredStreamHandler())
 
 ####  Bulk indexing functions  #################################################
 
-def count_lines(filepath):
+def read_jsonl_lines(filepath, transformer, offsets=None):
     """
-    Count the number of lines in a file.
+    Lazily read and yield JSON objects from a .jsonl or .ndjson file. If given
+    a deque, append the number of bytes read after each yielded object.
     """
-    num_lines = 0
-    with open(filepath) as file:
-        for i, line in enumerate(file, start=1):
-            line = line.strip()
-            if not line:
-                continue
-            num_lines += 1
-    return num_lines
-
-def read_jsonl_lines(filepath, transformer):
-    """
-    Lazily read and yield JSON objects from a .jsonl or .ndjson file.
-    """
-    with open(filepath) as file:
-        for i, line in enumerate(file, start=1):
+    bytes_read = 0
+    with open(filepath, "rb") as file:
+        for line in file:
+            bytes_read += len(line)
             line = line.strip()
             if not line:
                 continue
@@ -230,6 +223,8 @@ def read_jsonl_lines(filepath, transformer):
             _id = line["_id"]
             if transformer:
                 line = transformer(line)
+            if offsets is not None:
+                offsets.append(bytes_read)
             yield line, _id
             
 def format_for_bulk(docs_with_ids, index):
@@ -246,57 +241,46 @@ def format_for_bulk(docs_with_ids, index):
         action["_source"] = doc
         yield action
         
-def bulk_index_worker(docs_with_ids, index, deployment):
-    """
-    Perform bulk indexing for a batch of documents.
-    """
-    actions = format_for_bulk(docs_with_ids, index)
-    try:
-        success, errors = helpers.bulk(es(deployment), actions, raise_on_error=False)
-        return success, errors
-    except BulkIndexError as e:
-        logger.error("\nBulk indexing errors:")
-        for error in e.errors:
-            logger.error(json.dumps(error, indent=2))
-        raise
-
-def chunked_iterable(iterable, size=CHUNK_SIZE_DATA):
-    """
-    Split iterable into chunks of given size.
-    """
-    chunk = []
-    for item in iterable:
-        chunk.append(item)
-        if len(chunk) == size:
-            yield chunk
-            chunk = []
-    if chunk:
-        yield chunk
-        
-def parallel_bulk_import(deployment, filepath, index, transformer=None, chunk_size=CHUNK_SIZE_DATA):
-    """
-    Load and index documents from file in parallel using threads.
-    """
-    num_lines = count_lines(filepath)
-    logger.debug(f"Loading {num_lines:,} docs (in batches of {chunk_size:,}) into index: {index}")
-    with ThreadPoolExecutor(max_workers=min(4, os.cpu_count()-1)) as executor:
-        futures = []
-        num_docs = 0
-        num_successes = 0
-        num_errors = 0
-        num_running_total = 0
-        for chunk in chunked_iterable(read_jsonl_lines(filepath, transformer), size=chunk_size):
-            num_docs += len(chunk)
-            futures.append(executor.submit(bulk_index_worker, chunk, index, deployment))
-        for future in futures:
-            successes, errors = future.result()
-            num_successes += successes
-            num_errors += len(errors)
-            num_running_total += successes + len(errors)
-            logger.debug(f"Bulk loading into {index}: {len(errors):,} errors ({num_errors:,} total), {successes:,} successes ({num_running_total:,} total), {(num_running_total / num_docs * 100):.4f}% done")
-            for error in errors:
-                print(f"\n{error}")
-        logger.debug(f"Done. Indexed {num_successes:,} docs with {num_errors:,} errors.")
+def parallel_bulk_import(deployment, filepath, index, transformer=None, chunk_bytes=CHUNK_BYTES_DATA):
+    """
+    Stream documents from a file into an index with parallel bulk requests.
+
+    Bulk requests are split by payload size, up to chunk_bytes each, and only
+    BULK_QUEUE_SIZE of them are read ahead of the bulk threads, so the file is
+    never held in memory. Progress is reported in bytes of the file indexed.
+    """
+    num_bytes = os.path.getsize(filepath)
+    logger.debug(f"Loading {num_bytes:,} bytes of docs (in batches of up to {chunk_bytes:,} bytes) into index: {index}")
+
+    # The bulk helper yields results in the order of the actions, so the
+    # offset of each action is popped in the same order to report progress.
+    offsets = deque()
+    actions = format_for_bulk(read_jsonl_lines(filepath, transformer, offsets), index)
+    results = helpers.parallel_bulk(
+        es(deployment),
+        actions,
+        thread_count=BULK_THREADS,
+        queue_size=BULK_QUEUE_SIZE,
+        chunk_size=CHUNK_SIZE_MAX,
+        max_chunk_bytes=chunk_bytes,
+        raise_on_error=False,
+    )
+    num_successes = 0
+    num_errors = 0
+    bytes_done = 0
+    next_log_percent = PROGRESS_LOG_PERCENT
+    for ok, info in results:
+        bytes_done = offsets.popleft()
+        if ok:
+            num_successes += 1
+        else:
+            num_errors += 1
+            logger.error(json.dumps(info, indent=2))
+        percent = bytes_done / num_bytes * 100 if num_bytes else 100
+        if percent >= next_log_percent:
+            logger.debug(f"Bulk loading into {index}: {num_successes:,} successes, {num_errors:,} errors, {bytes_done:,} of {num_bytes:,} bytes ({percent:.1f}%) done")
+            next_log_percent = (percent // PROGRESS_LOG_PERCENT + 1) * PROGRESS_LOG_PERCENT
+    logger.debug(f"Done. Indexed {num_successes:,} docs with {num_errors:,} errors.")
         
         
 ####  Document formatting functions  ###########################################
@@ -460,7 +444,7 @@ def load_strategies(dataset):
         doc_dict = StrategyCreate.model_validate(doc).serialize()
         doc_dict = utils.copy_fields_to_search("strategies", doc_dict)
         return doc_dict
-    parallel_bulk_import("studio", filepath, "esrs-strategies", transformer, chunk_size=CHUNK_SIZE_ASSETS) 
+    parallel_bulk_import("studio", filepath, "esrs-strategies", transformer, chunk_bytes=CHUNK_BYTES_ASSETS) 
 
 def load_judgements(dataset):
     """
@@ -473,7 +457,7 @@ def load_judgements(dataset):
         doc_dict = JudgementCreate.model_validate(doc).serialize()
         doc_dict = utils.copy_fields_to_search("judgements", doc_dict)
         return doc_dict
-    parallel_bulk_import("studio", filepath, "esrs-judgements", transformer, chunk_size=CHUNK_SIZE_ASSETS)
+    parallel_bulk_import("studio", filepath, "esrs-judgements", transformer, chunk_bytes=CHUNK_BYTES_ASSETS)
 
 def load_scenarios(dataset):
     """
@@ -486,7 +470,7 @@ def load_scenarios(dataset):
         doc_dict = ScenarioCreate.model_validate(doc).serialize()
         doc_dict = utils.copy_fields_to_search("scenarios", doc_dict)
         return doc_dict
-    parallel_bulk_import("studio", filepath, "esrs-scenarios", transformer, chunk_size=CHUNK_SIZE_ASSETS)
+    parallel_bulk_import("studio", filepath, "esrs-scenarios", transformer, chunk_bytes=CHUNK_BYTES_ASSETS)
 
 def load_displays(dataset):
     """
@@ -499,7 +483,7 @@ def load_displays(dataset):
         doc_dict = DisplayCreate.model_validate(doc).serialize()
         doc_dict = utils.copy_fields_to_search("displays", doc_dict)
         return doc_dict
-    parallel_bulk_import("studio", filepath, "esrs-displays", transformer, chunk_size=CHUNK_SIZE_ASSETS)
+    parallel_bulk_import("studio", filepath, "esrs-displays", transformer, chunk_bytes=CHUNK_BYTES_ASSETS)
     
 def load_workspace(dataset):
     """
@@ -514,7 +498,7 @@ def load_workspace(dataset):
         doc_dict = WorkspaceCreate.model_validate(doc).serialize()
         doc_dict = utils.copy_fields_to_search("workspaces", doc_dict)
         return doc_dict
-    parallel_bulk_import("studio", filepath, "esrs-workspaces", transformer, chunk_size=CHUNK_SIZE_ASSETS)
+    parallel_bulk_import("studio", filepath, "esrs-workspaces", transformer, chunk_bytes=CHUNK_BYTES_ASSETS)
 
 def load_dataset_assets(dataset):
     """
@@ -14,6 +14,7 @@ from . import (
     scenarios,
     setup,
     strategies,
+    tool_results,
     workspaces,
 )
 
@@ -28,5 +29,6 @@ __all__ = [
     "scenarios",
     "setup",
     "strategies",
+    "tool_results",
     "workspaces",
 ]
\ No newline at end of file
@@ -9,6 +9,7 @@ import json
 import os
 import re
 import ssl
+import threading
 import time
 import uuid
 from datetime import datetime, timezone
@@ -21,8 +22,10 @@ from fastmcp.client import Client
 from fastmcp.client.transports import StreamableHttpTransport
 
 # App packages
+from .. import utils
 from ..client import es
 from . import conversations as api_conversations
+from . import tool_results as api_tool_results
 
 if TYPE_CHECKING:
     from elasticsearch import Elasticsearch
@@ -59,13 +62,105 @@ def _create_mcp_client(auth: Optional[Any] = None) -> Client:
     return Client(MCP_SERVER_URL, auth=auth)
 
 
-# MCP tools cache
-_tools_cache = None
-_tools_lock = None
+# MCP tool catalogues, keyed by auth identity. Each entry holds the tools in
+# OpenAI function calling format, the catalogue version, and when it loaded.
+TOOL_CATALOGUE_TTL_SECONDS = float(os.getenv("AGENT_TOOL_CATALOGUE_TTL_SECONDS") or "300")
+TOOL_CATALOGUES_MAX_ENTRIES = 256
+_tool_catalogues: Dict[str, Dict[str, Any]] = {}
+_tool_catalogues_refreshing = set()  # identities with a refresh in flight
+_tool_catalogues_lock = threading.Lock()
 
 # Cancellation token system — tracks sessions that have been cancelled
 _cancellation_tokens = set()  # session_ids
 
+# Tool results larger than this many characters are stored out of line in
+# esrs-tool-results and replaced in the message history with a capped digest.
+TOOL_RESULT_INLINE_MAX_CHARS = int(os.getenv("AGENT_TOOL_RESULT_INLINE_MAX_CHARS", "8000"))
+TOOL_RESULT_DIGEST_MAX_CHARS = int(os.getenv("AGENT_TOOL_RESULT_DIGEST_MAX_CHARS", "2000"))
+
+# Read-only tools whose results are memoized for the rest of an agent session,
+# mapped to the asset types that their results depend on.
+MEMOIZED_TOOLS = {
+    "workspaces_search": frozenset({"workspaces", "displays", "scenarios", "judgements", "strategies", "benchmarks"}),
+    "workspaces_get": frozenset({"workspaces"}),
+    "displays_search": frozenset({"displays"}),
+    "displays_get": frozenset({"displays"}),
+    "scenarios_search": frozenset({"scenarios", "judgements"}),
+    "scenarios_tags": frozenset({"scenarios"}),
+    "scenarios_get": frozenset({"scenarios"}),
+    "judgements_search": frozenset({"judgements", "content"}),
+    "strategies_search": frozenset({"strategies"}),
+    "strategies_tags": frozenset({"strategies"}),
+    "strategies_get": frozenset({"strategies"}),
+    "benchmarks_search": frozenset({"benchmarks", "evaluations"}),
+    "benchmarks_tags": frozenset({"benchmarks"}),
+    "benchmarks_get": frozenset({"benchmarks"}),
+    "benchmarks_make_candidate_pool": frozenset({"benchmarks", "strategies", "scenarios", "judgements"}),
+    "content_search": frozenset({"content"}),
+    "content_mappings_browse": frozenset({"content"}),
+    "tool_results_get": frozenset({"tool_results"}),
+}
+
+# Asset types changed by tools that cascade to other asset types. Any other
+# tool that isn't memoized is assumed to change the asset type in its prefix.
+MUTATED_ASSET_TYPES = {
+    "workspaces_delete": frozenset({"workspaces", "displays", "scenarios", "judgements", "strategies", "benchmarks", "evaluations"}),
+    "scenarios_delete": frozenset({"scenarios", "judgements"}),
+    "scenarios_bulk": frozenset({"scenarios", "judgements"}),
+}
+
+# Tools offered to the model on every page
+CORE_TOOLS = frozenset({"workspaces_search", "workspaces_get", "tool_results_get"})
+
+# Asset types whose tools are offered on each page, keyed by the page segment
+# of ui_context.url.path ("workspace" is the workspace overview and None is
+# any page outside of a workspace). Other tools stay available to the model
+# through the discover_tools tool.
+PAGE_TOOL_ASSET_TYPES = {
+    None: frozenset({"workspaces", "setup"}),
+    "workspace": frozenset({"workspaces", "displays", "scenarios", "judgements", "strategies", "benchmarks", "evaluations"}),
+    "displays": frozenset({"displays", "content"}),
+    "scenarios": frozenset({"scenarios", "judgements", "displays", "content"}),
+    "judgements": frozenset({"judgements", "scenarios", "displays", "content"}),
+    "strategies": frozenset({"strategies", "scenarios", "judgements", "displays", "content"}),
+    "benchmarks": frozenset({"benchmarks", "evaluations", "strategies", "scenarios"}),
+}
+
+DISCOVER_TOOLS_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "discover_tools",
+        "description": (
+            "List the tools that are not offered on the current page, or enable some of them. "
+            "Call without arguments to list the names and summaries of the other tools. "
+            "Call with `names` to enable those tools for the rest of this round."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Names of tools to enable.",
+                }
+            },
+        },
+    },
+}
+
+# Maximum number of tool calls from one LLM response that run concurrently
+TOOL_CONCURRENCY = max(1, int(os.getenv("AGENT_TOOL_CONCURRENCY") or "4"))
+
+# Conversation history sent to the model is compacted to fit this budget of
+# estimated tokens. The most recent rounds are always kept verbatim.
+HISTORY_TOKEN_BUDGET = int(os.getenv("AGENT_HISTORY_TOKEN_BUDGET", "64000"))
+HISTORY_KEEP_RECENT_ROUNDS = max(1, int(os.getenv("AGENT_HISTORY_KEEP_RECENT_ROUNDS", "3")))
+HISTORY_SUMMARY_MAX_CHARS = 500
+
+# Tools whose results are always kept inline. Expanding a stored result must
+# not be offloaded again, and image payloads are consumed by the model as-is.
+TOOLS_NEVER_OFFLOADED = frozenset({"tool_results_get", "get_base64_image_from_url"})
+
 # Agent configuration
 SYSTEM_PROMPT = """
 You are an expert in Elasticsearch and search relevance engineering. You help
@@ -206,8 +301,10 @@ The typical search relevance engineering workflow:
     - Use `benchmarks_make_candidate_pool` to generate candidate documents for evaluation.
 7. **Run evaluations** for a benchmark.
     - A worker process executes these asynchronously. It may take seconds or minutes.
-    - Use `evaluations_get` to check completion status.
+    - Use `evaluations_get` with `projection: "summary"` to check completion status.
 8. **Analyze results.** The `summary` field contains relevance metrics for each `strategy_id` or `strategy_tag`.
+    - Use `evaluations_results` to page through the metrics and hits of each strategy and scenario,
+      filtered by `strategy_id` or `scenario_id`. Avoid `evaluations_get` with `projection: "full"`.
 9. **Iterate and improve:**
     - Create additional scenarios; adjust tags on scenarios, strategies, or benchmarks.
     - Set or correct judgement ratings.
@@ -350,13 +447,33 @@ is a valuable signal for relevance.
 - If an evaluation is still running, let the user know and offer to check again.
 - Never silently swallow errors.
 
+### Tools for the current page
+
+Only the tools relevant to the page that the user is on are offered. If you
+need a tool that isn't offered, call `discover_tools` to list the other tools,
+and call it again with their `names` to enable them.
+
+### Large tool results
+
+Tool results that are too large to include in full are replaced with a
+shortened `digest` and a `tool_result_ref`. The digest is often enough to
+answer. When you need the rest, call `tool_results_get` with
+`tool_result_ref._id`, and continue from `next_offset` if needed.
+
 ### Pagination
 
 Search tools default to `size: 10`. When comprehensive results are needed,
 increase the `size` parameter. Use the `page` parameter to paginate through
-large result sets. Set `aggs: true` when aggregation data (like tag counts)
+a few pages. To go through large result sets, use `cursor` instead: pass
+`"start"` for the first page, then the `next_cursor` of each response with the
+same search parameters, until `next_cursor` is null. Set `aggs: true` when aggregation data (like tag counts)
 would be useful.
 
+Search tools return a `"summary"` projection of each asset by default, which
+omits large fields such as the `results` and `runtime` of evaluations. Get
+tools return every field. Pass `projection: "full"` to a search tool for every
+field, or a list of fields (e.g. `["name", "tags"]`) to return only those.
+
 ## Guardrails
 
 - **Only use parameters listed in a tool's description.** Each tool only
@@ -501,6 +618,25 @@ def cleanup_cancellation_token(session_id: str):
 
 ####  Conversation Persistence  ###############################################
 
+def _model_usage_from_stats(stats: Dict[str, Any], inference_id: str) -> Dict[str, Any]:
+    """Build the model_usage dict of a round from the agent loop stats.
+
+    Args:
+        stats: The stats dict maintained by the agent loop.
+        inference_id: The inference endpoint ID used for this round.
+    """
+    model_usage = {
+        "inference_id": inference_id,
+        "llm_calls": stats["llm_calls"],
+        "input_tokens": stats["total_input_tokens"],
+        "output_tokens": stats["total_output_tokens"],
+    }
+    for key in ("history_tokens_before", "history_tokens_after", "tool_tokens_before", "tool_tokens_after"):
+        if stats.get(key) is not None:
+            model_usage[key] = stats[key]
+    return model_usage
+
+
 def _apply_stats_to_round(rounds: List[Dict[str, Any]], stats: Dict[str, Any], inference_id: str):
     """Write accumulated agent stats into the last round dict before saving.
 
@@ -512,12 +648,7 @@ def _apply_stats_to_round(rounds: List[Dict[str, Any]], stats: Dict[str, Any], i
     if not rounds:
         return
     last_round = rounds[-1]
-    last_round["model_usage"] = {
-        "inference_id": inference_id,
-        "llm_calls": stats["llm_calls"],
-        "input_tokens": stats["total_input_tokens"],
-        "output_tokens": stats["total_output_tokens"],
-    }
+    last_round["model_usage"] = _model_usage_from_stats(stats, inference_id)
     if stats.get("first_token_ms") is not None:
         last_round["time_to_first_token"] = int(stats["first_token_ms"])
     if stats.get("last_token_ms") is not None:
@@ -668,6 +799,179 @@ def _update_current_round_from_messages(rounds: List[Dict[str, Any]], messages:
     return rounds
 
 
+####  Tool Selection  #########################################################
+
+def _tool_asset_type(tool_name: str) -> str:
+    """Return the asset type that a tool operates on."""
+    if tool_name.startswith("tool_results_"):
+        return "tool_results"
+    if tool_name == "get_base64_image_from_url":
+        return "content"
+    return tool_name.split("_")[0]
+
+
+def _page_from_ui_context(ui_context: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """Return the page segment of ui_context.url.path.
+
+    For example, "/workspaces/123/strategies/456" is the "strategies" page and
+    "/workspaces/123" is the "workspace" overview page.
+    """
+    path = (((ui_context or {}).get("url") or {}).get("path") or "")
+    parts = [part for part in path.split("/") if part]
+    if len(parts) < 2 or parts[0] != "workspaces":
+        return None
+    if len(parts) == 2:
+        return "workspace"
+    return parts[2] if parts[2] in PAGE_TOOL_ASSET_TYPES else "workspace"
+
+
+def _select_tools(tools: List[Dict[str, Any]], ui_context: Optional[Dict[str, Any]] = None) -> set:
+    """Return the names of the tools to offer on the page in the UI context.
+
+    Args:
+        tools: The full tool catalogue in OpenAI function calling format.
+        ui_context: Optional UI context with the path of the current page.
+
+    Returns:
+        set: The names of the core tools and the tools relevant to the page.
+    """
+    asset_types = PAGE_TOOL_ASSET_TYPES[_page_from_ui_context(ui_context)]
+    selected = set()
+    for tool in tools:
+        name = tool["function"]["name"]
+        if name in CORE_TOOLS or _tool_asset_type(name) in asset_types:
+            selected.add(name)
+    return selected
+
+
+def _offered_tools(tools: List[Dict[str, Any]], enabled_tools: set) -> List[Dict[str, Any]]:
+    """Return the tools to send to the model, including discover_tools when some are hidden."""
+    offered = [tool for tool in tools if tool["function"]["name"] in enabled_tools]
+    if len(offered) < len(tools):
+        offered.append(DISCOVER_TOOLS_TOOL)
+    return offered
+
+
+def _discover_tools(tools: List[Dict[str, Any]], enabled_tools: set, names: Optional[List[str]] = None) -> Dict[str, Any]:
+    """List hidden tools, or enable the given tools for the rest of the round.
+
+    Args:
+        tools: The full tool catalogue in OpenAI function calling format.
+        enabled_tools: The names of the enabled tools, updated in place.
+        names: Optional names of tools to enable.
+
+    Returns:
+        Dict[str, Any]: The tools that were enabled, or the tools that can be enabled.
+    """
+    catalogue = {tool["function"]["name"]: tool for tool in tools}
+    if names:
+        enabled = [name for name in names if name in catalogue]
+        enabled_tools.update(enabled)
+        return {
+            "enabled": enabled,
+            "unknown": [name for name in names if name not in catalogue],
+        }
+    return {
+        "tools": [
+            {"name": name, "summary": (tool["function"].get("description") or "").strip().split("\n")[0]}
+            for name, tool in catalogue.items()
+            if name not in enabled_tools
+        ]
+    }
+
+
+####  Tool Result Digests  ####################################################
+
+def _shrink_value(value: Any, max_items: int, max_chars: int) -> Any:
+    """Recursively cap list lengths and string lengths in a JSON value."""
+    if isinstance(value, dict):
+        return {k: _shrink_value(v, max_items, max_chars) for k, v in value.items()}
+    if isinstance(value, list):
+        shrunk = [_shrink_value(v, max_items, max_chars) for v in value[:max_items]]
+        if len(value) > max_items:
+            shrunk.append(f"... ({len(value) - max_items} more items)")
+        return shrunk
+    if isinstance(value, str) and len(value) > max_chars:
+        return value[:max_chars] + f"... ({len(value) - max_chars} more chars)"
+    return value
+
+
+def _make_tool_result_digest(content: str, max_chars: int = TOOL_RESULT_DIGEST_MAX_CHARS) -> Any:
+    """Return a preview of a tool result whose JSON form is at most max_chars.
+
+    JSON results keep their structure with progressively shorter lists and
+    strings, so the model still sees field names, totals, and the first hits.
+    Plain text results are truncated.
+
+    Args:
+        content: The full serialized tool result.
+        max_chars: The maximum size of the serialized digest.
+
+    Returns:
+        A JSON-serializable preview of the result.
+    """
+    try:
+        value = json.loads(content)
+    except ValueError:
+        return content[:max_chars]
+    if not isinstance(value, (dict, list)):
+        return content[:max_chars]
+    for max_items, max_str in ((10, 500), (5, 200), (3, 100), (2, 50), (1, 20)):
+        digest = _shrink_value(value, max_items, max_str)
+        serialized = json.dumps(digest)
+        if len(serialized) <= max_chars:
+            return digest
+    return serialized[:max_chars]
+
+
+async def _offload_tool_result(
+    tool_name: str,
+    content: str,
+    conversation_id: Optional[str] = None,
+    user: Optional[str] = None,
+    es_client: Optional["Elasticsearch"] = None,
+) -> str:
+    """Store a large tool result out of line and return a digest to use in its place.
+
+    Small results and results of tools in TOOLS_NEVER_OFFLOADED are returned
+    unchanged. The digest references the stored result so that the model can
+    expand it with the `tool_results_get` tool.
+
+    Args:
+        tool_name: The name of the tool that produced the result.
+        content: The full serialized tool result.
+        conversation_id: The conversation the result belongs to.
+
+    Returns:
+        str: The content to put in the tool message.
+    """
+    if tool_name in TOOLS_NEVER_OFFLOADED or len(content) <= TOOL_RESULT_INLINE_MAX_CHARS:
+        return content
+    digest = {"digest": _make_tool_result_digest(content)}
+    try:
+        loop = asyncio.get_event_loop()
+        ref_id = await loop.run_in_executor(
+            None,
+            lambda: api_tool_results.create(
+                content,
+                tool_name,
+                conversation_id=conversation_id,
+                user=user,
+                via="server",
+                es_client=es_client,
+            )
+        )
+        digest["tool_result_ref"] = {"_id": ref_id, "tool_id": tool_name, "size": len(content)}
+        digest["note"] = (
+            f"This result has {len(content)} characters and was shortened. "
+            "Call tool_results_get with this _id to read the full content."
+        )
+    except Exception as e:
+        print(f"Error storing result of tool {tool_name}: {e}")
+        digest["note"] = f"This result has {len(content)} characters and was shortened."
+    return json.dumps(digest)
+
+
 ####  Chat Streaming and Agent Loop  ##########################################
 
 def _chat_stream(
@@ -740,38 +1044,107 @@ def _chat_stream(
 
 
 async def _get_mcp_tools(mcp_client_auth: Optional[Any] = None) -> List[Dict[str, Any]]:
-    """Connect to MCP server and retrieve available tools.
+    """Return the MCP tool catalogue for the identity behind mcp_client_auth.
+
+    Catalogues are cached per identity, and the MCP server is never awaited.
+    A fresh catalogue is returned as-is. A stale catalogue is returned while it
+    refreshes in the background. An identity without a catalogue gets no tools
+    while its catalogue loads in the background, because the tools listed for
+    one identity are never served to another.
 
     Returns:
         List[Dict[str, Any]]: A list of tools in OpenAI function calling format.
-
-    Raises:
-        McpConnectionError: If connection to the MCP server fails.
-        McpError: For other MCP-related failures.
     """
-    global _tools_cache
     if not MCP_ENABLED:
         return []
 
-    if _tools_cache is not None:
-        return _tools_cache
-    
-    global _tools_lock
-    if _tools_lock is None:
-        _tools_lock = asyncio.Lock()
-        
-    try:
-        async with _tools_lock:
-            if _tools_cache is not None:
-                return _tools_cache
-            return await _load_tools_from_mcp(mcp_client_auth=mcp_client_auth)
-    except RuntimeError:
-        # Lock might be bound to a different event loop (e.g. from startup asyncio.run)
-        _tools_lock = asyncio.Lock()
-        async with _tools_lock:
-            if _tools_cache is not None:
-                return _tools_cache
-            return await _load_tools_from_mcp(mcp_client_auth=mcp_client_auth)
+    identity = _mcp_auth_identity(mcp_client_auth)
+    with _tool_catalogues_lock:
+        catalogue = _tool_catalogues.get(identity)
+
+    if catalogue is None:
+        _refresh_tool_catalogue_in_background(identity, mcp_client_auth)
+        return []
+    if time.monotonic() - catalogue["loaded_at"] >= TOOL_CATALOGUE_TTL_SECONDS:
+        _refresh_tool_catalogue_in_background(identity, mcp_client_auth)
+    return catalogue["tools"]
+
+def _mcp_auth_identity(mcp_client_auth: Optional[Any] = None) -> str:
+    """Return a stable cache key for the identity behind MCP client auth.
+
+    Credentials are fingerprinted so that they are never kept as cache keys.
+    """
+    if mcp_client_auth is None:
+        return "anonymous"
+    if isinstance(mcp_client_auth, str):
+        return f"token:{utils.fingerprint(mcp_client_auth)}"
+    if isinstance(mcp_client_auth, httpx.Auth):
+        request = next(mcp_client_auth.sync_auth_flow(httpx.Request("GET", MCP_SERVER_URL)))
+        auth_header = request.headers.get("Authorization")
+        if auth_header:
+            return f"header:{utils.fingerprint(auth_header)}"
+    return f"auth:{utils.fingerprint(repr(mcp_client_auth))}"
+
+def _store_tool_catalogue(identity: str, mcp_tools: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Cache the MCP tools listed for an identity and return its catalogue.
+
+    The OpenAI function calling format is built once per catalogue version and
+    shared by every identity that lists the same tools.
+    """
+    version = utils.fingerprint(mcp_tools)
+    with _tool_catalogues_lock:
+        tools = next((c["tools"] for c in _tool_catalogues.values() if c["version"] == version), None)
+        if tools is None:
+            tools = [
+                {
+                    "type": "function",
+                    "function": {
+                        "name": tool["name"],
+                        "description": tool["description"],
+                        "parameters": tool["inputSchema"],
+                    }
+                }
+                for tool in mcp_tools
+            ]
+        catalogue = {"version": version, "tools": tools, "loaded_at": time.monotonic()}
+        _tool_catalogues[identity] = catalogue
+        _tool_catalogues_refreshing.discard(identity)
+        if len(_tool_catalogues) > TOOL_CATALOGUES_MAX_ENTRIES:
+            del _tool_catalogues[min(_tool_catalogues, key=lambda k: _tool_catalogues[k]["loaded_at"])]
+        return catalogue
+
+async def _load_tool_catalogue(identity: str, mcp_client_auth: Optional[Any] = None) -> Dict[str, Any]:
+    """Load the MCP tools for an identity and cache them as its catalogue."""
+    mcp_tools = await _load_tools_from_mcp(mcp_client_auth=mcp_client_auth)
+    return _store_tool_catalogue(identity, mcp_tools)
+
+def _refresh_tool_catalogue_in_background(identity: str, mcp_client_auth: Optional[Any] = None) -> Optional[threading.Thread]:
+    """Load or reload the catalogue of an identity in a background thread.
+
+    Each chat runs its own short-lived event loop, so the refresh runs in a
+    thread with its own loop rather than as a task that could be cancelled
+    when the chat ends. At most one refresh per identity is in flight.
+
+    Returns:
+        The thread running the refresh, or None if one was already running.
+    """
+    with _tool_catalogues_lock:
+        if identity in _tool_catalogues_refreshing:
+            return None
+        _tool_catalogues_refreshing.add(identity)
+
+    def refresh():
+        try:
+            asyncio.run(_load_tool_catalogue(identity, mcp_client_auth))
+        except Exception as e:
+            print(f"Error refreshing MCP tools: {e}")
+        finally:
+            with _tool_catalogues_lock:
+                _tool_catalogues_refreshing.discard(identity)
+
+    thread = threading.Thread(target=refresh, daemon=True)
+    thread.start()
+    return thread
 
 def _resolve_mcp_client_auth(es_client: Optional["Elasticsearch"] = None) -> Optional[Any]:
     """Build FastMCP client auth from the current Elasticsearch auth context."""
@@ -795,32 +1168,24 @@ async def _load_tools_from_mcp(mcp_client_auth: Optional[Any] = None) -> List[Di
     """Helper to perform the actual MCP tool loading.
 
     Returns:
-        List[Dict[str, Any]]: A list of tools in OpenAI function calling format.
+        List[Dict[str, Any]]: A list of tools with their name, description, and inputSchema.
 
     Raises:
         McpConnectionError: If connection to the MCP server fails.
         McpError: For other MCP-related failures.
     """
-    global _tools_cache
     try:
         async with _create_mcp_client(auth=mcp_client_auth) as client:
             # List available tools
             tools_list = await client.list_tools()
-            
-            # Convert MCP tools to Elasticsearch Inference API format
-            tools = []
-            for tool in tools_list:
-                tools.append({
-                    "type": "function",
-                    "function": {
-                        "name": tool.name,
-                        "description": tool.description,
-                        "parameters": tool.inputSchema
-                    }
-                })
-            
-            _tools_cache = tools
-            return _tools_cache
+            return [
+                {
+                    "name": tool.name,
+                    "description": tool.description,
+                    "inputSchema": tool.inputSchema
+                }
+                for tool in tools_list
+            ]
     except Exception as e:
         error_msg = str(e)
         # Check if it looks like a connection failure
@@ -882,7 +1247,7 @@ def _parse_stream_chunk(line: str) -> Optional[Dict[str, Any]]:
             return {"done": True}
         
         try:
-            json_data = json.loads(data)
+            json_data = utils.loads(data)
             # Unwrap chat_completion if present (Elastic Inference API nesting)
             if isinstance(json_data, dict) and "chat_completion" in json_data:
                 return json_data["chat_completion"]
@@ -928,9 +1293,11 @@ async def _load_tools_safe(es_client: Optional["Elasticsearch"] = None) -> Tuple
     timeout_seconds = float(os.getenv("AGENT_TOOL_LOAD_TIMEOUT_SECONDS") or "8")
     mcp_client_auth = _resolve_mcp_client_auth(es_client=es_client)
     try:
-        is_first_load = _tools_cache is None
+        is_first_load = _mcp_auth_identity(mcp_client_auth) not in _tool_catalogues
         tools = await asyncio.wait_for(_get_mcp_tools(mcp_client_auth=mcp_client_auth), timeout=timeout_seconds)
-        return tools, {"reasoning": f"Initialized agent with {len(tools)} tools"} if is_first_load else None
+        if is_first_load and MCP_ENABLED:
+            return tools, {"reasoning": "MCP tools are loading. Continuing without tools."}
+        return tools, None
     except asyncio.TimeoutError:
         return [], {"reasoning": f"MCP tools did not load within {timeout_seconds:.0f}s. Continuing without tools."}
     except McpConnectionError as e:
@@ -1151,15 +1518,9 @@ async def _process_llm_response(
             stats["total_input_tokens"] += usage.get("prompt_tokens", 0)
             stats["total_output_tokens"] += usage.get("completion_tokens", 0)
             
-            model_usage = {
-                "inference_id": inference_id,
-                "llm_calls": stats["llm_calls"],
-                "input_tokens": stats["total_input_tokens"],
-                "output_tokens": stats["total_output_tokens"]
-            }
             yield SseData({
                 "event": "model_usage",
-                "data": model_usage
+                "data": _model_usage_from_stats(stats, inference_id)
             })
         
         choices = json_data.get("choices") or []
@@ -1234,16 +1595,38 @@ async def _process_llm_response(
     result_container["tool_calls"] = tool_calls
 
 
+def _mutated_asset_types(tool_name: str) -> frozenset:
+    """Return the asset types that a tool may change."""
+    return MUTATED_ASSET_TYPES.get(tool_name) or frozenset({_tool_asset_type(tool_name)})
+
+
 async def _execute_tool_calls(
     tool_calls: List[Dict[str, Any]], 
     messages: List[Dict[str, Any]],
     mcp_client_auth: Optional[Any] = None,
+    conversation_id: Optional[str] = None,
+    user: Optional[str] = None,
+    es_client: Optional["Elasticsearch"] = None,
+    tool_memo: Optional[Dict[str, Dict[str, Any]]] = None,
+    tool_selection: Optional[Dict[str, Any]] = None,
 ) -> Generator[SseMessage, None, None]:
     """Execute tool calls in parallel and yield results.
 
+    At most TOOL_CONCURRENCY tools run at once. Results of tools in
+    MEMOIZED_TOOLS are reused from tool_memo when the same tool was already
+    called with the same arguments. Any other tool invalidates the memoized
+    results that depend on the asset types it changes.
+
+    Large results are stored out of line and only a digest is added to the
+    message history. The full result is still streamed to the UI.
+
     Args:
         tool_calls: List of tool calls to execute.
         messages: The message history to update with tool results.
+        conversation_id: Conversation ID that stored results belong to.
+        tool_memo: Memoized tool results for the agent session, updated in place.
+        tool_selection: The full tool catalogue ("tools") and the names of the
+            tools offered to the model ("enabled"), used by discover_tools.
 
     Yields:
         SseMessage: SSE data messages representing tool results or errors.
@@ -1251,16 +1634,66 @@ async def _execute_tool_calls(
     Raises:
         McpConnectionError: If connection to the MCP server fails during execution.
     """
+    if tool_memo is None:
+        tool_memo = {}
+
+    # Invalidate memoized results that the mutating tools in this batch affect.
+    # Reads that depend on those asset types bypass the memo in this batch, as
+    # they run concurrently with the writes.
+    mutated = set()
+    for tool_call in tool_calls:
+        tool_name = tool_call["function"]["name"]
+        if tool_name not in MEMOIZED_TOOLS and tool_name != "discover_tools":
+            mutated |= _mutated_asset_types(tool_name)
+    for key in [k for k, v in tool_memo.items() if v["asset_types"] & mutated]:
+        del tool_memo[key]
+
+    semaphore = asyncio.Semaphore(TOOL_CONCURRENCY)
+
     async def run_tool(tool_call):
         tool_name = tool_call["function"]["name"]
         args_str = tool_call["function"]["arguments"]
         tool_args = _parse_tool_args(args_str)
+
+        if tool_name == "discover_tools" and tool_selection is not None:
+            result = _discover_tools(tool_selection["tools"], tool_selection["enabled"], tool_args.get("names"))
+            return {
+                "role": "tool",
+                "content": json.dumps(result),
+                "tool_call_id": tool_call["id"],
+                "status": "success",
+                "result_data": result
+            }
+
+        memo_key = None
+        asset_types = MEMOIZED_TOOLS.get(tool_name)
+        if asset_types is not None and not asset_types & mutated:
+            memo_key = utils.fingerprint([tool_name, tool_args])
+            if memo_key in tool_memo:
+                memo = tool_memo[memo_key]
+                return {
+                    "role": "tool",
+                    "content": memo["content"],
+                    "tool_call_id": tool_call["id"],
+                    "status": "success",
+                    "result_data": memo["result"]
+                }
             
         try:
-            result = await _call_mcp_tool(tool_name, tool_args, mcp_client_auth=mcp_client_auth)
+            async with semaphore:
+                result = await _call_mcp_tool(tool_name, tool_args, mcp_client_auth=mcp_client_auth)
+            content = await _offload_tool_result(
+                tool_name,
+                result if isinstance(result, str) else json.dumps(result),
+                conversation_id=conversation_id,
+                user=user,
+                es_client=es_client,
+            )
+            if memo_key is not None:
+                tool_memo[memo_key] = {"result": result, "content": content, "asset_types": asset_types}
             return {
                 "role": "tool",
-                "content": result if isinstance(result, str) else json.dumps(result),
+                "content": content,
                 "tool_call_id": tool_call["id"],
                 "status": "success",
                 "result_data": result
@@ -1343,7 +1776,9 @@ async def _agent_loop_stream(
     conversation_id: str = None,
     original_rounds: List[Dict[str, Any]] = None,
     user: Optional[str] = None,
-    es_client: Optional["Elasticsearch"] = None
+    es_client: Optional["Elasticsearch"] = None,
+    history_stats: Optional[Dict[str, int]] = None,
+    ui_context: Optional[Dict[str, Any]] = None
 ):
     """Streaming agent loop that handles tool calling and yields response lines.
 
@@ -1356,6 +1791,8 @@ async def _agent_loop_stream(
         session_id: Session ID for cancellation tracking.
         conversation_id: Conversation ID for saving state.
         original_rounds: Original rounds structure to update (not reconstruct).
+        history_stats: Estimated history tokens before and after compaction.
+        ui_context: Optional UI context used to select the tools for the page.
 
     Yields:
         str: Raw ES response lines or error events in SSE format.
@@ -1389,13 +1826,25 @@ async def _agent_loop_stream(
              "data": {"reasoning": load_result["reasoning"]}
          })
     
+    # Offer the core tools and the tools relevant to the current page. The
+    # model can enable the others with discover_tools.
+    tools = tools or []
+    tool_selection = {"tools": tools, "enabled": _select_tools(tools, ui_context)}
+    tools_tokens = _estimate_tokens(json.dumps(tools)) if tools else 0
+
+    # Memoized results of read-only tools for this session
+    tool_memo = {}
+
     # Agent loop stats
     stats = {
         "llm_calls": 0,
         "total_input_tokens": 0,
         "total_output_tokens": 0,
         "first_token_ms": None,
-        "last_token_ms": None
+        "last_token_ms": None,
+        "tool_tokens_before": 0,
+        "tool_tokens_after": 0,
+        **(history_stats or {})
     }
     
     start_time_iso = datetime.now(timezone.utc).isoformat()
@@ -1409,6 +1858,12 @@ async def _agent_loop_stream(
         }
     })
 
+    if stats.get("history_tokens_after", 0) < stats.get("history_tokens_before", 0):
+        yield SseData({
+            "event": "reasoning",
+            "data": {"reasoning": f"Compacted earlier conversation history from ~{stats['history_tokens_before']} to ~{stats['history_tokens_after']} tokens."}
+        })
+
     # Wrap main loop in GeneratorExit handler for client disconnect
     was_cancelled = False
     try:
@@ -1425,13 +1880,16 @@ async def _agent_loop_stream(
             # Call LLM with current messages
             stats["llm_calls"] += 1
             es_response = None
+            offered_tools = _offered_tools(tools, tool_selection["enabled"])
+            stats["tool_tokens_before"] += tools_tokens
+            stats["tool_tokens_after"] += _estimate_tokens(json.dumps(offered_tools)) if offered_tools else 0
             
             for attempt in range(max_retries + 1):
                 try:
                     es_response = _chat_stream(
                         messages,
                         inference_id,
-                        tools if tools else None,
+                        offered_tools if offered_tools else None,
                         es_client=es_client
                     )
                     break # Success
@@ -1518,7 +1976,16 @@ async def _agent_loop_stream(
             if tool_calls:
                 try:
                     mcp_client_auth = _resolve_mcp_client_auth(es_client=es_client)
-                    async for event in _execute_tool_calls(tool_calls, messages, mcp_client_auth=mcp_client_auth):
+                    async for event in _execute_tool_calls(
+                        tool_calls,
+                        messages,
+                        mcp_client_auth=mcp_client_auth,
+                        conversation_id=conversation_id,
+                        user=user,
+                        es_client=es_client,
+                        tool_memo=tool_memo,
+                        tool_selection=tool_selection,
+                    ):
                         # Check for cancellation during tool execution
                         if session_id and check_cancellation(session_id):
                             yield SseData({
@@ -1677,6 +2144,161 @@ def _build_messages_from_rounds(rounds: List[Dict[str, Any]]) -> List[Dict[str,
     return messages
 
 
+def _estimate_tokens(text: str) -> int:
+    """Roughly estimate the number of tokens in a string.
+
+    Uses the common approximation of four characters per token, which is close
+    enough to budget history without calling a tokenizer.
+    """
+    return (len(text) + 3) // 4
+
+
+def _estimate_message_tokens(messages: List[Dict[str, Any]]) -> int:
+    """Estimate the number of input tokens that a list of messages will use.
+
+    Args:
+        messages: List of messages formatted for the LLM.
+
+    Returns:
+        int: The estimated number of tokens.
+    """
+    total = 0
+    for msg in messages:
+        total += 4  # Role and message framing
+        content = msg.get("content")
+        if isinstance(content, str):
+            total += _estimate_tokens(content)
+        for tc in msg.get("tool_calls") or []:
+            function = tc.get("function") or {}
+            total += _estimate_tokens(function.get("name") or "")
+            total += _estimate_tokens(function.get("arguments") or "")
+    return total
+
+
+def _find_tool_result_ref(content: str) -> Optional[Dict[str, Any]]:
+    """Return the tool_result_ref of an offloaded tool result, if any.
+
+    Tool messages rebuilt from rounds wrap the original content in a
+    {"message": ...} object, so both forms are checked.
+    """
+    try:
+        value = json.loads(content)
+        if isinstance(value, dict) and isinstance(value.get("message"), str):
+            value = json.loads(value["message"])
+    except (TypeError, ValueError):
+        return None
+    if isinstance(value, dict) and isinstance(value.get("tool_result_ref"), dict):
+        return value["tool_result_ref"]
+    return None
+
+
+def _split_messages_into_rounds(messages: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """Group messages into rounds, each starting at a user message."""
+    groups = []
+    for msg in messages:
+        if msg.get("role") == "user" or not groups:
+            groups.append([])
+        groups[-1].append(msg)
+    return groups
+
+
+def _collapse_tool_results(group: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Replace the tool results in a round with short placeholders.
+
+    Tool calls are kept so that the round remains a valid exchange, and the
+    reference to any result stored out of line is kept so it can be expanded.
+    """
+    tool_names = {}
+    for msg in group:
+        for tc in msg.get("tool_calls") or []:
+            tool_names[tc.get("id")] = (tc.get("function") or {}).get("name")
+    collapsed = []
+    for msg in group:
+        if msg.get("role") == "tool" and isinstance(msg.get("content"), str):
+            content = msg["content"]
+            tool_name = tool_names.get(msg.get("tool_call_id")) or "tool"
+            placeholder = {"omitted": f"Result of {tool_name} omitted from earlier history ({len(content)} characters)."}
+            ref = _find_tool_result_ref(content)
+            if ref:
+                placeholder["tool_result_ref"] = ref
+            placeholder = json.dumps(placeholder)
+            if len(placeholder) < len(content):
+                msg = {**msg, "content": placeholder}
+        collapsed.append(msg)
+    return collapsed
+
+
+def _summarize_round(group: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Replace a round with its user input and a short summary of the response.
+
+    The summary lists the tools that were called and the start of the final
+    response. Tool calls and results are dropped entirely.
+    """
+    def truncate(text: str) -> str:
+        if len(text) <= HISTORY_SUMMARY_MAX_CHARS:
+            return text
+        return text[:HISTORY_SUMMARY_MAX_CHARS] + "..."
+
+    tool_names = []
+    responses = []
+    for msg in group:
+        if msg.get("role") != "assistant":
+            continue
+        for tc in msg.get("tool_calls") or []:
+            name = (tc.get("function") or {}).get("name")
+            if name and name not in tool_names:
+                tool_names.append(name)
+        if isinstance(msg.get("content"), str) and msg["content"].strip():
+            responses.append(msg["content"])
+
+    summary = "[Summary of an earlier round]"
+    if tool_names:
+        summary += f" Tools used: {', '.join(tool_names)}."
+    if responses:
+        summary += f" Response: {truncate(responses[-1])}"
+
+    summarized = []
+    if group[0].get("role") == "user":
+        summarized.append({**group[0], "content": truncate(group[0].get("content") or "")})
+    summarized.append({"role": "assistant", "content": summary})
+    return summarized
+
+
+def _compact_messages(
+    messages: List[Dict[str, Any]],
+    token_budget: int = HISTORY_TOKEN_BUDGET,
+    keep_recent_rounds: int = HISTORY_KEEP_RECENT_ROUNDS,
+) -> List[Dict[str, Any]]:
+    """Compact the message history to fit within a token budget.
+
+    The most recent rounds are always kept verbatim. Older rounds are compacted
+    oldest first, and only as much as needed: first their tool results are
+    collapsed to placeholders, then whole rounds are replaced by summaries.
+
+    Args:
+        messages: List of messages built from conversation rounds.
+        token_budget: The budget of estimated tokens for the history.
+        keep_recent_rounds: Number of most recent rounds to keep verbatim.
+
+    Returns:
+        List[Dict[str, Any]]: The compacted list of messages.
+    """
+    total = _estimate_message_tokens(messages)
+    if total <= token_budget:
+        return messages
+
+    groups = _split_messages_into_rounds(messages)
+    num_old = max(0, len(groups) - max(1, keep_recent_rounds))
+    for compact in (_collapse_tool_results, _summarize_round):
+        for i in range(num_old):
+            if total <= token_budget:
+                break
+            compacted = compact(groups[i])
+            total += _estimate_message_tokens(compacted) - _estimate_message_tokens(groups[i])
+            groups[i] = compacted
+    return [msg for group in groups for msg in group]
+
+
 def _prepare_system_prompt(ui_context: Optional[Dict[str, Any]] = None) -> str:
     """Prepare the system prompt with optional UI context.
 
@@ -1688,7 +2310,7 @@ def _prepare_system_prompt(ui_context: Optional[Dict[str, Any]] = None) -> str:
     """
     full_system_prompt = SYSTEM_PROMPT
     if ui_context:
-        full_system_prompt += f"\n\n## UI Context\n\n{json.dumps(ui_context, indent=2, sort_keys=True)}"
+        full_system_prompt += f"\n\n## UI Context\n\n{json.dumps(ui_context, separators=(',', ':'), sort_keys=True)}"
     return full_system_prompt
 
 
@@ -1809,6 +2431,11 @@ def chat(
         messages = _build_messages_from_rounds(rounds)
     else:
         messages = [{"role": "user", "content": text}]
+
+    # Compact older rounds to keep the history within the token budget
+    history_stats = {"history_tokens_before": _estimate_message_tokens(messages)}
+    messages = _compact_messages(messages)
+    history_stats["history_tokens_after"] = _estimate_message_tokens(messages)
     
     # Filter out any messages where role is neither "user" nor "assistant" nor "tool"
     # and filter out fields that aren't valid for each role.
@@ -1840,7 +2467,9 @@ def chat(
                 conversation_id=conversation_id,
                 original_rounds=rounds,
                 user=user,
-                es_client=es_client
+                es_client=es_client,
+                history_stats=history_stats,
+                ui_context=ui_context
             ):
                 yield line
         except GeneratorExit:
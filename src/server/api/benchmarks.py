@@ -4,7 +4,15 @@
 # 2.0.
 
 # Standard packages
-from typing import Any, Dict, List, Optional, Set, TYPE_CHECKING
+import copy
+import random
+import threading
+import time
+from heapq import merge
+from typing import Any, Dict, List, Optional, Set, Tuple, Union, TYPE_CHECKING
+
+# Elastic packages
+from elasticsearch.exceptions import ApiError
 
 # App packages
 from .. import utils
@@ -17,6 +25,51 @@ if TYPE_CHECKING:
 INDEX_NAME = "esrs-benchmarks"
 SEARCH_FIELDS = utils.get_search_fields_from_mapping("benchmarks")
 
+# Maximum number of hits or composite aggregation buckets per request when
+# selecting candidate scenarios. Larger samples are paged.
+CANDIDATES_PAGE_SIZE = 10000
+
+# Maximum number of sampled scenario _ids to give as a filter when checking
+# which scenarios have positive ratings. Larger samples are checked against
+# every scenario with positive ratings in the workspace.
+CANDIDATES_IDS_FILTER_MAX = 1000
+
+# Strategies and scenarios aren't runnable if they don't have params. Assets
+# are selected by their indexed params_count, or by their params with a script
+# if they were written before params_count was added and not backfilled yet.
+RUNNABLE_FILTER = {
+    "bool": {
+        "should": [
+            { "range": { "params_count": { "gt": 0 }}},
+            {
+                "bool": {
+                    "must_not": [{ "exists": { "field": "params_count" }}],
+                    "filter": [{
+                        "script": {
+                            "script": {
+                                "source": "doc['params'].size() > 0",
+                                "lang": "painless"
+                            }
+                        }
+                    }]
+                }
+            }
+        ],
+        "minimum_should_match": 1
+    }
+}
+
+# Cache of candidate pools, keyed by (client identity, fingerprint of the
+# workspace and task). An entry is reused while the change markers of the
+# indices it was selected from are unchanged, for up to
+# CANDIDATE_POOLS_TTL_SECONDS so that tasks without a sample_seed are
+# eventually sampled again.
+CANDIDATE_POOLS_INDICES = "esrs-strategies,esrs-scenarios,esrs-judgements"
+CANDIDATE_POOLS_TTL_SECONDS = 300
+CANDIDATE_POOLS_MAX_ENTRIES = 64
+_candidate_pools: Dict[Tuple[str, str], Dict[str, Any]] = {}
+_candidate_pools_lock = threading.Lock()
+
 def search(
         workspace_id: str,
         text: str = "",
@@ -25,6 +78,8 @@ def search(
         size: int = 10,
         page: int = 1,
         aggs: bool = False,
+        cursor: Optional[str] = None,
+        projection: Optional[Union[str, List[str]]] = None,
         es_client: Optional["Elasticsearch"] = None,
     ) -> Dict[str, Any]:
     """Search for benchmarks.
@@ -37,6 +92,12 @@ def search(
         size: Number of benchmarks to return per page.
         page: Page number for pagination.
         aggs: Whether to include aggregations (e.g., evaluation counts).
+        cursor: Optional cursor for pagination instead of page. Give "start" for
+            the first page, then the "next_cursor" of each response with the
+            same search inputs, until "next_cursor" is null.
+        projection: Optional fields to return for each benchmark. Give
+            "summary" to omit large fields, "full" for all fields, or a list
+            of fields to include.
 
     Returns:
         A dictionary containing the search results.
@@ -44,6 +105,8 @@ def search(
     response = utils.search_assets(
         "benchmarks", workspace_id, text, filters, sort, size, page,
         counts=[ "evaluations" ] if aggs else [],
+        cursor=cursor,
+        projection=projection,
         es_client=es_client,
     )
     return response
@@ -60,30 +123,30 @@ def tags(workspace_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict
     es_response = utils.search_tags("benchmarks", workspace_id, es_client=es_client)
     return es_response
 
-def get(_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+def get(_id: str, projection: Optional[Union[str, List[str]]] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     """Get a benchmark by its _id.
 
     Args:
         _id: The UUID of the benchmark.
+        projection: Optional fields to return. Give "summary" to omit large
+            fields, "full" for all fields, or a list of fields to include.
 
     Returns:
         The benchmark document from Elasticsearch.
     """
     client = es_client if es_client is not None else es("studio")
-    es_response = client.get(
-        index=INDEX_NAME,
-        id=_id,
-        source_excludes="_search",
-    )
+    es_response = utils.get_asset("benchmarks", _id, projection, es_client=client)
     return es_response
 
-def create(doc: Dict[str, Any], _id: str = None, user: str = None, via: str = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+def create(doc: Dict[str, Any], _id: str = None, user: str = None, via: str = None, refresh: Optional[str] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     """Create a benchmark.
 
     Args:
         doc: The benchmark data to create.
         _id: Optional pregenerated UUID for idempotence.
         user: The username of the creator.
+        refresh: Refresh policy of the write: "true", "wait_for", or "false".
+            Defaults to ELASTICSEARCH_REFRESH.
 
     Returns:
         The response from the Elasticsearch index operation.
@@ -101,17 +164,19 @@ def create(doc: Dict[str, Any], _id: str = None, user: str = None, via: str = No
         index=INDEX_NAME,
         id=_id or utils.unique_id(),
         document=doc,
-        refresh=True,
+        refresh=utils.refresh_policy(refresh),
     )
     return es_response
 
-def update(_id: str, doc_partial: Dict[str, Any], user: str = None, via: str = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+def update(_id: str, doc_partial: Dict[str, Any], user: str = None, via: str = None, refresh: Optional[str] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     """Update a benchmark by its _id.
 
     Args:
         _id: The UUID of the benchmark.
         doc_partial: The partial benchmark data to update.
         user: The username of the updater.
+        refresh: Refresh policy of the write: "true", "wait_for", or "false".
+            Defaults to ELASTICSEARCH_REFRESH.
 
     Returns:
         The response from the Elasticsearch update operation.
@@ -129,15 +194,17 @@ def update(_id: str, doc_partial: Dict[str, Any], user: str = None, via: str = N
         index=INDEX_NAME,
         id=_id,
         doc=doc_partial,
-        refresh=True
+        refresh=utils.refresh_policy(refresh)
     )
     return es_response
 
-def delete(_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+def delete(_id: str, refresh: Optional[str] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     """Delete a benchmark and its associated evaluations.
 
     Args:
         _id: The UUID of the benchmark to delete.
+        refresh: Refresh policy of the write: "true", "wait_for", or "false".
+            Defaults to ELASTICSEARCH_REFRESH.
 
     Returns:
         The response from the Elasticsearch delete_by_query operation.
@@ -161,6 +228,14 @@ def delete(_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict[str, A
                                 { "term": { "benchmark_id": _id }}
                             ]
                         }
+                    },
+                    {
+                        "bool": {
+                            "filter": [
+                                { "term": { "_index": "esrs-evaluation-results" }},
+                                { "term": { "benchmark_id": _id }}
+                            ]
+                        }
                     }
                 ],
                 "minimum_should_match": 1
@@ -169,9 +244,9 @@ def delete(_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict[str, A
     }
     client = es_client if es_client is not None else es("studio")
     es_response = client.delete_by_query(
-        index="esrs-benchmarks,esrs-evaluations",
+        index="esrs-benchmarks,esrs-evaluations,esrs-evaluation-results",
         body=body,
-        refresh=True,
+        refresh=utils.refresh_policy(refresh, wait_for=False),
         conflicts="proceed"
     )
     return es_response
@@ -204,14 +279,7 @@ def fetch_strategies(
             "bool": {
                 "filter": [
                     { "term": { "workspace_id": workspace_id }},
-                    {
-                        "script": {
-                            "script": {
-                                "source": "doc['params'].size() > 0", # strategies aren't runnable if they don't have params
-                                "lang": "painless"
-                            }
-                        }
-                    }
+                    RUNNABLE_FILTER,
                 ]
             }
         },
@@ -277,14 +345,7 @@ def fetch_scenarios(
                     "bool": {
                         "filter": [
                             { "term": { "workspace_id": workspace_id }},
-                            {
-                                "script": {
-                                    "script": {
-                                        "source": "doc['params'].size() > 0", # scenarios aren't runnable if they don't have params
-                                        "lang": "painless"
-                                    }
-                                }
-                            }
+                            RUNNABLE_FILTER,
                         ]
                     }
                 }
@@ -293,6 +354,9 @@ def fetch_scenarios(
         "size": sample_size,
         "_source": [ "params", "tags" ]
     }
+    if sample_seed is None and sample_size > CANDIDATES_PAGE_SIZE:
+        # Pages of the sample must share the random scores of one seed
+        sample_seed = str(random.getrandbits(32))
     if sample_seed is not None:
         body["query"]["function_score"]["random_score"]["seed"] = sample_seed
     
@@ -306,59 +370,186 @@ def fetch_scenarios(
         body["query"]["function_score"]["query"]["bool"]["should"] = should_clauses
         body["query"]["function_score"]["query"]["bool"]["minimum_should_match"] = 1
         
-    # Fetch scenarios
+    # Fetch scenarios, paging through a point in time if the sample is larger
+    # than a page
     client = es_client if es_client is not None else es("studio")
-    response = client.search(
-        index="esrs-scenarios",
-        body=body
-    )
     scenarios = {}
-    for hit in response["hits"]["hits"]:
-        hit_id = hit["_id"]
-        scenarios[hit_id] = hit["_source"]
+    if sample_size <= CANDIDATES_PAGE_SIZE:
+        response = client.search(
+            index="esrs-scenarios",
+            body=body
+        )
+        for hit in response["hits"]["hits"]:
+            scenarios[hit["_id"]] = hit["_source"]
+    else:
+        pit_id = client.open_point_in_time(index="esrs-scenarios", keep_alive=utils.CURSOR_KEEP_ALIVE)["id"]
+        body["sort"] = [ { "_score": "desc" }, { "_shard_doc": "asc" } ]
+        try:
+            while len(scenarios) < sample_size:
+                body["size"] = min(CANDIDATES_PAGE_SIZE, sample_size - len(scenarios))
+                body["pit"] = { "id": pit_id, "keep_alive": utils.CURSOR_KEEP_ALIVE }
+                response = client.search(body=body)
+                hits = response["hits"]["hits"]
+                for hit in hits:
+                    scenarios[hit["_id"]] = hit["_source"]
+                if len(hits) < body["size"]:
+                    break
+                pit_id = response.get("pit_id") or pit_id
+                body["search_after"] = hits[-1]["sort"]
+        finally:
+            client.options(ignore_status=404).close_point_in_time(id=pit_id)
+    if not scenarios:
+        return scenarios
         
-    # Exclude scenarios that have no judgements with ratings greater than 0
+    # Exclude scenarios that have no judgements with ratings greater than 0.
+    # A composite aggregation pages through the scenarios with positive
+    # ratings in the workspace without a limit on their number. The _ids of
+    # the sampled scenarios are only given as a filter when they're few.
+    filters = [
+        { "term": { "workspace_id": workspace_id }},
+        { "range": { "rating": { "gt": 0 }}}
+    ]
+    if len(scenarios) <= CANDIDATES_IDS_FILTER_MAX:
+        filters.append({ "terms": { "scenario_id": list(scenarios.keys()) }})
     body = {
         "size": 0,
-        "query": {
-            "bool": {
-                "filter": [
-                    {
-                        "terms": {
-                            "scenario_id": list(scenarios.keys())
-                        }
-                    },
-                    {
-                        "range": {
-                            "rating": {
-                                "gt": 0
-                            }
-                        }
-                    }
-                ]
-            }
-        },
+        "query": { "bool": { "filter": filters }},
         "aggs": {
             "scenarios_with_ratings": {
-                "terms": {
-                    "field": "scenario_id",
-                    "size": 10000
+                "composite": {
+                    "size": CANDIDATES_PAGE_SIZE,
+                    "sources": [ { "scenario_id": { "terms": { "field": "scenario_id" }}} ]
                 }
             }
         }
     }
-    response = client.search(
-        index="esrs-judgements",
-        body=body
-    )
     scenarios_with_ratings = set()
-    for bucket in response["aggregations"]["scenarios_with_ratings"]["buckets"]:
-        scenarios_with_ratings.add(bucket["key"])
+    while True:
+        response = client.search(
+            index="esrs-judgements",
+            body=body
+        )
+        aggregation = response["aggregations"]["scenarios_with_ratings"]
+        for bucket in aggregation["buckets"]:
+            if bucket["key"]["scenario_id"] in scenarios:
+                scenarios_with_ratings.add(bucket["key"]["scenario_id"])
+        if len(aggregation["buckets"]) < CANDIDATES_PAGE_SIZE or not aggregation.get("after_key"):
+            break
+        body["aggs"]["scenarios_with_ratings"]["composite"]["after"] = aggregation["after_key"]
     scenarios = {
         _id: _source for _id, _source in scenarios.items() if _id in scenarios_with_ratings
     }
     return scenarios
 
+def match_candidates(
+        strategies: Dict[str, Dict[str, Any]],
+        scenarios: Dict[str, Dict[str, Any]],
+        match_mode: str = "subset",
+    ) -> Dict[str, Dict[str, List[str]]]:
+    """Match strategies with the scenarios whose params are compatible.
+
+    In "exact" mode the params of a strategy and a scenario must be equal. In
+    "subset" mode the params of a strategy must all be in the params of a
+    scenario. Scenarios are grouped by their params first, so each strategy is
+    matched once per distinct group rather than once per scenario. In "subset"
+    mode each group is a bitset over the params of the scenarios.
+
+    Args:
+        strategies: A dictionary mapping strategy UUIDs to their source data.
+        scenarios: A dictionary mapping scenario UUIDs to their source data.
+        match_mode: "exact" or "subset".
+
+    Returns:
+        A dictionary of the compatible 'strategies' and 'scenarios', each
+        mapping UUIDs to their sorted tags, in the order in which they match.
+    """
+    assert match_mode in { "exact", "subset" }
+    
+    # Group scenarios by their params, keeping the order of the scenarios in
+    # each group by their position
+    if match_mode == "exact":
+        signature = lambda params: tuple(params)
+    else:
+        bits = {}
+        for scenario_doc in scenarios.values():
+            for param in scenario_doc.get("params", []):
+                bits.setdefault(param, 1 << len(bits))
+        signature = lambda params: sum(bits[param] for param in set(params))
+    groups = {}
+    scenario_ids = list(scenarios)
+    for position, scenario_id in enumerate(scenario_ids):
+        groups.setdefault(signature(scenarios[scenario_id].get("params", [])), []).append(position)
+    
+    # Match each distinct strategy signature with each group once
+    matches = {}
+    def match(params):
+        if match_mode == "exact":
+            key = tuple(params)
+            return [ key ] if key in groups else []
+        if any(param not in bits for param in params):
+            return [] # no scenario has this param
+        mask = signature(params)
+        return [ group for group in groups if group & mask == mask ]
+    
+    # Strategies are added in their order. The scenarios of each strategy
+    # are added in their order, after those of any preceding strategies.
+    candidates = {
+        "strategies": {},
+        "scenarios": {}
+    }
+    groups_added = set()
+    for strategy_id, strategy_doc in strategies.items():
+        params = strategy_doc.get("params", [])
+        key = tuple(params)
+        if key not in matches:
+            matches[key] = match(params)
+        if not matches[key]:
+            continue
+        candidates["strategies"][strategy_id] = sorted(strategy_doc.get("tags") or [])
+        groups_new = [ group for group in matches[key] if group not in groups_added ]
+        for position in merge(*[ groups[group] for group in groups_new ]):
+            scenario_id = scenario_ids[position]
+            candidates["scenarios"][scenario_id] = sorted(scenarios[scenario_id].get("tags") or [])
+        groups_added.update(groups_new)
+    return candidates
+
+def _candidate_pool_signature(client: "Elasticsearch") -> Optional[str]:
+    """
+    Return a fingerprint of the change markers of the indices that candidate
+    pools are selected from: the uuid, the max_seq_no of each shard, and the
+    number of refreshes visible to searches. Return None if the stats aren't
+    permitted, in which case nothing is cached.
+    """
+    try:
+        stats = client.indices.stats(
+            index=CANDIDATE_POOLS_INDICES,
+            level="shards",
+            metric="docs,refresh",
+            filter_path=",".join([
+                "indices.*.uuid",
+                "indices.*.primaries.refresh.external_total",
+                "indices.*.shards.*.seq_no.max_seq_no",
+            ]),
+        )
+    except ApiError:
+        return None
+    markers = {}
+    for index_name, index_stats in ((getattr(stats, "body", stats) or {}).get("indices") or {}).items():
+        
+        # Deduplicate max_seq_no by shard, across the copies of each shard
+        shard_maxes = {}
+        for shard_id, shard_copies in (index_stats.get("shards") or {}).items():
+            for shard_copy in shard_copies:
+                max_seq_no = (shard_copy.get("seq_no") or {}).get("max_seq_no")
+                if max_seq_no is not None:
+                    shard_maxes[shard_id] = max(max_seq_no, shard_maxes.get(shard_id, -1))
+        markers[index_name] = {
+            "uuid": index_stats.get("uuid"),
+            "refreshes": ((index_stats.get("primaries") or {}).get("refresh") or {}).get("external_total"),
+            "shards": shard_maxes,
+        }
+    return utils.fingerprint(markers)
+
 def make_candidate_pool(
         workspace_id: str,
         task: Dict[str, Any],
@@ -366,6 +557,11 @@ def make_candidate_pool(
     ) -> Dict[str, Any]:
     """Identify compatible strategies and scenarios for a benchmark task.
 
+    Candidate pools are cached while the strategies, scenarios, and
+    judgements are unchanged, so repeated previews and evaluation runs of the
+    same task reuse them. Tasks with a sample_seed always select the same
+    pool for the same assets.
+
     Args:
         workspace_id: The UUID of the workspace.
         task: A dictionary defining the benchmark task requirements.
@@ -373,6 +569,34 @@ def make_candidate_pool(
     Returns:
         A dictionary containing lists of compatible 'strategies' and 'scenarios'.
     """
+    client = es_client if es_client is not None else es("studio")
+    key = (utils.client_identity(client), utils.fingerprint({ "workspace_id": workspace_id, "task": task }))
+    now = time.monotonic()
+    signature = _candidate_pool_signature(client)
+    with _candidate_pools_lock:
+        entry = _candidate_pools.get(key)
+    if entry is not None and signature is not None and signature == entry["signature"] and now < entry["expires_at"]:
+        return copy.deepcopy(entry["value"])
+    candidates = _make_candidate_pool(workspace_id, task, es_client=client)
+    if signature is not None:
+        with _candidate_pools_lock:
+            _candidate_pools[key] = {
+                "expires_at": now + CANDIDATE_POOLS_TTL_SECONDS,
+                "signature": signature,
+                "value": copy.deepcopy(candidates),
+            }
+            if len(_candidate_pools) > CANDIDATE_POOLS_MAX_ENTRIES:
+                del _candidate_pools[min(_candidate_pools, key=lambda k: _candidate_pools[k]["expires_at"])]
+    return candidates
+
+def _make_candidate_pool(
+        workspace_id: str,
+        task: Dict[str, Any],
+        es_client: Optional["Elasticsearch"] = None,
+    ) -> Dict[str, Any]:
+    """
+    Select the candidate pool of a benchmark task without the cache.
+    """
     
     # Parse and validate task
     strategy_ids = task.get("strategies", {}).get("_ids") or []
@@ -421,24 +645,7 @@ def make_candidate_pool(
     )
 
     # Filter strategies and scenarios by their compatibility
-    candidates = {
-        "strategies": {},
-        "scenarios": {}
-    }
-    if match_mode == "exact":
-        # Strategy params and scenario params must match exactly
-        for strategy_id, strategy_doc in strategies.items():
-            for scenario_id, scenario_doc in scenarios.items():
-                if strategy_doc.get("params", []) == scenario_doc.get("params", []):
-                    candidates["strategies"][strategy_id] = sorted(strategy_doc.get("tags") or [])
-                    candidates["scenarios"][scenario_id] = sorted(scenario_doc.get("tags") or [])
-    else:
-        # Strategy params must all be present in scenario params
-        for strategy_id, strategy_doc in strategies.items():
-            for scenario_id, scenario_doc in scenarios.items():
-                if set(strategy_doc.get("params", [])).issubset(set(scenario_doc.get("params", []))):
-                    candidates["strategies"][strategy_id] = sorted(strategy_doc.get("tags") or [])
-                    candidates["scenarios"][scenario_id] = sorted(scenario_doc.get("tags") or [])
+    candidates = match_candidates(strategies, scenarios, match_mode)
     
     # Restructure final object
     _candidates = { "strategies": [], "scenarios": [] }
@@ -4,7 +4,12 @@
 # 2.0.
 
 # Standard packages
-from typing import Any, Dict, Optional, TYPE_CHECKING
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+# Elastic packages
+from elasticsearch.exceptions import ApiError
 
 # App packages
 from .. import utils
@@ -13,6 +18,27 @@ from ..client import es
 if TYPE_CHECKING:
     from elasticsearch import Elasticsearch
 
+INDEX_FINGERPRINTS = "esrs-index-fingerprints"
+
+# Memoized relevance fingerprints, keyed by (index, uuid, max_seq_no of each
+# shard), and the _ids of the index metadata known to be stored in
+# INDEX_FINGERPRINTS. Index metadata is stored by index, uuid, and mappings,
+# settings, and aliases versions, so writes of documents reuse it.
+FINGERPRINTS_MAX = 10000
+_fingerprints: Dict[Tuple[str, str, Tuple[Tuple[int, int], ...]], str] = {}
+_index_metadata_stored = set()
+_fingerprints_lock = threading.Lock()
+
+# Cache of index metadata (indices and mappings) from the content deployment,
+# keyed by (client identity, kind, index patterns). An entry is served as-is
+# for CONTENT_METADATA_TTL_SECONDS. After that, a cheap probe of the uuid and
+# the mappings, settings, and aliases versions of each matching index decides
+# whether the entry is still current or must be fetched again.
+CONTENT_METADATA_TTL_SECONDS = 30
+CONTENT_METADATA_MAX_ENTRIES = 256
+_metadata_cache: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+_metadata_cache_lock = threading.Lock()
+
 def _flatten_fields(properties, parent_key=""):
     """Recursively flattens the field mapping, ignoring multi-fields.
 
@@ -44,6 +70,66 @@ def _flatten_fields(properties, parent_key=""):
             fields[full_key] = "object"
     return fields
 
+def _get_metadata_versions(index_patterns: str, client: "Elasticsearch") -> Optional[Dict[str, Any]]:
+    """
+    Return the uuid and the mappings, settings, and aliases versions of the
+    indices matching the index patterns, by index. Return None if the probe
+    isn't permitted.
+    """
+    try:
+        response = client.options(ignore_status=404).cluster.state(
+            metric="metadata",
+            index=index_patterns,
+            filter_path=",".join([
+                "metadata.indices.*.settings.index.uuid",
+                "metadata.indices.*.mappings_version",
+                "metadata.indices.*.settings_version",
+                "metadata.indices.*.aliases_version",
+            ]),
+        )
+    except ApiError:
+        return None
+    if response.meta.status == 404:
+        return {}
+    return (response.body.get("metadata") or {}).get("indices") or {}
+
+def _metadata_signature(index_patterns: str, client: "Elasticsearch") -> Optional[str]:
+    """
+    Return a fingerprint of the uuid and the mappings, settings, and aliases
+    versions of the indices matching the index patterns. Return None if the
+    probe isn't permitted, in which case nothing is cached.
+    """
+    versions = _get_metadata_versions(index_patterns, client)
+    return utils.fingerprint(versions) if versions is not None else None
+
+def _get_cached_metadata(kind: str, index_patterns: str, client: "Elasticsearch", fetch: Callable[[], Any]) -> Any:
+    """
+    Return the cached metadata of the given kind for the index patterns, or
+    fetch and cache it when it expired and changed. Treat the returned value
+    as read-only.
+    """
+    key = (utils.client_identity(client), kind, index_patterns)
+    now = time.monotonic()
+    with _metadata_cache_lock:
+        entry = _metadata_cache.get(key)
+    if entry is not None and now < entry["expires_at"]:
+        return entry["value"]
+    signature = _metadata_signature(index_patterns, client)
+    if entry is not None and signature is not None and signature == entry["signature"]:
+        value = entry["value"]
+    else:
+        value = fetch()
+    if signature is not None:
+        with _metadata_cache_lock:
+            _metadata_cache[key] = {
+                "expires_at": now + CONTENT_METADATA_TTL_SECONDS,
+                "signature": signature,
+                "value": value,
+            }
+            if len(_metadata_cache) > CONTENT_METADATA_MAX_ENTRIES:
+                del _metadata_cache[min(_metadata_cache, key=lambda k: _metadata_cache[k]["expires_at"])]
+    return value
+
 def search(index_patterns: str, body: Dict[str, Any], es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     """Submit a search request to the content deployment.
 
@@ -71,10 +157,12 @@ def get(index_patterns: str, es_client: Optional["Elasticsearch"] = None) -> Dic
         A dictionary of indices with their settings and mappings.
     """
     client = es_client if es_client is not None else es("content")
-    response = client.options(ignore_status=404).indices.get(index=index_patterns)
-    if response.get("status") == 404:
-        return {}
-    return response.body
+    def fetch():
+        response = client.options(ignore_status=404).indices.get(index=index_patterns)
+        if response.get("status") == 404:
+            return {}
+        return response.body
+    return _get_cached_metadata("indices", index_patterns, client, fetch)
 
 def mappings_browse(index_patterns: str, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     """Retrieve flattened index mappings for browsing.
@@ -86,65 +174,146 @@ def mappings_browse(index_patterns: str, es_client: Optional["Elasticsearch"] =
         A dictionary mapping index names to their flattened fields and types.
     """
     client = es_client if es_client is not None else es("content")
-    response = client.options(ignore_status=404).indices.get_mapping(index=index_patterns)
-    if response.get("status") == 404:
-        return {}
-    mappings = response.body
-    indices = {}
-    for index, mapping in mappings.items():
-        fields = mapping["mappings"].get("properties", {})
-        fields_flattened = _flatten_fields(fields)
-        indices[index] = { "fields": fields_flattened }
-    return indices
-
-def make_index_relevance_fingerprints(index_pattern: str, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+    def fetch():
+        response = client.options(ignore_status=404).indices.get_mapping(index=index_patterns)
+        if response.get("status") == 404:
+            return {}
+        mappings = response.body
+        indices = {}
+        for index, mapping in mappings.items():
+            fields = mapping["mappings"].get("properties", {})
+            fields_flattened = _flatten_fields(fields)
+            indices[index] = { "fields": fields_flattened }
+        return indices
+    return _get_cached_metadata("mappings", index_patterns, client, fetch)
+
+def make_index_relevance_fingerprints(
+        index_pattern: str,
+        es_client: Optional["Elasticsearch"] = None,
+        studio_client: Optional["Elasticsearch"] = None,
+    ) -> Dict[str, Any]:
     """Generate relevance fingerprints for indices in an index pattern.
 
+    A fingerprint changes when an index is recreated (new uuid) or when any
+    of its shards has new writes (new max_seq_no). Only the uuid and max_seq_no
+    of each shard, and the mappings, settings, and aliases versions of each
+    index, are fetched. The aliases, settings, and mappings of each index are
+    stored in esrs-index-fingerprints once per uuid and versions, under the
+    "_metadata" _id of the index, rather than in every evaluation. Without
+    the versions, such as where the cluster state API isn't available, they
+    are stored once per fingerprint.
+
     Args:
         index_pattern: The Elasticsearch index pattern to analyze.
 
     Returns:
         A dictionary mapping index names to their relevance fingerprints and shard info.
     """
-    
-    # Create a fingerprint for each index in the given index pattern
     client = es_client if es_client is not None else es("content")
-    indices = get(index_pattern, es_client=client)
-    stats = client.indices.stats(index=index_pattern, level="shards")
+    stats = client.indices.stats(
+        index=index_pattern,
+        level="shards",
+        metric="docs",
+        filter_path="indices.*.uuid,indices.*.shards.*.seq_no.max_seq_no",
+    )
+    versions = _get_metadata_versions(index_pattern, client) or {}
     result = {}
-    for index_name in indices.keys():
-        if index_name not in stats["indices"]:
-            continue
-        index_uuid = indices[index_name]["settings"]["index"]["uuid"]
-
-        # Collect and deduplicate max_seq_no by shard
-        shard_seq_nos = []
-        shards = stats["indices"][index_name]["shards"]
-        for shard_id, shard_copies in shards.items():
-            for copy in shard_copies:
-                max_seq_no = copy.get("seq_no", {}).get("max_seq_no")
-                shard_seq_nos.append((int(shard_id), max_seq_no))
+    unstored = {}
+    for index_name, index_stats in ((stats.body or {}).get("indices") or {}).items():
+        index_uuid = index_stats.get("uuid")
 
+        # Deduplicate max_seq_no by shard, across the copies of each shard
         shard_maxes = {}
-        for shard_id, seq_no in shard_seq_nos:
-            shard_maxes[shard_id] = max(seq_no, shard_maxes.get(shard_id, -1))
+        for shard_id, shard_copies in (index_stats.get("shards") or {}).items():
+            for copy in shard_copies:
+                max_seq_no = (copy.get("seq_no") or {}).get("max_seq_no")
+                if max_seq_no is not None:
+                    shard_maxes[int(shard_id)] = max(max_seq_no, shard_maxes.get(int(shard_id), -1))
 
-        # Prepare the data for hashing, ensuring that shards are sorted by id
-        # for deterministic hashing.
+        # Sort shards by id for deterministic hashing
         shard_list = [
             {"id": shard_id, "max_seq_no": seq_no}
             for shard_id, seq_no in sorted(shard_maxes.items())
         ]
-        result[index_name] = {
-            "_index": index_name,
-            "_fingerprint": utils.fingerprint({
+        key = (index_name, index_uuid, tuple(sorted(shard_maxes.items())))
+        with _fingerprints_lock:
+            index_fingerprint = _fingerprints.get(key)
+        if index_fingerprint is None:
+            index_fingerprint = utils.fingerprint({
                 "index": index_name,
                 "uuid": index_uuid,
                 "shards": shard_list
-            }),
-            "aliases": indices[index_name].get("aliases") or {},
-            "settings": indices[index_name].get("settings") or {},
-            "mappings": indices[index_name].get("mappings") or {},
+            })
+            with _fingerprints_lock:
+                if len(_fingerprints) >= FINGERPRINTS_MAX:
+                    _fingerprints.clear()
+                _fingerprints[key] = index_fingerprint
+        
+        # Identify the stored metadata of the index by its versions
+        index_versions = versions.get(index_name)
+        if index_versions is not None:
+            index_versions = {
+                "mappings_version": index_versions.get("mappings_version"),
+                "settings_version": index_versions.get("settings_version"),
+                "aliases_version": index_versions.get("aliases_version"),
+            }
+            metadata_id = utils.fingerprint({ "index": index_name, "uuid": index_uuid, **index_versions })
+        else:
+            metadata_id = index_fingerprint
+        result[index_name] = {
+            "_index": index_name,
+            "_fingerprint": index_fingerprint,
+            "_metadata": metadata_id,
+            "uuid": index_uuid,
             "shards": shard_list
         }
-    return result
\ No newline at end of file
+        with _fingerprints_lock:
+            if metadata_id not in _index_metadata_stored:
+                unstored[index_name] = dict(result[index_name], versions=index_versions or {})
+    
+    # Store the aliases, settings, and mappings of new index metadata
+    if unstored:
+        indices = get(",".join(unstored.keys()), es_client=client)
+        studio = studio_client if studio_client is not None else es("studio")
+        for index_name, fingerprint in unstored.items():
+            if index_name not in indices:
+                continue
+            studio.options(ignore_status=409).index(
+                index=INDEX_FINGERPRINTS,
+                id=fingerprint["_metadata"],
+                document={
+                    "@timestamp": utils.timestamp(),
+                    "index": index_name,
+                    "uuid": fingerprint["uuid"],
+                    **fingerprint["versions"],
+                    "aliases": indices[index_name].get("aliases") or {},
+                    "settings": indices[index_name].get("settings") or {},
+                    "mappings": indices[index_name].get("mappings") or {},
+                },
+                op_type="create",
+            )
+            with _fingerprints_lock:
+                _index_metadata_stored.add(fingerprint["_metadata"])
+    return result
+
+def get_index_metadata(metadata_ids: List[str], es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+    """Get the stored aliases, settings, and mappings of indices.
+
+    Args:
+        metadata_ids: The "_metadata" _ids of the indices, as given by
+            make_index_relevance_fingerprints.
+
+    Returns:
+        A dictionary mapping each _id that was found to its document.
+    """
+    if not metadata_ids:
+        return {}
+    client = es_client if es_client is not None else es("studio")
+    es_response = client.options(ignore_status=404).mget(
+        index=INDEX_FINGERPRINTS,
+        ids=list(dict.fromkeys(metadata_ids)),
+    )
+    return {
+        doc["_id"]: doc["_source"]
+        for doc in (es_response.body.get("docs") or []) if doc.get("found")
+    }
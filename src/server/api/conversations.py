@@ -4,7 +4,7 @@
 # 2.0.
 
 # Standard packages
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Union, TYPE_CHECKING
 
 # Third-party packages
 from werkzeug.exceptions import Forbidden
@@ -13,6 +13,7 @@ from werkzeug.exceptions import Forbidden
 from .. import utils
 from ..client import es
 from ..models import ConversationsCreate, ConversationsUpdate
+from . import tool_results as api_tool_results
 
 if TYPE_CHECKING:
     from elasticsearch import Elasticsearch
@@ -42,6 +43,8 @@ def search(
         size: int = 10,
         page: int = 1,
         aggs: bool = False,
+        cursor: Optional[str] = None,
+        projection: Optional[Union[str, List[str]]] = None,
         user: Optional[str] = None,
         es_client: Optional["Elasticsearch"] = None,
     ) -> Dict[str, Any]:
@@ -54,6 +57,12 @@ def search(
         size: Number of conversations to return per page.
         page: Page number for pagination.
         aggs: Whether to include aggregations.
+        cursor: Optional cursor for pagination instead of page. Give "start" for
+            the first page, then the "next_cursor" of each response with the
+            same search inputs, until "next_cursor" is null.
+        projection: Optional fields to return for each conversation. Give
+            "summary" to omit large fields, "full" for all fields, or a list
+            of fields to include.
 
     Returns:
         A dictionary containing the search results.
@@ -61,6 +70,8 @@ def search(
     enforced_filters = [_created_by_filter(user), *(filters or [])]
     response = utils.search_assets(
         "conversations", None, text, enforced_filters, sort or {}, size, page,
+        cursor=cursor,
+        projection=projection,
         es_client=es_client,
     )
     return response
@@ -186,4 +197,7 @@ def delete(_id: str, user: Optional[str] = None, es_client: Optional["Elasticsea
         id=_id,
         refresh=True,
     )
+
+    # Remove any large tool results that were stored out of line
+    api_tool_results.delete_by_conversation(_id, user=user, es_client=client)
     return es_response
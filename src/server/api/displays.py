@@ -4,7 +4,7 @@
 # 2.0.
 
 # Standard packages
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Union, TYPE_CHECKING
 
 # App packages
 from .. import utils
@@ -24,6 +24,8 @@ def search(
         size: int = 10,
         page: int = 1,
         aggs: bool = False,
+        cursor: Optional[str] = None,
+        projection: Optional[Union[str, List[str]]] = None,
         es_client: Optional["Elasticsearch"] = None,
     ) -> Dict[str, Any]:
     """Search for displays.
@@ -36,40 +38,48 @@ def search(
         size: Number of displays to return per page.
         page: Page number for pagination.
         aggs: Whether to include aggregations.
+        cursor: Optional cursor for pagination instead of page. Give "start" for
+            the first page, then the "next_cursor" of each response with the
+            same search inputs, until "next_cursor" is null.
+        projection: Optional fields to return for each display. Give
+            "summary" to omit large fields, "full" for all fields, or a list
+            of fields to include.
 
     Returns:
         A dictionary containing the search results.
     """
     response = utils.search_assets(
         "displays", workspace_id, text, filters, sort, size, page,
+        cursor=cursor,
+        projection=projection,
         es_client=es_client,
     )
     return response
 
-def get(_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+def get(_id: str, projection: Optional[Union[str, List[str]]] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     """Get a display by its _id.
 
     Args:
         _id: The UUID of the display.
+        projection: Optional fields to return. Give "summary" to omit large
+            fields, "full" for all fields, or a list of fields to include.
 
     Returns:
         The display document from Elasticsearch.
     """
     client = es_client if es_client is not None else es("studio")
-    es_response = client.get(
-        index=INDEX_NAME,
-        id=_id,
-        source_excludes="_search",
-    )
+    es_response = utils.get_asset("displays", _id, projection, es_client=client)
     return es_response
 
-def create(doc: Dict[str, Any], _id: str = None, user: str = None, via: str = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+def create(doc: Dict[str, Any], _id: str = None, user: str = None, via: str = None, refresh: Optional[str] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     """Create a display.
 
     Args:
         doc: The display data to create.
         _id: Optional pregenerated UUID for idempotence.
         user: The username of the creator.
+        refresh: Refresh policy of the write: "true", "wait_for", or "false".
+            Defaults to ELASTICSEARCH_REFRESH.
 
     Returns:
         The response from the Elasticsearch index operation.
@@ -87,17 +97,19 @@ def create(doc: Dict[str, Any], _id: str = None, user: str = None, via: str = No
         index=INDEX_NAME,
         id=_id or utils.unique_id(),
         document=doc,
-        refresh=True,
+        refresh=utils.refresh_policy(refresh),
     )
     return es_response
 
-def update(_id: str, doc_partial: Dict[str, Any], user: str = None, via: str = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+def update(_id: str, doc_partial: Dict[str, Any], user: str = None, via: str = None, refresh: Optional[str] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     """Update a display by its _id.
 
     Args:
         _id: The UUID of the display.
         doc_partial: The partial display data to update.
         user: The username of the updater.
+        refresh: Refresh policy of the write: "true", "wait_for", or "false".
+            Defaults to ELASTICSEARCH_REFRESH.
 
     Returns:
         The response from the Elasticsearch update operation.
@@ -116,15 +128,17 @@ def update(_id: str, doc_partial: Dict[str, Any], user: str = None, via: str = N
         index=INDEX_NAME,
         id=_id,
         doc=doc_partial,
-        refresh=True
+        refresh=utils.refresh_policy(refresh)
     )
     return es_response
 
-def delete(_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+def delete(_id: str, refresh: Optional[str] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     """Delete a display by its _id.
 
     Args:
         _id: The UUID of the display to delete.
+        refresh: Refresh policy of the write: "true", "wait_for", or "false".
+            Defaults to ELASTICSEARCH_REFRESH.
 
     Returns:
         The response from the Elasticsearch delete operation.
@@ -133,6 +147,6 @@ def delete(_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict[str, A
     es_response = client.delete(
         index=INDEX_NAME,
         id=_id,
-        refresh=True,
+        refresh=utils.refresh_policy(refresh),
     )
     return es_response
\ No newline at end of file
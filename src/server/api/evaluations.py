@@ -8,7 +8,7 @@ import itertools
 import os
 import time
 import traceback
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Union, TYPE_CHECKING
 import logging
 
 # Elastic packages
@@ -33,6 +33,15 @@ INDEX_NAME = "esrs-evaluations"
 SEARCH_FIELDS = utils.get_search_fields_from_mapping("evaluations")
 VALID_METRICS = set([ "mrr", "ndcg", "precision", "recall" ])
 RANK_EVAL_BATCH_SIZE = int(os.getenv("RANK_EVAL_BATCH_SIZE", "0"))
+
+# The metrics and hits of each strategy for each scenario are stored as one
+# document in RESULTS_INDEX_NAME, so that results() pages through them in the
+# query. The results of an evaluation keep the strategy_id and failures of each
+# strategy. Evaluations stored before the results index keep their searches.
+RESULTS_INDEX_NAME = "esrs-evaluation-results"
+
+# Maximum number of strategy x scenario results returned per page by results()
+RESULTS_MAX_SIZE = 1000
 def _parse_rank_eval_batch_delay_seconds(value: str) -> float:
     """
     Parse RANK_EVAL_BATCH_DELAY from env.
@@ -515,7 +524,7 @@ def run(
             
         # Store index relevance fingerprints (optional in serverless mode)
         try:
-            evaluation["runtime"]["indices"] = content.make_index_relevance_fingerprints(index_pattern, es_client=None)
+            evaluation["runtime"]["indices"] = content.make_index_relevance_fingerprints(index_pattern, es_client=None, studio_client=client)
         except Exception:
             # Fallback for serverless mode where indices.stats API is not available
             evaluation["runtime"]["indices"] = {}
@@ -731,10 +740,20 @@ def run(
         
         # Store results
         if store_results:
+            _store_searches(evaluation_id, doc, es_client=client)
             es_response = client.update(
                 index=INDEX_NAME,
                 id=evaluation_id,
-                doc=doc,
+                doc={
+                    **doc,
+                    "results": [
+                        {
+                            "strategy_id": strategy_results["strategy_id"],
+                            "failures": strategy_results["failures"],
+                        }
+                        for strategy_results in doc["results"]
+                    ],
+                },
                 refresh=True
             )
             persist_benchmark_requests_count(rank_eval_requests_count)
@@ -772,6 +791,8 @@ def search(
         size: int = 10,
         page: int = 1,
         aggs: bool = False,
+        cursor: Optional[str] = None,
+        projection: Optional[Union[str, List[str]]] = None,
         es_client: Optional["Elasticsearch"] = None,
     ) -> Dict[str, Any]:
     """Search for evaluations.
@@ -785,6 +806,12 @@ def search(
         size: Number of evaluations to return per page.
         page: Page number for pagination.
         aggs: Whether to include aggregations.
+        cursor: Optional cursor for pagination instead of page. Give "start" for
+            the first page, then the "next_cursor" of each response with the
+            same search inputs, until "next_cursor" is null.
+        projection: Optional fields to return for each evaluation. Give
+            "summary" to omit large fields, "full" for all fields, or a list
+            of fields to include.
 
     Returns:
         A dictionary containing the search results.
@@ -792,26 +819,215 @@ def search(
     filters = [{ "term": { "benchmark_id": benchmark_id }}]
     response = utils.search_assets(
         "evaluations", workspace_id, text, filters, sort, size, page,
+        cursor=cursor,
+        projection=projection,
         es_client=es_client,
     )
     return response
 
-def get(_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+def get(_id: str, projection: Optional[Union[str, List[str]]] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     """Get an evaluation by its _id.
 
     Args:
         _id: The UUID of the evaluation.
+        projection: Optional fields to return. Give "summary" to omit large
+            fields, "full" for all fields, or a list of fields to include.
 
     Returns:
         The evaluation document from Elasticsearch.
     """
     client = es_client if es_client is not None else es("studio")
+    es_response = utils.get_asset("evaluations", _id, projection, es_client=client)
+    source = (es_response.body or {}).get("_source") or {}
+
+    # Hydrate the aliases, settings, and mappings of the indices, which are
+    # stored once per index metadata version rather than in each evaluation.
+    # Only projections that include runtime.indices need them.
+    indices = (source.get("runtime") or {}).get("indices") or {}
+    unhydrated = [
+        index.get("_metadata") or index["_fingerprint"] for index in indices.values()
+        if "mappings" not in index and (index.get("_metadata") or index.get("_fingerprint"))
+    ]
+    if unhydrated:
+        stored = content.get_index_metadata(unhydrated, es_client=client)
+        for index in indices.values():
+            doc = stored.get(index.get("_metadata") or index.get("_fingerprint"))
+            if "mappings" not in index and doc:
+                index["aliases"] = doc.get("aliases") or {}
+                index["settings"] = doc.get("settings") or {}
+                index["mappings"] = doc.get("mappings") or {}
+
+    # Hydrate the searches of the results, which are stored in the results
+    # index. Only projections that include the results need them.
+    strategies = [
+        strategy_results for strategy_results in source.get("results") or []
+        if "searches" not in strategy_results
+    ]
+    if strategies:
+        searches = {}
+        for result in _scan_searches(_id, es_client=client):
+            searches.setdefault(result.pop("strategy_id"), []).append(result)
+        for strategy_results in strategies:
+            strategy_results["searches"] = searches.get(strategy_results["strategy_id"]) or []
+    return es_response
+
+def _store_searches(_id: str, evaluation: Dict[str, Any], es_client: Optional["Elasticsearch"] = None) -> None:
+    """Store the metrics and hits of each strategy for each scenario of a
+    completed evaluation as one document each in the results index.
+
+    Args:
+        _id: The UUID of the evaluation.
+        evaluation: The completed evaluation, with the searches of its results.
+
+    Raises:
+        RuntimeError: If any of the documents failed to be stored.
+    """
+    actions = []
+    for strategy_results in evaluation.get("results") or []:
+        for search in strategy_results["searches"]:
+            actions.append({
+                "_op_type": "index",
+                "_id": utils.unique_id([ _id, strategy_results["strategy_id"], search["scenario_id"] ]),
+                "_source": {
+                    "workspace_id": evaluation["workspace_id"],
+                    "benchmark_id": evaluation["benchmark_id"],
+                    "evaluation_id": _id,
+                    "strategy_id": strategy_results["strategy_id"],
+                    "position": len(actions),
+                    **search,
+                },
+            })
+    if not actions:
+        return
+    client = es_client if es_client is not None else es("studio")
+    response = utils.bulk_write(RESULTS_INDEX_NAME, actions, refresh="true", es_client=client)
+    if response["errors"]:
+        error = next(item["error"] for item in response["items"] if "error" in item)
+        raise RuntimeError(f"Failed to store the results of evaluation {_id}: {error}")
+
+def _results_query(_id: str, strategy_id: Optional[str] = None, scenario_id: Optional[str] = None) -> Dict[str, Any]:
+    """Return the query of the stored results of an evaluation."""
+    filters = [{ "term": { "evaluation_id": _id }}]
+    if strategy_id:
+        filters.append({ "term": { "strategy_id": strategy_id }})
+    if scenario_id:
+        filters.append({ "term": { "scenario_id": scenario_id }})
+    return { "bool": { "filter": filters }}
+
+def _result(hit: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a stored result in the shape of the results of evaluations."""
+    source = hit["_source"]
+    return {
+        "strategy_id": source["strategy_id"],
+        "scenario_id": source["scenario_id"],
+        "metrics": source.get("metrics") or {},
+        "hits": source.get("hits") or [],
+    }
+
+def _scan_searches(_id: str, es_client: Optional["Elasticsearch"] = None) -> List[Dict[str, Any]]:
+    """Return all the stored results of an evaluation, in order."""
+    client = es_client if es_client is not None else es("studio")
+    body = {
+        "query": _results_query(_id),
+        "sort": [{ "position": "asc" }],
+        "size": RESULTS_MAX_SIZE,
+    }
+    results = []
+    while True:
+        es_response = client.search(
+            index=RESULTS_INDEX_NAME,
+            body=body,
+            filter_path="hits.hits._source,hits.hits.sort",
+        )
+        hits = (es_response.body.get("hits") or {}).get("hits") or []
+        results.extend(_result(hit) for hit in hits)
+        if len(hits) < RESULTS_MAX_SIZE:
+            return results
+        body["search_after"] = hits[-1]["sort"]
+
+def results(
+        _id: str,
+        strategy_id: Optional[str] = None,
+        scenario_id: Optional[str] = None,
+        size: int = 10,
+        page: int = 1,
+        es_client: Optional["Elasticsearch"] = None,
+    ) -> Dict[str, Any]:
+    """Get a page of the results of an evaluation.
+
+    Each result is the metrics and hits of one strategy for one scenario,
+    ordered by strategy and then by scenario. Give both strategy_id and
+    scenario_id to get a single result. Use evaluations_get with projection
+    "summary" for the metrics summarized by strategy and scenario.
+
+    Args:
+        _id: The UUID of the evaluation.
+        strategy_id: Optional UUID of a strategy to filter results by.
+        scenario_id: Optional UUID of a scenario to filter results by.
+        size: Number of results to return per page. Max 1000.
+        page: Page number for pagination.
+
+    Returns:
+        The page of results, the total number of matching results, and the
+        failures of the matching strategies.
+    """
+    size = max(0, min(int(size), RESULTS_MAX_SIZE))
+    page = max(1, int(page))
+    client = es_client if es_client is not None else es("studio")
     es_response = client.get(
         index=INDEX_NAME,
         id=_id,
-        source_excludes="_search",
+        source_includes=[ "results" ],
+        filter_path="_id,_source",
     )
-    return es_response
+    strategies = [
+        strategy_results for strategy_results in (es_response.body.get("_source") or {}).get("results") or []
+        if not strategy_id or strategy_results["strategy_id"] == strategy_id
+    ]
+    failures = [
+        { "strategy_id": strategy_results["strategy_id"], **failure }
+        for strategy_results in strategies
+        for failure in strategy_results.get("failures") or []
+    ]
+    response = {
+        "_id": _id,
+        "total": 0,
+        "size": size,
+        "page": page,
+        "results": [],
+        "failures": failures,
+    }
+    if not strategies:
+        return response
+
+    # Evaluations stored before the results index keep their searches
+    if any("searches" in strategy_results for strategy_results in strategies):
+        matches = [
+            { "strategy_id": strategy_results["strategy_id"], **search }
+            for strategy_results in strategies
+            for search in strategy_results.get("searches") or []
+            if not scenario_id or search["scenario_id"] == scenario_id
+        ]
+        start = (page - 1) * size
+        response["total"] = len(matches)
+        response["results"] = matches[start:start + size]
+        return response
+
+    es_response = client.search(
+        index=RESULTS_INDEX_NAME,
+        body={
+            "query": _results_query(_id, strategy_id, scenario_id),
+            "sort": [{ "position": "asc" }],
+            "from": (page - 1) * size,
+            "size": size,
+            "track_total_hits": True,
+        },
+        filter_path="hits.total,hits.hits._source",
+    )
+    hits = es_response.body.get("hits") or {}
+    response["total"] = (hits.get("total") or {}).get("value", 0)
+    response["results"] = [_result(hit) for hit in hits.get("hits") or []]
+    return response
 
 def create(
         workspace_id: str,
@@ -819,6 +1035,7 @@ def create(
         task: Dict[str, Any],
         user: str = None,
         via: str = None,
+        refresh: Optional[str] = None,
         es_client: Optional["Elasticsearch"] = None,
     ) -> Dict[str, Any]:
     """Create a pending evaluation for a given workspace and benchmark.
@@ -828,6 +1045,8 @@ def create(
         benchmark_id: The UUID of the benchmark.
         task: The evaluation task definition.
         user: The username of the creator.
+        refresh: Refresh policy of the write: "true", "wait_for", or "false".
+            Defaults to ELASTICSEARCH_REFRESH.
 
     Returns:
         The response from the Elasticsearch index operation.
@@ -846,15 +1065,17 @@ def create(
         index=INDEX_NAME,
         id=utils.unique_id(),
         document=doc,
-        refresh=True,
+        refresh=utils.refresh_policy(refresh),
     )
     return es_response
 
-def delete(_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
-    """Delete an evaluation from Elasticsearch.
+def delete(_id: str, refresh: Optional[str] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+    """Delete an evaluation and its stored results from Elasticsearch.
 
     Args:
         _id: The UUID of the evaluation to delete.
+        refresh: Refresh policy of the write: "true", "wait_for", or "false".
+            Defaults to ELASTICSEARCH_REFRESH.
 
     Returns:
         The response from the Elasticsearch delete operation.
@@ -863,7 +1084,13 @@ def delete(_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict[str, A
     es_response = client.delete(
         index=INDEX_NAME,
         id=_id,
-        refresh=True,
+        refresh=utils.refresh_policy(refresh),
+    )
+    client.delete_by_query(
+        index=RESULTS_INDEX_NAME,
+        query=_results_query(_id),
+        refresh=utils.refresh_policy(refresh, wait_for=False),
+        conflicts="proceed",
     )
     return es_response
 
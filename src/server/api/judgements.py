@@ -4,7 +4,11 @@
 # 2.0.
 
 # Standard packages
-from typing import Any, Dict, Optional, TYPE_CHECKING
+import copy
+import functools
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
 
 # App packages
 from .. import utils
@@ -17,6 +21,38 @@ if TYPE_CHECKING:
 INDEX_NAME = "esrs-judgements"
 SEARCH_FIELDS = utils.get_search_fields_from_mapping("judgements")
 
+# Number of judgements fetched per request when loading a scenario's judgements
+JUDGEMENTS_PAGE_SIZE = 10000
+
+# Maximum number of judged doc ids given as a filter to a content search. With
+# more judged docs, "rated" searches split the ids into chunks that run in one
+# _msearch, and "unrated" searches over-fetch hits and filter out judged docs.
+FILTER_IDS_MAX = 10000
+
+# Page size and maximum number of hits scanned when over-fetching "unrated"
+# hits. The maximum stays within the default index.max_result_window.
+UNRATED_PAGE_SIZE = 500
+UNRATED_SCAN_MAX = 10000
+
+# In-process cache of the judgements of recently searched scenarios, keyed by
+# (client identity, workspace_id, scenario_id), in least recently used order.
+# Each entry keeps the backing index and _seq_no of each judgement it holds,
+# and its version: their backing indices, count, max _seq_no, and sum of
+# _seq_no. Every write of a judgement gives it a greater _seq_no in its shard,
+# so the version changes with every write without relying on clocks. _seq_no
+# restarts in a new backing index after a reindex, so the backing indices are
+# part of the version.
+# A search checks the version with a cheap size 0 request and only refetches
+# the judgements when another process (or a delete_by_query) changed them.
+# set() and unset() update the entries in place from the _seq_no of their
+# writes. Until those writes are visible to search, the version that search
+# returns is one the entry has moved past, which is recorded so that the
+# entry isn't replaced by an older copy of the judgements.
+JUDGEMENT_MAPS_MAX = 256
+JUDGEMENT_MAP_PAST_VERSIONS_MAX = 32
+_judgement_maps: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+_judgement_maps_lock = threading.Lock()
+
 def search(
         workspace_id: str,
         scenario_id: str,
@@ -49,57 +85,15 @@ def search(
     response = {}
         
     # Get judgements for scenario
-    judgements = {}
-    body = {
-        "size": 10000,
-        "query": {
-            "bool": {
-                "filter": [
-                    { "term": { "workspace_id": workspace_id }},
-                    { "term": { "scenario_id": scenario_id }}
-                ]
-            }
-        },
-        "_source": {
-            "excludes": [
-                "_search"
-            ]
-        }
-    }
-    if filter == "rated-human":
-        body["query"]["bool"]["must_not"] = [
-            {"term": {"@meta.updated_via": "mcp"}},
-            {"term": {"@meta.updated_by": "ai"}},
-        ]
-    elif filter == "rated-ai":
-        body["query"]["bool"]["filter"].append({
-            "bool": {
-                "should": [
-                    {"term": {"@meta.updated_via": "mcp"}},
-                    {"term": {"@meta.updated_by": "ai"}},
-                ],
-                "minimum_should_match": 1,
-            }
-        })
-    if sort == "rating-newest":
-        body["sort"] = [{
-            "@meta.updated_at": "desc"
-        }]
-    elif sort == "rating-oldest":
-        body["sort"] = [{
-            "@meta.updated_at": "asc"
-        }]
     client = es_client if es_client is not None else es("studio")
-    es_response = client.search(index="esrs-judgements", body=body)
-    for hit in es_response.body.get("hits", {}).get("hits") or []:
-        _index = hit["_source"]["index"]
-        _id = hit["_source"]["doc_id"]
-        if _index not in judgements:
-            judgements[_index] = {}
-        judgements[_index][_id] = {
-            "_id": hit["_id"],
-            "@meta": hit["_source"].get("@meta"),
-            "rating": hit["_source"].get("rating"),
+    judgements = _get_judgement_map(workspace_id, scenario_id, client)
+    if filter in ( "rated-ai", "rated-human" ):
+        judgements = {
+            _index: {
+                _id: judgement for _id, judgement in docs.items()
+                if _is_rated_by_ai(judgement) == (filter == "rated-ai")
+            }
+            for _index, docs in judgements.items()
         }
         
     # Search docs on the content deployment
@@ -129,32 +123,32 @@ def search(
                 }
             }
         }
+    if sort == "match":
+        body["sort"] = [{
+            "_score": "desc"
+        }]
     
     # Filter docs by judgements (used judgement search UI)
-    if filter and filter != "all":
-        filter_clauses = []
-        for _index in judgements.keys():
-            filter_clauses.append({
-                "bool": {
-                    "filter": [
-                        { "term": { "_index": _index }},
-                        { "ids": { "values": list(judgements[_index].keys()) }}
-                    ]
-                }
-            })
+    content_client = es("content")
+    judged_count = sum(len(docs) for docs in judgements.values())
+    if not filter or filter == "all":
+        es_response = content_client.search(index=index_pattern, body=body)
+        response["hits"] = es_response.body["hits"]
+    elif judged_count <= FILTER_IDS_MAX:
+        filter_clauses = _ids_filter_clauses(judgements)
         if filter == "unrated":
             body["query"]["bool"]["must_not"] = filter_clauses
         else:
             body["query"]["bool"]["should"] = filter_clauses
             body["query"]["bool"]["minimum_should_match"] = 1
-    if sort == "match":
-        body["sort"] = [{
-            "_score": "desc"
-        }]
-    es_response = es("content").search(index=index_pattern, body=body)
+        es_response = content_client.search(index=index_pattern, body=body)
+        response["hits"] = es_response.body["hits"]
+    elif filter == "unrated":
+        response["hits"] = _search_unrated(content_client, index_pattern, body, judgements)
+    else:
+        response["hits"] = _search_rated(content_client, index_pattern, body, judgements)
     
     # Merge docs and ratings
-    response["hits"] = es_response.body["hits"]
     for i, hit in enumerate(response["hits"]["hits"]):
         response["hits"]["hits"][i] = {
             "_id": judgements.get(hit["_index"], {}).get(hit["_id"], {}).get("_id"),
@@ -168,7 +162,333 @@ def search(
         response["hits"]["hits"] = sorted(response["hits"]["hits"], key=lambda hit: (hit.get("@meta") or {}).get("created_at") or fallback, reverse=reverse)
     return response
 
-def set(workspace_id: str, scenario_id: str, index: str, doc_id: str, rating: int, user: str = None, via: str = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+def _ids_filter_clauses(judgements: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Return one clause per index that matches the judged docs of that index.
+    """
+    return [
+        {
+            "bool": {
+                "filter": [
+                    { "term": { "_index": _index }},
+                    { "ids": { "values": list(docs.keys()) }}
+                ]
+            }
+        }
+        for _index, docs in judgements.items() if docs
+    ]
+
+def _chunk_bodies(body: Dict[str, Any], judgements: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Return one copy of a search body per chunk of FILTER_IDS_MAX judged docs,
+    each filtered by the judged docs of its chunk.
+    """
+    pairs = [ (_index, doc_id) for _index, docs in judgements.items() for doc_id in docs ]
+    bodies = []
+    for chunk in utils.chunks(pairs, FILTER_IDS_MAX):
+        chunk_judgements = {}
+        for _index, doc_id in chunk:
+            chunk_judgements.setdefault(_index, {})[doc_id] = True
+        chunk_body = copy.deepcopy(body)
+        chunk_body["query"]["bool"]["should"] = _ids_filter_clauses(chunk_judgements)
+        chunk_body["query"]["bool"]["minimum_should_match"] = 1
+        bodies.append(chunk_body)
+    return bodies
+
+def _sort_orders(sort: Any) -> List[bool]:
+    """
+    Return whether each key of the sort of a search body is descending. Like
+    Elasticsearch, _score sorts descending and other fields ascending unless
+    an order is given.
+    """
+    orders = []
+    for key in sort if isinstance(sort, list) else [ sort ]:
+        if isinstance(key, str):
+            orders.append(key == "_score")
+            continue
+        field, order = next(iter(key.items()))
+        if isinstance(order, dict):
+            order = order.get("order")
+        orders.append(order == "desc" if order else field == "_score")
+    return orders
+
+def _sort_key(orders: List[bool]):
+    """
+    Return a key function that orders hits by their sort values, as the sort
+    with the given orders would.
+    """
+    def compare(a: Dict[str, Any], b: Dict[str, Any]) -> int:
+        for descending, value_a, value_b in zip(orders, a["sort"], b["sort"]):
+            if value_a == value_b:
+                continue
+            if value_a is None or value_b is None:
+                return 1 if value_a is None else -1
+            result = -1 if value_a < value_b else 1
+            return -result if descending else result
+        return 0
+    return functools.cmp_to_key(compare)
+
+def _search_rated(client: "Elasticsearch", index_pattern: str, body: Dict[str, Any], judgements: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Search for judged docs when there are too many to filter by in one
+    request. The judged docs are split into chunks of FILTER_IDS_MAX, each
+    searched for the top hits in a single _msearch, and the top hits of all
+    chunks are merged by their sort values, or by score when the search has
+    no sort. Filters don't affect either, so this returns the same top hits
+    as one search filtered by all judged docs.
+    """
+    size = body.get("size", 10)
+    searches = []
+    for chunk_body in _chunk_bodies(body, judgements):
+        searches.extend([ { "index": index_pattern }, chunk_body ])
+    es_response = client.msearch(searches=searches)
+    hits = []
+    total = 0
+    max_score = None
+    for item in es_response.body["responses"]:
+        if "error" in item:
+            raise Exception(f"Failed to search rated docs: {item['error']}")
+        hits.extend(item["hits"]["hits"])
+        total += item["hits"]["total"]["value"]
+        if item["hits"].get("max_score") is not None:
+            max_score = max(max_score or 0, item["hits"]["max_score"])
+    if body.get("sort"):
+        hits.sort(key=_sort_key(_sort_orders(body["sort"])))
+    else:
+        hits.sort(key=lambda hit: hit.get("_score") or 0, reverse=True)
+    return {
+        "total": { "value": total, "relation": "eq" },
+        "max_score": max_score,
+        "hits": hits[:size],
+    }
+
+def _search_unrated(client: "Elasticsearch", index_pattern: str, body: Dict[str, Any], judgements: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Search for docs without judgements when there are too many judged docs to
+    exclude in one request. Hits are fetched in pages of UNRATED_PAGE_SIZE and
+    judged docs are filtered out, until enough hits are found or
+    UNRATED_SCAN_MAX hits were scanned. The total is the number of matching
+    docs minus the number of matching judged docs, which are counted per
+    chunk of judged docs in a single _msearch.
+    """
+    size = body.get("size", 10)
+    page_body = dict(body, size=UNRATED_PAGE_SIZE, track_total_hits=True)
+    hits = []
+    total = None
+    max_score = None
+    scanned = 0
+    while len(hits) < size and scanned < UNRATED_SCAN_MAX:
+        page_body["from"] = scanned
+        es_response = client.search(index=index_pattern, body=page_body)
+        page = es_response.body["hits"]["hits"]
+        if total is None:
+            total = es_response.body["hits"]["total"]["value"]
+            max_score = es_response.body["hits"].get("max_score")
+        hits.extend(hit for hit in page if hit["_id"] not in judgements.get(hit["_index"], {}))
+        scanned += len(page)
+        if len(page) < UNRATED_PAGE_SIZE:
+            break
+    
+    # Count the judged docs that match the search
+    count_body = { "size": 0, "track_total_hits": True, "query": body["query"] }
+    searches = []
+    for chunk_body in _chunk_bodies(count_body, judgements):
+        searches.extend([ { "index": index_pattern }, chunk_body ])
+    judged_total = 0
+    for item in client.msearch(searches=searches).body["responses"]:
+        if "error" in item:
+            raise Exception(f"Failed to count rated docs: {item['error']}")
+        judged_total += item["hits"]["total"]["value"]
+    return {
+        "total": { "value": max(0, (total or 0) - judged_total), "relation": "eq" },
+        "max_score": max_score,
+        "hits": hits[:size],
+    }
+
+def _is_rated_by_ai(judgement: Dict[str, Any]) -> bool:
+    """
+    Return whether a judgement was last rated by AI, i.e. via MCP or by "ai".
+    """
+    meta = judgement.get("@meta") or {}
+    return meta.get("updated_via") == "mcp" or meta.get("updated_by") == "ai"
+
+def _scenario_query(workspace_id: str, scenario_id: str) -> Dict[str, Any]:
+    return {
+        "bool": {
+            "filter": [
+                { "term": { "workspace_id": workspace_id }},
+                { "term": { "scenario_id": scenario_id }}
+            ]
+        }
+    }
+
+def _get_judgements_version(workspace_id: str, scenario_id: str, client: "Elasticsearch") -> Tuple[Tuple[str, ...], int, Optional[int], int]:
+    """
+    Return the version of the judgements of a scenario: their backing indices,
+    count, max _seq_no, and sum of _seq_no.
+    """
+    es_response = client.search(index=INDEX_NAME, body={
+        "size": 0,
+        "track_total_hits": True,
+        "query": _scenario_query(workspace_id, scenario_id),
+        "aggs": {
+            "indices": { "terms": { "field": "_index", "size": 100 }},
+            "seq_no_max": { "max": { "field": "_seq_no" }},
+            "seq_no_sum": { "sum": { "field": "_seq_no" }}
+        }
+    })
+    body = es_response.body
+    aggs = body.get("aggregations") or {}
+    seq_no_max = aggs.get("seq_no_max", {}).get("value")
+    return (
+        tuple(sorted(bucket["key"] for bucket in aggs.get("indices", {}).get("buckets") or [])),
+        (body.get("hits", {}).get("total") or {}).get("value", 0),
+        int(seq_no_max) if seq_no_max is not None else None,
+        int(aggs.get("seq_no_sum", {}).get("value") or 0),
+    )
+
+def _judgements_version(seq_nos: Dict[str, Tuple[str, int]]) -> Tuple[Tuple[str, ...], int, Optional[int], int]:
+    """
+    Return the version of the judgements with the given backing index and
+    _seq_no by _id, as _get_judgements_version() would.
+    """
+    return (
+        tuple(sorted({ _index for _index, _ in seq_nos.values() })),
+        len(seq_nos),
+        max((seq_no for _, seq_no in seq_nos.values()), default=None),
+        sum(seq_no for _, seq_no in seq_nos.values()),
+    )
+
+def _get_judgement_map(workspace_id: str, scenario_id: str, client: "Elasticsearch") -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Return the judgements of a scenario as { index: { doc_id: { "_id", "@meta",
+    "rating" }}}, from the cache when its version is current, or when the
+    cache is ahead of what search sees. Treat the returned dict as read-only.
+    """
+    key = (utils.client_identity(client), workspace_id, scenario_id)
+    version = _get_judgements_version(workspace_id, scenario_id, client)
+    with _judgement_maps_lock:
+        entry = _judgement_maps.get(key)
+        if entry is not None and (entry["version"] == version or version in entry["past_versions"]):
+            if entry["version"] == version and entry["past_versions"]:
+                _judgement_maps[key] = dict(entry, past_versions=[])
+            _judgement_maps.move_to_end(key)
+            return entry["judgements"]
+    
+    # Fetch all judgements, paging in order of (index, doc_id), which is
+    # unique per scenario
+    judgements = {}
+    ids = {}
+    seq_nos = {}
+    body = {
+        "size": JUDGEMENTS_PAGE_SIZE,
+        "query": _scenario_query(workspace_id, scenario_id),
+        "_source": {
+            "includes": [ "index", "doc_id", "rating", "@meta" ]
+        },
+        "seq_no_primary_term": True,
+        "sort": [
+            { "index": "asc" },
+            { "doc_id": "asc" }
+        ]
+    }
+    while True:
+        es_response = client.search(index=INDEX_NAME, body=body)
+        hits = es_response.body.get("hits", {}).get("hits") or []
+        for hit in hits:
+            _index = hit["_source"]["index"]
+            _id = hit["_source"]["doc_id"]
+            judgements.setdefault(_index, {})[_id] = {
+                "_id": hit["_id"],
+                "@meta": hit["_source"].get("@meta"),
+                "rating": hit["_source"].get("rating"),
+            }
+            ids[hit["_id"]] = (_index, _id)
+            seq_nos[hit["_id"]] = (hit["_index"], hit["_seq_no"])
+        if len(hits) < JUDGEMENTS_PAGE_SIZE:
+            break
+        body["search_after"] = hits[-1]["sort"]
+    with _judgement_maps_lock:
+        _judgement_maps[key] = {
+            "version": _judgements_version(seq_nos),
+            "past_versions": [],
+            "judgements": judgements,
+            "ids": ids,
+            "seq_nos": seq_nos,
+        }
+        _judgement_maps.move_to_end(key)
+        while len(_judgement_maps) > JUDGEMENT_MAPS_MAX:
+            _judgement_maps.popitem(last=False)
+    return judgements
+
+def _update_judgement_map(_id: str, doc: Optional[Dict[str, Any]], es_body: Dict[str, Any], client: "Elasticsearch") -> None:
+    """
+    Apply a judgement that was set (given its doc) or unset (doc=None) to the
+    cached judgement map of its scenario for the identity of the client, if
+    any, with the backing index and _seq_no of the write. Entries are replaced
+    rather than mutated, so readers of the previous map aren't affected.
+    """
+    result = es_body.get("result")
+    seq_no = es_body.get("_seq_no")
+    backing_index = es_body.get("_index")
+    identity = utils.client_identity(client)
+    with _judgement_maps_lock:
+        for key, entry in _judgement_maps.items():
+            if key[0] != identity:
+                continue
+            if doc is not None and key[1:] != (doc["workspace_id"], doc["scenario_id"]):
+                continue
+            if doc is None and _id not in entry["ids"]:
+                continue
+            if doc is None and result != "deleted":
+                return
+            if doc is not None and (seq_no is None or backing_index is None):
+                del _judgement_maps[key]
+                return
+            judgements = dict(entry["judgements"])
+            ids = dict(entry["ids"])
+            seq_nos = dict(entry["seq_nos"])
+            if doc is None:
+                _index, doc_id = ids.pop(_id)
+                seq_nos.pop(_id)
+                judgements[_index] = { k: v for k, v in judgements[_index].items() if k != doc_id }
+            else:
+                _index, doc_id = doc["index"], doc["doc_id"]
+                # Same @meta as the upsert script
+                params = _upsert_body(doc)["script"]["params"]
+                existing = judgements.get(_index, {}).get(doc_id)
+                meta = dict((existing or {}).get("@meta") or {
+                    "created_at": params["now"],
+                    "created_by": params["username"],
+                    "created_via": params["via"],
+                })
+                meta.update({
+                    "updated_at": params["now"],
+                    "updated_by": params["username"],
+                    "updated_via": params["via"],
+                })
+                judgements[_index] = dict(judgements.get(_index, {}))
+                judgements[_index][doc_id] = { "_id": _id, "@meta": meta, "rating": doc["rating"] }
+                ids[_id] = (_index, doc_id)
+                seq_nos[_id] = (backing_index, seq_no)
+            _judgement_maps[key] = {
+                "version": _judgements_version(seq_nos),
+                "past_versions": (entry["past_versions"] + [entry["version"]])[-JUDGEMENT_MAP_PAST_VERSIONS_MAX:],
+                "judgements": judgements,
+                "ids": ids,
+                "seq_nos": seq_nos,
+            }
+            return
+
+def _clear_judgement_maps(workspace_id: str) -> None:
+    """
+    Drop the cached judgement maps of a workspace.
+    """
+    with _judgement_maps_lock:
+        for key in [ key for key in _judgement_maps if key[1] == workspace_id ]:
+            del _judgement_maps[key]
+
+def set(workspace_id: str, scenario_id: str, index: str, doc_id: str, rating: int, user: str = None, via: str = None, refresh: Optional[str] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     """Create or update a judgement.
     
     Generates a deterministic _id for UX efficiency, and to prevent the creation
@@ -181,23 +501,99 @@ def set(workspace_id: str, scenario_id: str, index: str, doc_id: str, rating: in
         doc_id: The _id of the document being judged.
         rating: The relevance rating (integer >= 0, using the workspace's rating scale).
         user: The username of the user performing the operation.
+        refresh: Refresh policy of the write: "true", "wait_for", or "false".
+            Defaults to ELASTICSEARCH_REFRESH.
 
     Returns:
         The response from the Elasticsearch update operation.
     """
     
     # Create, validate, and dump model
-    context = {"user": user, "via": via}
+    doc = _validate({"workspace_id": workspace_id, "scenario_id": scenario_id, "index": index, "doc_id": doc_id, "rating": rating}, user, via)
+    
+    # Submit
+    client = es_client if es_client is not None else es("studio")
+    _id = _make_id(doc)
+    es_response = client.update(
+        index=INDEX_NAME,
+        id=_id,
+        body=_upsert_body(doc),
+        refresh=utils.refresh_policy(refresh)
+    )
+    _update_judgement_map(_id, doc, es_response.body, client)
+    return es_response
+
+def bulk(workspace_id: str, operations: List[Dict[str, Any]], user: str = None, via: str = None, refresh: Optional[str] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+    """Set or unset many judgements in one request.
+
+    Each operation is validated on its own and reported in its own item, so
+    one invalid operation doesn't fail the others. Judgements are set with the
+    same deterministic _id as set(). The index is refreshed once at the end.
+
+    Args:
+        workspace_id: The UUID of the workspace.
+        operations: List of operations, each one of:
+            {"action": "set", "doc": {"scenario_id", "index", "doc_id", "rating"}},
+            {"action": "unset", "_id": "..."}.
+        user: The username of the user performing the operations.
+        refresh: Refresh policy of the write: "true", "wait_for", or "false".
+            Defaults to ELASTICSEARCH_REFRESH.
+
+    Returns:
+        "took", "errors" (whether any operation failed), and "items" with the
+        "action", "_id", "status", and "result" or "error" of each operation,
+        in the order of the operations.
+    """
+    actions = []
+    for operation in operations:
+        try:
+            action = operation.get("action")
+            if action == "set":
+                doc = dict(operation.get("doc") or {})
+                if doc.get("workspace_id", workspace_id) != workspace_id:
+                    raise ValueError("The workspace_id of the doc must match the workspace_id of the request.")
+                doc["workspace_id"] = workspace_id
+                doc = _validate(doc, user, via)
+                actions.append({ "_op_type": "update", "_id": _make_id(doc), **_upsert_body(doc) })
+            elif action == "unset":
+                if not operation.get("_id"):
+                    raise ValueError("An _id is required to unset.")
+                actions.append({ "_op_type": "delete", "_id": operation["_id"] })
+            else:
+                raise ValueError(f"Unsupported action: {action}")
+        except Exception as e:
+            actions.append(e)
+    response = utils.bulk_write(INDEX_NAME, actions, refresh=refresh, es_client=es_client)
+    _clear_judgement_maps(workspace_id)
+    return response
+
+def _validate(doc: Dict[str, Any], user: str = None, via: str = None) -> Dict[str, Any]:
+    """
+    Validate and dump a judgement, with its searchable fields copied to _search.
+    """
     doc = JudgementCreate.model_validate(
-        {"workspace_id": workspace_id, "scenario_id": scenario_id, "index": index, "doc_id": doc_id, "rating": rating},
-        context=context
+        {k: doc.get(k) for k in ("workspace_id", "scenario_id", "index", "doc_id", "rating")},
+        context={"user": user, "via": via}
     ).serialize()
+    return utils.copy_fields_to_search("judgements", doc)
 
-    # Copy searchable fields to _search
-    doc = utils.copy_fields_to_search("judgements", doc)
-    
-    # Submit
-    script = {
+def _make_id(doc: Dict[str, Any]) -> str:
+    """
+    Return the deterministic _id of a judgement for its scenario, index, and doc.
+    """
+    return utils.unique_id([
+        doc["workspace_id"],
+        doc["scenario_id"],
+        doc["index"],
+        doc["doc_id"],
+    ])
+
+def _upsert_body(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return the scripted upsert that sets the rating of a judgement, and keeps
+    its created_* metadata when it already exists.
+    """
+    return {
         "scripted_upsert": True,
         "script": {
             "source": """
@@ -229,25 +625,13 @@ def set(workspace_id: str, scenario_id: str, index: str, doc_id: str, rating: in
         "upsert": doc
     }
 
-    client = es_client if es_client is not None else es("studio")
-    es_response = client.update(
-        index=INDEX_NAME,
-        id=utils.unique_id([
-            doc["workspace_id"],
-            doc["scenario_id"],
-            doc["index"],
-            doc["doc_id"],
-        ]),
-        body=script,
-        refresh=True
-    )
-    return es_response
-
-def unset(_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+def unset(_id: str, refresh: Optional[str] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     """Delete a judgement in Elasticsearch.
 
     Args:
         _id: The unique identifier of the judgement to delete.
+        refresh: Refresh policy of the write: "true", "wait_for", or "false".
+            Defaults to ELASTICSEARCH_REFRESH.
 
     Returns:
         The response from the Elasticsearch delete operation.
@@ -256,6 +640,7 @@ def unset(_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict[str, An
     es_response = client.delete(
         index=INDEX_NAME,
         id=_id,
-        refresh=True
+        refresh=utils.refresh_policy(refresh)
     )
+    _update_judgement_map(_id, None, es_response.body, client)
     return es_response
\ No newline at end of file
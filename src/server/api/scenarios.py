@@ -4,7 +4,7 @@
 # 2.0.
 
 # Standard packages
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Union, TYPE_CHECKING
 
 # App packages
 from .. import utils
@@ -24,6 +24,8 @@ def search(
         size: int = 10,
         page: int = 1,
         aggs: bool = False,
+        cursor: Optional[str] = None,
+        projection: Optional[Union[str, List[str]]] = None,
         es_client: Optional["Elasticsearch"] = None,
     ) -> Dict[str, Any]:
     """Search for scenarios.
@@ -36,6 +38,12 @@ def search(
         size: Number of scenarios to return per page.
         page: Page number for pagination.
         aggs: Whether to include aggregations (e.g., judgement counts).
+        cursor: Optional cursor for pagination instead of page. Give "start" for
+            the first page, then the "next_cursor" of each response with the
+            same search inputs, until "next_cursor" is null.
+        projection: Optional fields to return for each scenario. Give
+            "summary" to omit large fields, "full" for all fields, or a list
+            of fields to include.
 
     Returns:
         A dictionary containing the search results.
@@ -43,6 +51,8 @@ def search(
     response = utils.search_assets(
         "scenarios", workspace_id, text, filters, sort, size, page,
         counts=[ "judgements" ] if aggs else [],
+        cursor=cursor,
+        projection=projection,
         es_client=es_client,
     )
     return response
@@ -59,24 +69,22 @@ def tags(workspace_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict
     es_response = utils.search_tags("scenarios", workspace_id, es_client=es_client)
     return es_response
 
-def get(_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+def get(_id: str, projection: Optional[Union[str, List[str]]] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     """Get a scenario by its _id.
 
     Args:
         _id: The UUID of the scenario.
+        projection: Optional fields to return. Give "summary" to omit large
+            fields, "full" for all fields, or a list of fields to include.
 
     Returns:
         The scenario document from Elasticsearch.
     """
     client = es_client if es_client is not None else es("studio")
-    es_response = client.get(
-        index=INDEX_NAME,
-        id=_id,
-        source_excludes="_search",
-    )
+    es_response = utils.get_asset("scenarios", _id, projection, es_client=client)
     return es_response
 
-def create(doc: Dict[str, Any], user: str = None, via: str = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+def create(doc: Dict[str, Any], user: str = None, via: str = None, refresh: Optional[str] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     """
     Create a scenario. Generates a deterministic _id for UX efficiency, and
     to prevent the creation of duplicate scenarios for the same values.
@@ -84,6 +92,8 @@ def create(doc: Dict[str, Any], user: str = None, via: str = None, es_client: Op
     Args:
         doc: The scenario data to create.
         user: The username of the creator.
+        refresh: Refresh policy of the write: "true", "wait_for", or "false".
+            Defaults to ELASTICSEARCH_REFRESH.
 
     Returns:
         The response from the Elasticsearch index operation.
@@ -101,17 +111,19 @@ def create(doc: Dict[str, Any], user: str = None, via: str = None, es_client: Op
         index=INDEX_NAME,
         id=utils.unique_id([ doc["workspace_id"], doc["values"] ]),
         document=doc,
-        refresh=True,
+        refresh=utils.refresh_policy(refresh),
     )
     return es_response
 
-def update(_id: str, doc_partial: Dict[str, Any], user: str = None, via: str = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+def update(_id: str, doc_partial: Dict[str, Any], user: str = None, via: str = None, refresh: Optional[str] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     """Update a scenario by its _id.
 
     Args:
         _id: The UUID of the scenario.
         doc_partial: The partial scenario data to update.
         user: The username of the updater.
+        refresh: Refresh policy of the write: "true", "wait_for", or "false".
+            Defaults to ELASTICSEARCH_REFRESH.
 
     Returns:
         The response from the Elasticsearch update operation.
@@ -129,15 +141,88 @@ def update(_id: str, doc_partial: Dict[str, Any], user: str = None, via: str = N
         index=INDEX_NAME,
         id=_id,
         doc=doc_partial,
-        refresh=True
+        refresh=utils.refresh_policy(refresh)
     )
     return es_response
 
-def delete(_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+def bulk(workspace_id: str, operations: List[Dict[str, Any]], user: str = None, via: str = None, refresh: Optional[str] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+    """Create, update, or delete many scenarios in one request.
+
+    Each operation is validated on its own and reported in its own item, so
+    one invalid operation doesn't fail the others. Scenarios are created with
+    the same deterministic _id as create(), and deleting a scenario also
+    deletes its judgements. The index is refreshed once at the end.
+
+    Args:
+        workspace_id: The UUID of the workspace.
+        operations: List of operations, each one of:
+            {"action": "create", "doc": {...}},
+            {"action": "update", "_id": "...", "doc": {...}},
+            {"action": "delete", "_id": "..."}.
+        user: The username of the user performing the operations.
+        refresh: Refresh policy of the write: "true", "wait_for", or "false".
+            Defaults to ELASTICSEARCH_REFRESH.
+
+    Returns:
+        "took", "errors" (whether any operation failed), and "items" with the
+        "action", "_id", "status", and "result" or "error" of each operation,
+        in the order of the operations.
+    """
+    actions = []
+    for operation in operations:
+        try:
+            action = operation.get("action")
+            if action in ("update", "delete") and not operation.get("_id"):
+                raise ValueError(f"An _id is required to {action}.")
+            doc = dict(operation.get("doc") or {})
+            if doc.get("workspace_id", workspace_id) != workspace_id:
+                raise ValueError("The workspace_id of the doc must match the workspace_id of the request.")
+            doc["workspace_id"] = workspace_id
+            if action == "create":
+                doc = ScenarioCreate.model_validate(doc, context={"user": user, "via": via}).serialize()
+                actions.append({
+                    "_op_type": "index",
+                    "_id": utils.unique_id([ doc["workspace_id"], doc["values"] ]),
+                    "_source": utils.copy_fields_to_search("scenarios", doc),
+                })
+            elif action == "update":
+                doc = ScenarioUpdate.model_validate(doc, context={"user": user, "via": via}).serialize()
+                actions.append({
+                    "_op_type": "update",
+                    "_id": operation["_id"],
+                    "doc": utils.copy_fields_to_search("scenarios", doc),
+                })
+            elif action == "delete":
+                actions.append({ "_op_type": "delete", "_id": operation["_id"] })
+            else:
+                raise ValueError(f"Unsupported action: {action}")
+        except Exception as e:
+            actions.append(e)
+    client = es_client if es_client is not None else es("studio")
+    response = utils.bulk_write(INDEX_NAME, actions, refresh=refresh, es_client=client)
+    
+    # Delete the judgements of the scenarios that were deleted, keeping those
+    # of scenarios whose delete failed
+    deleted = [
+        item["_id"] for item in response["items"]
+        if item["action"] == "delete" and "error" not in item
+    ]
+    if deleted:
+        client.delete_by_query(
+            index="esrs-judgements",
+            query={ "terms": { "scenario_id": deleted }},
+            refresh=utils.refresh_policy(refresh, wait_for=False),
+            conflicts="proceed",
+        )
+    return response
+
+def delete(_id: str, refresh: Optional[str] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     """Delete a scenario and its associated judgements.
 
     Args:
         _id: The UUID of the scenario to delete.
+        refresh: Refresh policy of the write: "true", "wait_for", or "false".
+            Defaults to ELASTICSEARCH_REFRESH.
 
     Returns:
         The response from the Elasticsearch delete_by_query operation.
@@ -171,7 +256,7 @@ def delete(_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict[str, A
     es_response = client.delete_by_query(
         index="esrs-scenarios,esrs-judgements",
         body=body,
-        refresh=True,
+        refresh=utils.refresh_policy(refresh, wait_for=False),
         conflicts="proceed",
     )
     return es_response
\ No newline at end of file
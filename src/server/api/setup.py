@@ -5,13 +5,17 @@
 
 import json
 import os
+import threading
+import time
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
 
 # Elastic packages
 from elasticsearch.exceptions import ApiError, NotFoundError, RequestError
 
 # App packages
+from .. import utils
 from ..client import es
 
 if TYPE_CHECKING:
@@ -30,11 +34,29 @@ PATH_INDEX_TEMPLATES = [
     ("esrs-strategies", os.path.join(PATH_INDEX_TEMPLATE_DIR, "strategies.json")),
     ("esrs-benchmarks", os.path.join(PATH_INDEX_TEMPLATE_DIR, "benchmarks.json")),
     ("esrs-evaluations", os.path.join(PATH_INDEX_TEMPLATE_DIR, "evaluations.json")),
+    ("esrs-tool-results", os.path.join(PATH_INDEX_TEMPLATE_DIR, "tool_results.json")),
+    ("esrs-index-fingerprints", os.path.join(PATH_INDEX_TEMPLATE_DIR, "index_fingerprints.json")),
+    ("esrs-evaluation-results", os.path.join(PATH_INDEX_TEMPLATE_DIR, "evaluation_results.json")),
 ]
 VALID_STEP_ACTIONS = set(["create_template", "update_template"])
 LEDGER_INDEX = "esrs-system"
 LEDGER_DOC_ID = "index-template-migrations"
 
+# Steps that require a reindex copy an index into a versioned backing index,
+# named "<index>-<version>", behind an alias with the name of the index. The
+# copy runs as a sliced, throttled reindex task, which is polled and recorded
+# in the ledger so that an interrupted upgrade resumes the same task.
+REINDEX_REQUESTS_PER_SECOND = 5000
+REINDEX_POLL_SECONDS = 5
+REINDEX_RECONCILE_PAGE_SIZE = 1000
+
+# The deployed index templates and indices, and the results of check(), are
+# cached briefly per client identity, because the UI checks the setup on every
+# load. Setups and upgrades clear the cache.
+SETUP_STATE_TTL_SECONDS = 5
+_state_cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+_state_cache_lock = threading.Lock()
+
 
 def is_cloud(headers: Dict[str, Any]) -> bool:
     """Check if the Elasticsearch response headers indicate Elastic Cloud.
@@ -108,10 +130,38 @@ def _read_server_version() -> Optional[str]:
         return None
 
 
+def _get_cached_state(kind: str, client: Optional["Elasticsearch"], fetch) -> Any:
+    """
+    Return the cached state of the given kind for the identity of a client,
+    or fetch and cache it when it expired. Errors aren't cached. Treat the
+    returned value as read-only.
+    """
+    key = (utils.client_identity(client) if client is not None else "", kind)
+    now = time.monotonic()
+    with _state_cache_lock:
+        entry = _state_cache.get(key)
+    if entry is not None and now < entry["expires_at"]:
+        return entry["value"]
+    value = fetch()
+    with _state_cache_lock:
+        _state_cache[key] = {"expires_at": now + SETUP_STATE_TTL_SECONDS, "value": value}
+    return value
+
+
+def _clear_cached_state():
+    with _state_cache_lock:
+        _state_cache.clear()
+
+
 def _load_index_templates() -> Dict[str, Dict[str, Any]]:
+    """
+    Load the index templates from the registry of utils.load_index_template(),
+    which reads each template from disk once. Treat the bodies of the returned
+    templates as read-only.
+    """
     templates = {}
     for template_name, path_index_template in PATH_INDEX_TEMPLATES:
-        body = _load_json(path_index_template)
+        body = utils.load_index_template(os.path.splitext(os.path.basename(path_index_template))[0])
         index_name = body["index_patterns"][0].replace("*", "")
         templates[template_name] = {
             "name": template_name,
@@ -123,7 +173,16 @@ def _load_index_templates() -> Dict[str, Dict[str, Any]]:
 
 
 def _load_migration_manifest() -> Dict[str, Any]:
-    manifest = _load_json(PATH_INDEX_TEMPLATE_MIGRATIONS)
+    return _load_migration_manifest_from(PATH_INDEX_TEMPLATE_MIGRATIONS)
+
+
+@lru_cache(maxsize=8)
+def _load_migration_manifest_from(path: str) -> Dict[str, Any]:
+    """
+    Load and validate a migration manifest once. Treat the returned value as
+    read-only.
+    """
+    manifest = _load_json(path)
     schema_version = manifest.get("schema_version")
     versions = manifest.get("versions")
     if not isinstance(schema_version, int):
@@ -160,6 +219,20 @@ def _load_migration_manifest() -> Dict[str, Any]:
                 raise ValueError(
                     f"'mapping_additions' for template '{template}' in '{version}' must be an object."
                 )
+            if "backfill" in step and not isinstance((step["backfill"] or {}).get("script"), dict):
+                raise ValueError(
+                    f"'backfill' for template '{template}' in '{version}' must be an object with a 'script'."
+                )
+            if "reindex" in step:
+                reindex = step["reindex"]
+                if not isinstance(reindex, dict) or ("script" in reindex and not isinstance(reindex["script"], dict)):
+                    raise ValueError(
+                        f"'reindex' for template '{template}' in '{version}' must be an object with an optional 'script'."
+                    )
+                if not requires_reindex:
+                    raise ValueError(
+                        f"'reindex' for template '{template}' in '{version}' requires 'requires_reindex' to be true."
+                    )
 
     ordered = sorted(versions, key=_version_sort_key)
     if [v["version"] for v in ordered] != [v["version"] for v in versions]:
@@ -170,9 +243,7 @@ def _load_migration_manifest() -> Dict[str, Any]:
 def _read_ledger(es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     client = es_client if es_client is not None else es("studio")
     try:
-        if not client.indices.exists(index=LEDGER_INDEX):
-            return {"applied_versions": []}
-        response = client.get(index=LEDGER_INDEX, id=LEDGER_DOC_ID)
+        response = client.options(ignore_status=404).get(index=LEDGER_INDEX, id=LEDGER_DOC_ID)
         source = response.body.get("_source", {}) if response and response.body else {}
         versions = source.get("applied_versions", [])
         if not isinstance(versions, list):
@@ -182,14 +253,17 @@ def _read_ledger(es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
         return {"applied_versions": []}
 
 
-def _write_ledger(applied_versions: List[str], via: str = "api", es_client: Optional["Elasticsearch"] = None):
-    client = es_client if es_client is not None else es("studio")
+def _create_ledger_index(client: "Elasticsearch"):
     try:
         client.indices.create(index=LEDGER_INDEX)
     except RequestError as e:
         if e.error != "resource_already_exists_exception":
             raise
 
+
+def _write_ledger(applied_versions: List[str], via: str = "api", es_client: Optional["Elasticsearch"] = None):
+    client = es_client if es_client is not None else es("studio")
+    _create_ledger_index(client)
     document = {
         "applied_versions": sorted(set(applied_versions), key=_parse_semver),
         "@meta": {
@@ -209,16 +283,63 @@ def _append_applied_version(version: str, via: str = "api", es_client: Optional[
     return _write_ledger(versions + [version], via=via, es_client=es_client)
 
 
-def _get_deployed_template_version(template_name: str, es_client: Optional["Elasticsearch"] = None):
+def _get_deployed_templates(es_client: Optional["Elasticsearch"] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Return the deployed esrs-* index templates by name, with one wildcard
+    request.
+    """
     client = es_client if es_client is not None else es("studio")
+    def fetch():
+        response = client.options(ignore_status=404).indices.get_index_template(name="esrs-*")
+        return {
+            template["name"]: template
+            for template in (response.body or {}).get("index_templates", [])
+        }
+    return _get_cached_state("index_templates", es_client, fetch)
+
+
+def _get_deployed_indices(es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+    """
+    Return the existing esrs-* indices by name, with one wildcard request
+    that returns only their uuids and aliases. The aliases of versioned
+    backing indices are included by name, too.
+    """
+    client = es_client if es_client is not None else es("studio")
+    def fetch():
+        response = client.options(ignore_status=404).indices.get(
+            index="esrs-*",
+            features="aliases,settings",
+            expand_wildcards="open,closed",
+            filter_path="*.aliases,*.settings.index.uuid",
+        )
+        if response.meta.status == 404:
+            return {}
+        indices = dict(response.body or {})
+        for index_name, index in list(indices.items()):
+            for alias in (index or {}).get("aliases") or {}:
+                indices.setdefault(alias, index)
+        return indices
+    return _get_cached_state("indices", es_client, fetch)
+
+
+def _is_index_exists_error(e: RequestError) -> bool:
+    """
+    Return whether creating an index failed only because the index exists,
+    either as an index or as the alias of a versioned backing index.
+    """
+    if e.error == "resource_already_exists_exception":
+        return True
+    return e.error == "invalid_index_name_exception" and "alias" in json.dumps(e.body or {})
+
+
+def _get_deployed_template_version(template_name: str, es_client: Optional["Elasticsearch"] = None):
     try:
-        response = client.indices.get_index_template(name=template_name)
-        templates = response.body.get("index_templates", [])
-        if not templates:
-            return None
-        return templates[0].get("index_template", {}).get("_meta", {}).get("version")
+        template = _get_deployed_templates(es_client).get(template_name)
     except (ApiError, NotFoundError):
         return None
+    if not template:
+        return None
+    return template.get("index_template", {}).get("_meta", {}).get("version")
 
 
 def _is_release_applied(release: Dict[str, Any], es_client: Optional["Elasticsearch"] = None) -> bool:
@@ -227,9 +348,36 @@ def _is_release_applied(release: Dict[str, Any], es_client: Optional["Elasticsea
         deployed_version = _get_deployed_template_version(step["template"], es_client)
         if not deployed_version or not _version_gte(deployed_version, required_version):
             return False
+
+        # The template is updated before the reindex, so a reindex step is
+        # applied only once the alias points to the new backing index.
+        if step.get("requires_reindex") and not _is_reindex_applied(step["template"], required_version, es_client):
+            return False
     return True
 
 
+def _is_reindex_applied(template_name: str, version: str, es_client: Optional["Elasticsearch"] = None) -> bool:
+    template = _load_index_templates().get(template_name)
+    if not template:
+        return False
+    try:
+        indices = _get_deployed_indices(es_client)
+    except ApiError:
+        return False
+    alias = template["index_name"]
+    for index_name, index in indices.items():
+        if index_name == alias or not index_name.startswith(f"{alias}-"):
+            continue
+        if alias not in ((index or {}).get("aliases") or {}):
+            continue
+        try:
+            if _version_gte(index_name[len(alias) + 1:], version):
+                return True
+        except ValueError:
+            continue
+    return False
+
+
 def _effective_current_version(applied_versions: List[str], manifest_versions: List[Dict[str, Any]], es_client: Optional["Elasticsearch"] = None):
     if applied_versions:
         return sorted(applied_versions, key=_parse_semver)[-1]
@@ -245,38 +393,55 @@ def _effective_current_version(applied_versions: List[str], manifest_versions: L
 
 def check_setup_state(es_client: Optional["Elasticsearch"] = None):
     result = {"failures": 0, "requests": []}
-    for _, path_index_template in PATH_INDEX_TEMPLATES:
-        body = _load_json(path_index_template)
-        index_name = body["index_patterns"][0].replace("*", "")
+    try:
+        templates, templates_error = _get_deployed_templates(es_client), None
+    except ApiError as e:
+        templates, templates_error = {}, e
+    try:
+        indices, indices_error = _get_deployed_indices(es_client), None
+    except ApiError as e:
+        indices, indices_error = {}, e
+    for template in _load_index_templates().values():
+        index_name = template["index_name"]
 
-        client = es_client if es_client is not None else es("studio")
-        try:
-            response = client.indices.get_index_template(name=index_name)
+        if templates_error is not None:
+            result["failures"] += 1
             result["requests"].append({
                 "index_template": index_name,
-                "response": {"body": response.body, "status": response.meta.status},
+                "response": {"body": templates_error.body, "status": templates_error.meta.status},
+            })
+        elif index_name in templates:
+            result["requests"].append({
+                "index_template": index_name,
+                "response": {"body": {"index_templates": [templates[index_name]]}, "status": 200},
             })
-        except (ApiError, NotFoundError) as e:
+        else:
             result["failures"] += 1
             result["requests"].append({
                 "index_template": index_name,
-                "response": {"body": e.body, "status": e.meta.status},
+                "response": {
+                    "body": {
+                        "error": {"type": "resource_not_found_exception", "reason": f"index template matching [{index_name}] not found"},
+                        "status": 404,
+                    },
+                    "status": 404,
+                },
             })
 
-        try:
-            exists = client.indices.exists(index=index_name)
+        if indices_error is not None:
+            result["failures"] += 1
             result["requests"].append({
                 "index": index_name,
-                "response": {"body": "OK" if exists else "Not Found", "status": 200 if exists else 404},
+                "response": {"body": indices_error.body, "status": indices_error.meta.status},
             })
-            if not exists:
-                result["failures"] += 1
-        except ApiError as e:
-            result["failures"] += 1
+        else:
+            exists = index_name in indices
             result["requests"].append({
                 "index": index_name,
-                "response": {"body": e.body, "status": e.meta.status},
+                "response": {"body": "OK" if exists else "Not Found", "status": 200 if exists else 404},
             })
+            if not exists:
+                result["failures"] += 1
     return result
 
 
@@ -313,6 +478,7 @@ def check_upgrade_state(es_client: Optional["Elasticsearch"] = None):
                 "requires_reindex": requires_reindex,
                 "description": step.get("description", ""),
                 "mapping_additions": step.get("mapping_additions", {}),
+                "backfill": "backfill" in step,
             })
 
     current_version = _effective_current_version(applied_versions, versions, es_client)
@@ -339,9 +505,10 @@ def check_upgrade_state(es_client: Optional["Elasticsearch"] = None):
 def run_setup(es_client: Optional["Elasticsearch"] = None):
     client = es_client if es_client is not None else es("studio")
     result = {"failures": 0, "requests": []}
-    for _, path_index_template in PATH_INDEX_TEMPLATES:
-        body = _load_json(path_index_template)
-        index_name = body["index_patterns"][0].replace("*", "")
+    _clear_cached_state()
+    for template in _load_index_templates().values():
+        body = template["body"]
+        index_name = template["index_name"]
         try:
             response = client.indices.put_index_template(name=index_name, body=body)
             result["requests"].append({
@@ -366,7 +533,7 @@ def run_setup(es_client: Optional["Elasticsearch"] = None):
                 "index": index_name,
                 "response": {"body": e.body, "status": e.meta.status},
             })
-            if e.error != "resource_already_exists_exception":
+            if not _is_index_exists_error(e):
                 result["failures"] += 1
         except ApiError as e:
             result["failures"] += 1
@@ -374,10 +541,11 @@ def run_setup(es_client: Optional["Elasticsearch"] = None):
                 "index": index_name,
                 "response": {"body": e.body, "status": e.meta.status},
             })
+    _clear_cached_state()
     return result
 
 
-def _execute_upgrade_step(step: Dict[str, Any], index_templates: Dict[str, Dict[str, Any]], es_client: Optional["Elasticsearch"] = None) -> List[Dict[str, Any]]:
+def _execute_upgrade_step(step: Dict[str, Any], index_templates: Dict[str, Dict[str, Any]], es_client: Optional["Elasticsearch"] = None, version: Optional[str] = None, via: str = "api") -> List[Dict[str, Any]]:
     requests = []
     template_name = step["template"]
     if template_name not in index_templates:
@@ -392,7 +560,11 @@ def _execute_upgrade_step(step: Dict[str, Any], index_templates: Dict[str, Dict[
         "response": {"body": response.body, "status": response.meta.status},
     })
 
-    if step["action"] == "create_template":
+    # The new backing index gets its mappings from the updated template, so
+    # mapping additions and backfills don't apply to a reindex step.
+    if step.get("requires_reindex"):
+        requests.extend(_execute_reindex_step(step, version or template["version"], template, via, client))
+    elif step["action"] == "create_template":
         try:
             response = client.indices.create(index=template["index_name"])
             requests.append({
@@ -406,28 +578,339 @@ def _execute_upgrade_step(step: Dict[str, Any], index_templates: Dict[str, Dict[
                 "action": "create_index",
                 "response": {"body": e.body, "status": e.meta.status},
             })
-            if e.error != "resource_already_exists_exception":
+            if not _is_index_exists_error(e):
                 raise
     elif step["action"] == "update_template":
         mapping_additions = step.get("mapping_additions", {})
-        if mapping_additions and client.indices.exists(index=template["index_name"]):
-            response = client.indices.put_mapping(
-                index=template["index_name"],
-                body={"properties": mapping_additions},
-            )
-            requests.append({
-                "index": template["index_name"],
-                "action": "put_mapping",
-                "response": {"body": response.body, "status": response.meta.status},
-            })
+        backfill = step.get("backfill")
+        if (mapping_additions or backfill) and client.indices.exists(index=template["index_name"]):
+            if mapping_additions:
+                response = client.indices.put_mapping(
+                    index=template["index_name"],
+                    body={"properties": mapping_additions},
+                )
+                requests.append({
+                    "index": template["index_name"],
+                    "action": "put_mapping",
+                    "response": {"body": response.body, "status": response.meta.status},
+                })
+            
+            # Populate new fields in existing documents. The query should
+            # select only the documents that lack them, so that a backfill
+            # can be resumed after a partial run.
+            if backfill:
+                response = client.update_by_query(
+                    index=template["index_name"],
+                    query=backfill.get("query") or {"match_all": {}},
+                    script=backfill["script"],
+                    conflicts="proceed",
+                    refresh=True,
+                )
+                requests.append({
+                    "index": template["index_name"],
+                    "action": "backfill",
+                    "response": {"body": response.body, "status": response.meta.status},
+                })
     else:
         raise ValueError(f"Unsupported upgrade action '{step['action']}'.")
     return requests
 
 
+def _read_reindex_record(record_id: str, client: "Elasticsearch") -> Dict[str, Any]:
+    try:
+        response = client.options(ignore_status=404).get(index=LEDGER_INDEX, id=record_id)
+        return (response.body or {}).get("_source", {}) if response else {}
+    except (ApiError, NotFoundError):
+        return {}
+
+
+def _write_reindex_record(record_id: str, record: Dict[str, Any], via: str, client: "Elasticsearch"):
+    _create_ledger_index(client)
+    record["@meta"] = {
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+        "updated_by": "system",
+        "updated_via": via,
+    }
+    return client.index(index=LEDGER_INDEX, id=record_id, document=record, refresh=True)
+
+
+def _get_alias_target(alias: str, client: "Elasticsearch") -> Optional[str]:
+    """
+    Return the index that an alias points to, the alias itself if it's still
+    a concrete index, or None if neither exists.
+    """
+    response = client.options(ignore_status=404).indices.get_alias(name=alias)
+    if response.meta.status == 200 and response.body:
+        if len(response.body) > 1:
+            raise ValueError(f"Alias '{alias}' points to more than one index: {', '.join(sorted(response.body))}.")
+        return next(iter(response.body))
+    if client.indices.exists(index=alias):
+        return alias
+    return None
+
+
+def _get_min_max_seq_no(index: str, client: "Elasticsearch") -> int:
+    """
+    Return the lowest max_seq_no of the shards of an index. Every document
+    written to the index afterwards has a greater _seq_no.
+    """
+    response = client.indices.stats(
+        index=index,
+        level="shards",
+        metric="docs",
+        filter_path="indices.*.shards.*.seq_no.max_seq_no",
+    )
+    max_seq_nos = [
+        shard_copy.get("seq_no", {}).get("max_seq_no", -1)
+        for index_stats in response.body.get("indices", {}).values()
+        for shard_copies in index_stats.get("shards", {}).values()
+        for shard_copy in shard_copies
+    ]
+    return min(max_seq_nos) if max_seq_nos else -1
+
+
+def _wait_for_reindex_task(record_id: str, record: Dict[str, Any], via: str, client: "Elasticsearch") -> Dict[str, Any]:
+    """
+    Poll a reindex task until it completes, recording its progress in the
+    ledger, and return its response.
+    """
+    while True:
+        response = client.tasks.get(task_id=record["task_id"])
+        status = response.body.get("task", {}).get("status", {})
+        record["progress"] = {
+            key: status.get(key, 0)
+            for key in ("total", "created", "updated", "deleted", "batches", "version_conflicts")
+        }
+        if response.body.get("completed"):
+            task_response = response.body.get("response", {})
+            error = response.body.get("error") or task_response.get("failures")
+            if error:
+                record["status"] = "failed"
+                record["error"] = error
+                _write_reindex_record(record_id, record, via, client)
+                raise ValueError(f"Reindex from '{record['source']}' to '{record['dest']}' failed.")
+            return task_response
+        _write_reindex_record(record_id, record, via, client)
+        time.sleep(REINDEX_POLL_SECONDS)
+
+
+def _reconcile_deletes(source: str, dest: str, client: "Elasticsearch") -> int:
+    """
+    Delete the documents of the dest index that no longer exist in the source
+    index, by paging through the _ids of the dest index. Return the number of
+    deleted documents.
+    """
+    deleted = 0
+    pit_id = client.open_point_in_time(index=dest, keep_alive=utils.CURSOR_KEEP_ALIVE).body["id"]
+    try:
+        search_after = None
+        while True:
+            body = {
+                "size": REINDEX_RECONCILE_PAGE_SIZE,
+                "_source": False,
+                "pit": {"id": pit_id, "keep_alive": utils.CURSOR_KEEP_ALIVE},
+                "sort": [{"_shard_doc": "asc"}],
+            }
+            if search_after is not None:
+                body["search_after"] = search_after
+            response = client.search(body=body)
+            pit_id = response.body.get("pit_id") or pit_id
+            hits = response.body["hits"]["hits"]
+            if not hits:
+                break
+            search_after = hits[-1]["sort"]
+            ids = [hit["_id"] for hit in hits]
+            docs = client.mget(index=source, ids=ids, source=False).body["docs"]
+            missing = [doc["_id"] for doc in docs if not doc.get("found")]
+            if missing:
+                client.bulk(operations=[{"delete": {"_index": dest, "_id": _id}} for _id in missing], refresh=True)
+                deleted += len(missing)
+    finally:
+        client.options(ignore_status=404).close_point_in_time(id=pit_id)
+    return deleted
+
+
+def _catch_up(source: str, dest: str, after_seq_no: int, options: Dict[str, Any], client: "Elasticsearch") -> Dict[str, Any]:
+    """
+    Copy the documents written to the source index after a _seq_no checkpoint.
+    """
+    body = {
+        "source": {"index": source, "query": {"range": {"_seq_no": {"gt": after_seq_no}}}},
+        "dest": {"index": dest},
+    }
+    if options.get("script"):
+        body["script"] = options["script"]
+    response = client.reindex(**body, conflicts="proceed", slices="auto", refresh=True, wait_for_completion=True)
+    if response.body.get("failures"):
+        raise ValueError(f"Catching up '{dest}' with '{source}' failed.")
+    return {
+        "index": dest,
+        "action": "reindex_catch_up",
+        "response": {"body": response.body, "status": response.meta.status},
+    }
+
+
+def _count(index: str, client: "Elasticsearch") -> int:
+    return client.count(index=index).body["count"]
+
+
+def _set_write_block(index: str, blocked: bool, client: "Elasticsearch"):
+    if blocked:
+        client.indices.add_block(index=index, block="write")
+    else:
+        client.options(ignore_status=404).indices.put_settings(index=index, settings={"index.blocks.write": False})
+
+
+def _execute_reindex_step(step: Dict[str, Any], version: str, template: Dict[str, Any], via: str, client: "Elasticsearch") -> List[Dict[str, Any]]:
+    """
+    Copy an index into a versioned backing index and swap it behind an alias
+    with the name of the index, without blocking reads.
+
+    The bulk of the documents is copied by a sliced, throttled reindex task
+    while the source index takes writes. The documents written during the copy
+    are then caught up from a _seq_no checkpoint, and the documents deleted
+    during the copy are removed, still without blocking writes. Only then is
+    the source index blocked for writes, while the few documents written since
+    a second checkpoint are caught up and the alias is moved to the new index
+    in one atomic request that also removes the source index.
+
+    Each stage is recorded in the ledger. A running task is resumed, and a
+    write block left by an interrupted upgrade is lifted before resuming.
+    """
+    alias = template["index_name"]
+    dest = f"{alias}-{version}"
+    record_id = f"reindex-{alias}-{version}"
+    options = step.get("reindex") or {}
+    requests = []
+
+    source = _get_alias_target(alias, client)
+    record = _read_reindex_record(record_id, client)
+    if source == dest:
+        if record and record.get("status") != "completed":
+            record["status"] = "completed"
+            record["completed_at"] = datetime.now(timezone.utc).isoformat()
+            _write_reindex_record(record_id, record, via, client)
+        return requests
+
+    # Nothing to copy. Create the backing index behind the alias.
+    if source is None:
+        response = client.indices.create(index=dest, aliases={alias: {"is_write_index": True}})
+        requests.append({
+            "index": dest,
+            "action": "create_index",
+            "response": {"body": response.body, "status": response.meta.status},
+        })
+        return requests
+
+    def start_reindex() -> Dict[str, Any]:
+
+        # Remove a backing index left by an earlier failed attempt
+        client.options(ignore_status=404).indices.delete(index=dest)
+        response = client.indices.create(index=dest)
+        requests.append({
+            "index": dest,
+            "action": "create_index",
+            "response": {"body": response.body, "status": response.meta.status},
+        })
+        record = {
+            "template": template["name"],
+            "version": version,
+            "source": source,
+            "dest": dest,
+            "status": "reindexing",
+            "source_max_seq_no": _get_min_max_seq_no(source, client),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+        }
+        body = {"source": {"index": source}, "dest": {"index": dest}}
+        if options.get("script"):
+            body["script"] = options["script"]
+        response = client.reindex(
+            **body,
+            conflicts="proceed",
+            slices="auto",
+            requests_per_second=options.get("requests_per_second", REINDEX_REQUESTS_PER_SECOND),
+            wait_for_completion=False,
+        )
+        record["task_id"] = response.body["task"]
+        _write_reindex_record(record_id, record, via, client)
+        return record
+
+    resumable = record.get("source") == source and record.get("task_id")
+
+    # Lift a write block left by an upgrade that was interrupted while the
+    # source index was blocked, and resume from the catch-up.
+    if resumable and record.get("status") == "blocked":
+        _set_write_block(source, False, client)
+        record["status"] = "catching_up"
+        _write_reindex_record(record_id, record, via, client)
+
+    # Resume the reindex task of an interrupted upgrade, unless its result is
+    # gone.
+    if not resumable or record.get("status") not in ("reindexing", "catching_up"):
+        record = start_reindex()
+    if record["status"] == "reindexing":
+        try:
+            task_response = _wait_for_reindex_task(record_id, record, via, client)
+        except NotFoundError:
+            record = start_reindex()
+            task_response = _wait_for_reindex_task(record_id, record, via, client)
+        requests.append({
+            "index": dest,
+            "action": "reindex",
+            "response": {"body": task_response, "status": 200},
+        })
+
+    try:
+        # Copy the documents written during the reindex, and remove the ones
+        # deleted during the reindex, while the source index takes writes.
+        checkpoint = _get_min_max_seq_no(source, client)
+        requests.append(_catch_up(source, dest, record["source_max_seq_no"], options, client))
+        record["status"] = "catching_up"
+        record["source_max_seq_no"] = checkpoint
+        _write_reindex_record(record_id, record, via, client)
+        client.indices.refresh(index=source)
+        record["deleted"] = record.get("deleted", 0) + _reconcile_deletes(source, dest, client)
+
+        # Block writes, and copy the documents written since the checkpoint.
+        # The new index then has every document of the source index, so equal
+        # counts mean that no document was deleted since the reconciliation.
+        record["status"] = "blocked"
+        _write_reindex_record(record_id, record, via, client)
+        _set_write_block(source, True, client)
+        requests.append(_catch_up(source, dest, checkpoint, options, client))
+        client.indices.refresh(index=source)
+        if _count(source, client) != _count(dest, client):
+            record["deleted"] += _reconcile_deletes(source, dest, client)
+
+        # Move the alias and remove the source index atomically. If the source
+        # index has the name of the alias, this swaps the index for the alias.
+        response = client.indices.update_aliases(actions=[
+            {"add": {"index": dest, "alias": alias, "is_write_index": True}},
+            {"remove_index": {"index": source}},
+        ])
+        requests.append({
+            "index": alias,
+            "action": "swap_alias",
+            "response": {"body": response.body, "status": response.meta.status},
+        })
+    except (ApiError, ValueError) as e:
+        if record["status"] == "blocked":
+            _set_write_block(source, False, client)
+        record["status"] = "failed"
+        record["error"] = str(e)
+        _write_reindex_record(record_id, record, via, client)
+        raise
+
+    record["status"] = "completed"
+    record["completed_at"] = datetime.now(timezone.utc).isoformat()
+    _write_reindex_record(record_id, record, via, client)
+    return requests
+
+
 def run_upgrade(additive_only: bool = True, via: str = "api", es_client: Optional["Elasticsearch"] = None):
     manifest = _load_migration_manifest()
     index_templates = _load_index_templates()
+    _clear_cached_state()
     upgrade_state = check_upgrade_state(es_client)
 
     result = {
@@ -467,7 +950,9 @@ def run_upgrade(additive_only: bool = True, via: str = "api", es_client: Optiona
                 break
 
             try:
-                step_requests = _execute_upgrade_step(step, index_templates, es_client)
+                step_requests = _execute_upgrade_step(
+                    step, index_templates, es_client, version=release["version"], via=via,
+                )
                 for request in step_requests:
                     request["version"] = release["version"]
                     request["template"] = step["template"]
@@ -491,6 +976,7 @@ def run_upgrade(additive_only: bool = True, via: str = "api", es_client: Optiona
         _append_applied_version(release["version"], via=via, es_client=es_client)
         result["upgrade"]["applied_versions"].append(release["version"])
 
+    _clear_cached_state()
     latest = check_upgrade_state(es_client)
     result["upgrade"]["upgrade_needed"] = latest["upgrade_needed"]
     result["upgrade"]["pending_versions"] = latest["pending_versions"]
@@ -537,6 +1023,10 @@ def check(es_client: Optional["Elasticsearch"] = None):
     Args:
         es_client: Optional Elasticsearch client. When omitted, uses the default studio client.
     """
+    return _get_cached_state("check", es_client, lambda: _check(es_client))
+
+
+def _check(es_client: Optional["Elasticsearch"] = None):
     cluster_info = get_cluster_info(es_client)
     license_info = get_license_info(es_client)
     deployment_mode = "standard"
@@ -574,14 +1064,16 @@ def run(via: str = "api", es_client: Optional["Elasticsearch"] = None):
     return {"setup": run_setup(es_client)}
 
 
-def upgrade(via: str = "api", es_client: Optional["Elasticsearch"] = None):
+def upgrade(via: str = "api", reindex: bool = False, es_client: Optional["Elasticsearch"] = None):
     """Apply additive index-template upgrade steps from the migration manifest.
 
     Args:
+        reindex: Also apply steps that require a reindex, by copying each
+            index into a versioned backing index behind an alias.
         es_client: Optional Elasticsearch client. When omitted, uses the default studio client.
 
     Returns:
         Dict[str, Any]: A dictionary with upgrade execution details under
         `upgrade`.
     """
-    return run_upgrade(additive_only=True, via=via, es_client=es_client)
+    return run_upgrade(additive_only=not reindex, via=via, es_client=es_client)
@@ -4,7 +4,7 @@
 # 2.0.
 
 # Standard packages
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Union, TYPE_CHECKING
 
 # App packages
 from .. import utils
@@ -24,6 +24,8 @@ def search(
         size: int = 10,
         page: int = 1,
         aggs: bool = False,
+        cursor: Optional[str] = None,
+        projection: Optional[Union[str, List[str]]] = None,
         es_client: Optional["Elasticsearch"] = None,
     ) -> Dict[str, Any]:
     """Search for strategies.
@@ -36,12 +38,20 @@ def search(
         size: Number of strategies to return per page.
         page: Page number for pagination.
         aggs: Whether to include aggregations.
+        cursor: Optional cursor for pagination instead of page. Give "start" for
+            the first page, then the "next_cursor" of each response with the
+            same search inputs, until "next_cursor" is null.
+        projection: Optional fields to return for each strategy. Give
+            "summary" to omit large fields, "full" for all fields, or a list
+            of fields to include.
 
     Returns:
         A dictionary containing the search results.
     """
     response = utils.search_assets(
         "strategies", workspace_id, text, filters, sort, size, page,
+        cursor=cursor,
+        projection=projection,
         es_client=es_client,
     )
     return response
@@ -58,30 +68,30 @@ def tags(workspace_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict
     es_response = utils.search_tags("strategies", workspace_id, es_client=es_client)
     return es_response
 
-def get(_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+def get(_id: str, projection: Optional[Union[str, List[str]]] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     """Get a strategy by its _id.
 
     Args:
         _id: The UUID of the strategy.
+        projection: Optional fields to return. Give "summary" to omit large
+            fields, "full" for all fields, or a list of fields to include.
 
     Returns:
         The strategy document from Elasticsearch.
     """
     client = es_client if es_client is not None else es("studio")
-    es_response = client.get(
-        index=INDEX_NAME,
-        id=_id,
-        source_excludes="_search",
-    )
+    es_response = utils.get_asset("strategies", _id, projection, es_client=client)
     return es_response
 
-def create(doc: Dict[str, Any], _id: str = None, user: str = None, via: str = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+def create(doc: Dict[str, Any], _id: str = None, user: str = None, via: str = None, refresh: Optional[str] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     """Create a strategy.
 
     Args:
         doc: The strategy data to create.
         _id: Optional pregenerated UUID for idempotence.
         user: The username of the creator.
+        refresh: Refresh policy of the write: "true", "wait_for", or "false".
+            Defaults to ELASTICSEARCH_REFRESH.
 
     Returns:
         The response from the Elasticsearch index operation.
@@ -99,17 +109,19 @@ def create(doc: Dict[str, Any], _id: str = None, user: str = None, via: str = No
         index=INDEX_NAME,
         id=_id or utils.unique_id(),
         document=doc,
-        refresh=True,
+        refresh=utils.refresh_policy(refresh),
     )
     return es_response
 
-def update(_id: str, doc_partial: Dict[str, Any], user: str = None, via: str = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+def update(_id: str, doc_partial: Dict[str, Any], user: str = None, via: str = None, refresh: Optional[str] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     """Update a strategy by its _id.
 
     Args:
         _id: The UUID of the strategy.
         doc_partial: The partial strategy data to update.
         user: The username of the updater.
+        refresh: Refresh policy of the write: "true", "wait_for", or "false".
+            Defaults to ELASTICSEARCH_REFRESH.
 
     Returns:
         The response from the Elasticsearch update operation.
@@ -127,15 +139,71 @@ def update(_id: str, doc_partial: Dict[str, Any], user: str = None, via: str = N
         index=INDEX_NAME,
         id=_id,
         doc=doc_partial,
-        refresh=True
+        refresh=utils.refresh_policy(refresh)
     )
     return es_response
 
-def delete(_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+def bulk(workspace_id: str, operations: List[Dict[str, Any]], user: str = None, via: str = None, refresh: Optional[str] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+    """Create, update, or delete many strategies in one request.
+
+    Each operation is validated on its own and reported in its own item, so
+    one invalid operation doesn't fail the others. The index is refreshed once
+    at the end.
+
+    Args:
+        workspace_id: The UUID of the workspace.
+        operations: List of operations, each one of:
+            {"action": "create", "_id": "..." (optional), "doc": {...}},
+            {"action": "update", "_id": "...", "doc": {...}},
+            {"action": "delete", "_id": "..."}.
+        user: The username of the user performing the operations.
+        refresh: Refresh policy of the write: "true", "wait_for", or "false".
+            Defaults to ELASTICSEARCH_REFRESH.
+
+    Returns:
+        "took", "errors" (whether any operation failed), and "items" with the
+        "action", "_id", "status", and "result" or "error" of each operation,
+        in the order of the operations.
+    """
+    actions = []
+    for operation in operations:
+        try:
+            action = operation.get("action")
+            if action in ("update", "delete") and not operation.get("_id"):
+                raise ValueError(f"An _id is required to {action}.")
+            doc = dict(operation.get("doc") or {})
+            if doc.get("workspace_id", workspace_id) != workspace_id:
+                raise ValueError("The workspace_id of the doc must match the workspace_id of the request.")
+            doc["workspace_id"] = workspace_id
+            if action == "create":
+                doc = StrategyCreate.model_validate(doc, context={"user": user, "via": via}).serialize()
+                actions.append({
+                    "_op_type": "index",
+                    "_id": operation.get("_id") or utils.unique_id(),
+                    "_source": utils.copy_fields_to_search("strategies", doc),
+                })
+            elif action == "update":
+                doc = StrategyUpdate.model_validate(doc, context={"user": user, "via": via}).serialize()
+                actions.append({
+                    "_op_type": "update",
+                    "_id": operation["_id"],
+                    "doc": utils.copy_fields_to_search("strategies", doc),
+                })
+            elif action == "delete":
+                actions.append({ "_op_type": "delete", "_id": operation["_id"] })
+            else:
+                raise ValueError(f"Unsupported action: {action}")
+        except Exception as e:
+            actions.append(e)
+    return utils.bulk_write(INDEX_NAME, actions, refresh=refresh, es_client=es_client)
+
+def delete(_id: str, refresh: Optional[str] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     """Delete a strategy by its _id.
 
     Args:
         _id: The UUID of the strategy to delete.
+        refresh: Refresh policy of the write: "true", "wait_for", or "false".
+            Defaults to ELASTICSEARCH_REFRESH.
 
     Returns:
         The response from the Elasticsearch delete operation.
@@ -144,6 +212,6 @@ def delete(_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict[str, A
     es_response = client.delete(
         index=INDEX_NAME,
         id=_id,
-        refresh=True
+        refresh=utils.refresh_policy(refresh)
     )
     return es_response
\ No newline at end of file
@@ -0,0 +1,150 @@
+# Copyright Elasticsearch B.V. and/or licensed to Elasticsearch B.V. under one
+# or more contributor license agreements. Licensed under the Elastic License
+# 2.0; you may not use this file except in compliance with the Elastic License
+# 2.0.
+
+# Standard packages
+from typing import Any, Dict, Optional, TYPE_CHECKING
+
+# Third-party packages
+from werkzeug.exceptions import Forbidden
+
+# App packages
+from .. import utils
+from ..client import es
+from ..models import ToolResultCreate
+
+if TYPE_CHECKING:
+    from elasticsearch import Elasticsearch
+
+INDEX_NAME = "esrs-tool-results"
+
+# Default and maximum number of characters returned by a single get()
+DEFAULT_LENGTH = 8000
+MAX_LENGTH = 32000
+
+
+def _normalize_user(user: Optional[str]) -> str:
+    return user or "unknown"
+
+
+def _assert_owner(es_response: Any, user: Optional[str]) -> None:
+    body = es_response if isinstance(es_response, dict) else getattr(es_response, "body", {}) or {}
+    source = body.get("_source", {})
+    owner = (source.get("@meta") or {}).get("created_by")
+    if owner != _normalize_user(user):
+        raise Forbidden("Tool result access denied.")
+
+def make_id(content: str, tool_id: str, conversation_id: Optional[str] = None, user: Optional[str] = None) -> str:
+    """Return the content-addressed _id of a stored tool result.
+
+    Identical results from the same tool in the same conversation share one
+    document, so repeated calls don't grow the index.
+    """
+    return utils.unique_id([_normalize_user(user), conversation_id or "", tool_id, utils.fingerprint(content)])
+
+def get(
+        _id: str,
+        offset: int = 0,
+        length: int = DEFAULT_LENGTH,
+        user: Optional[str] = None,
+        es_client: Optional["Elasticsearch"] = None,
+    ) -> Dict[str, Any]:
+    """Get a slice of a large tool result that was stored out of line.
+
+    Large tool results are replaced in the conversation with a digest that
+    includes a `tool_result_ref._id`. Use this to read the full content in
+    slices. Continue from `next_offset` until it is null.
+
+    Args:
+        _id: The _id from `tool_result_ref._id`.
+        offset: Character offset to start reading from. Default 0.
+        length: Maximum number of characters to return. Default 8000, max 32000.
+
+    Returns:
+        The slice of content with its offset, the total size, and the next offset.
+    """
+    client = es_client if es_client is not None else es("studio")
+    es_response = client.get(
+        index=INDEX_NAME,
+        id=_id,
+    )
+    _assert_owner(es_response, user)
+    source = es_response.body["_source"] if hasattr(es_response, "body") else es_response["_source"]
+    content = source.get("content") or ""
+    offset = max(0, int(offset or 0))
+    length = max(1, min(int(length or DEFAULT_LENGTH), MAX_LENGTH))
+    chunk = content[offset:offset + length]
+    next_offset = offset + len(chunk)
+    return {
+        "_id": _id,
+        "tool_id": source.get("tool_id"),
+        "conversation_id": source.get("conversation_id"),
+        "size": len(content),
+        "offset": offset,
+        "length": len(chunk),
+        "next_offset": next_offset if next_offset < len(content) else None,
+        "content": chunk,
+    }
+
+def create(
+        content: str,
+        tool_id: str,
+        conversation_id: Optional[str] = None,
+        user: str = None,
+        via: str = None,
+        es_client: Optional["Elasticsearch"] = None,
+    ) -> str:
+    """Store a tool result out of line and return its content-addressed _id.
+
+    Args:
+        content: The full serialized tool result.
+        tool_id: The name of the tool that produced the result.
+        conversation_id: Optional conversation the result belongs to.
+        user: The username of the creator.
+
+    Returns:
+        The _id of the stored tool result.
+    """
+    _id = make_id(content, tool_id, conversation_id, user)
+
+    # Create, validate, and dump model
+    doc = ToolResultCreate.model_validate({
+        "tool_id": tool_id,
+        "conversation_id": conversation_id,
+        "content": content,
+    }, context={"user": user, "via": via}).serialize()
+
+    # Submit. The document is content-addressed, so a conflict means the same
+    # result was already stored. No refresh is needed because reads use the
+    # realtime get API.
+    client = es_client if es_client is not None else es("studio")
+    client.options(ignore_status=409).index(
+        index=INDEX_NAME,
+        id=_id,
+        document=doc,
+        op_type="create",
+    )
+    return _id
+
+def delete_by_conversation(conversation_id: str, user: Optional[str] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+    """Delete all tool results stored for a conversation.
+
+    Args:
+        conversation_id: The UUID of the conversation.
+
+    Returns:
+        The response from the Elasticsearch delete by query operation.
+    """
+    client = es_client if es_client is not None else es("studio")
+    es_response = client.delete_by_query(
+        index=INDEX_NAME,
+        query={"bool": {"filter": [
+            {"term": {"conversation_id": conversation_id}},
+            {"term": {"@meta.created_by": _normalize_user(user)}},
+        ]}},
+        ignore_unavailable=True,
+        conflicts="proceed",
+        refresh=True,
+    )
+    return es_response
@@ -4,7 +4,7 @@
 # 2.0.
 
 # Standard packages
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Union, TYPE_CHECKING
 
 # App packages
 from .. import utils
@@ -23,6 +23,8 @@ def search(
         size: int = 10,
         page: int = 1,
         aggs: bool = False,
+        cursor: Optional[str] = None,
+        projection: Optional[Union[str, List[str]]] = None,
         es_client: Optional["Elasticsearch"] = None,
     ) -> Dict[str, Any]:
     """Search for workspaces.
@@ -34,6 +36,12 @@ def search(
         size: Number of workspaces to return per page.
         page: Page number for pagination.
         aggs: Whether to include aggregations (e.g., asset counts).
+        cursor: Optional cursor for pagination instead of page. Give "start" for
+            the first page, then the "next_cursor" of each response with the
+            same search inputs, until "next_cursor" is null.
+        projection: Optional fields to return for each workspace. Give
+            "summary" to omit large fields, "full" for all fields, or a list
+            of fields to include.
 
     Returns:
         A dictionary containing the search results.
@@ -41,6 +49,8 @@ def search(
     response = utils.search_assets(
         "workspaces", None, text, filters, sort, size, page,
         counts=[ "displays", "scenarios", "judgements", "strategies", "benchmarks" ] if aggs else [],
+        cursor=cursor,
+        projection=projection,
         es_client=es_client,
     )
     return response
@@ -54,30 +64,30 @@ def tags(es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     es_response = utils.search_tags("workspaces", es_client=es_client)
     return es_response
 
-def get(_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+def get(_id: str, projection: Optional[Union[str, List[str]]] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     """Get a workspace by its _id.
 
     Args:
         _id: The UUID of the workspace.
+        projection: Optional fields to return. Give "summary" to omit large
+            fields, "full" for all fields, or a list of fields to include.
 
     Returns:
         The workspace document from Elasticsearch.
     """
     client = es_client if es_client is not None else es("studio")
-    es_response = client.get(
-        index=INDEX_NAME,
-        id=_id,
-        source_excludes="_search",
-    )
+    es_response = utils.get_asset("workspaces", _id, projection, es_client=client)
     return es_response
 
-def create(doc: Dict[str, Any], _id: str = None, user: str = None, via: str = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+def create(doc: Dict[str, Any], _id: str = None, user: str = None, via: str = None, refresh: Optional[str] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     """Create a workspace.
 
     Args:
         doc: The workspace data to create.
         _id: Optional pregenerated UUID for idempotence.
         user: The username of the creator.
+        refresh: Refresh policy of the write: "true", "wait_for", or "false".
+            Defaults to ELASTICSEARCH_REFRESH.
 
     Returns:
         The response from the Elasticsearch index operation.
@@ -95,17 +105,19 @@ def create(doc: Dict[str, Any], _id: str = None, user: str = None, via: str = No
         index=INDEX_NAME,
         id=_id or utils.unique_id(),
         document=doc,
-        refresh=True,
+        refresh=utils.refresh_policy(refresh),
     )
     return es_response
 
-def update(_id: str, doc_partial: Dict[str, Any], user: str = None, via: str = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+def update(_id: str, doc_partial: Dict[str, Any], user: str = None, via: str = None, refresh: Optional[str] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     """Update a workspace by its _id.
 
     Args:
         _id: The UUID of the workspace.
         doc_partial: The partial workspace data to update.
         user: The username of the updater.
+        refresh: Refresh policy of the write: "true", "wait_for", or "false".
+            Defaults to ELASTICSEARCH_REFRESH.
 
     Returns:
         The response from the Elasticsearch update operation.
@@ -123,11 +135,11 @@ def update(_id: str, doc_partial: Dict[str, Any], user: str = None, via: str = N
         index=INDEX_NAME,
         id=_id,
         doc=doc_partial,
-        refresh=True
+        refresh=utils.refresh_policy(refresh)
     )
     return es_response
 
-def delete(_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
+def delete(_id: str, refresh: Optional[str] = None, es_client: Optional["Elasticsearch"] = None) -> Dict[str, Any]:
     """Delete a workspace and its associated assets.
 
     This deletes the workspace and all displays, scenarios, judgements, 
@@ -135,6 +147,8 @@ def delete(_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict[str, A
 
     Args:
         _id: The UUID of the workspace to delete.
+        refresh: Refresh policy of the write: "true", "wait_for", or "false".
+            Defaults to ELASTICSEARCH_REFRESH.
 
     Returns:
         The response from the Elasticsearch delete_by_query operation.
@@ -198,6 +212,14 @@ def delete(_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict[str, A
                                 { "term": { "workspace_id": _id }}
                             ]
                         }
+                    },
+                    {
+                        "bool": {
+                            "filter": [
+                                { "term": { "_index": "esrs-evaluation-results" }},
+                                { "term": { "workspace_id": _id }}
+                            ]
+                        }
                     }
                 ],
                 "minimum_should_match": 1
@@ -214,9 +236,10 @@ def delete(_id: str, es_client: Optional["Elasticsearch"] = None) -> Dict[str, A
             "esrs-strategies",
             "esrs-benchmarks",
             "esrs-evaluations",
+            "esrs-evaluation-results",
         ]),
         body=body,
-        refresh=True,
+        refresh=utils.refresh_policy(refresh, wait_for=False),
         conflicts="proceed",
     )
     return es_response
\ No newline at end of file
@@ -8,7 +8,7 @@ import base64
 import os
 import sys
 from io import BytesIO
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 # Third-party packages
 import requests
@@ -48,9 +48,11 @@ def conversations_search(
         size: Optional[int] = 10,
         page: Optional[int] = 1,
         aggs: Optional[bool] = False,
+        cursor: Optional[str] = None,
+        projection: Optional[Union[str, List[str]]] = "summary",
     ) -> Dict[str, Any]:
     user, es_client = mcp_auth.get_mcp_auth_from_context(ctx)
-    return dict(api.conversations.search(text, filters, sort, size, page, aggs, user=user, es_client=es_client))
+    return dict(api.conversations.search(text, filters, sort, size, page, aggs, cursor, projection, user=user, es_client=es_client))
 
 @mcp.tool(description=api.conversations.get.__doc__)
 def conversations_get(ctx: Context, _id: str) -> Dict[str, Any]:
@@ -77,6 +79,14 @@ def conversations_delete(ctx: Context, _id: str) -> Dict[str, Any]:
     return dict(api.conversations.delete(_id, user=user, es_client=es_client))
 
 
+####  API: Tool Results  #######################################################
+
+@mcp.tool(description=api.tool_results.get.__doc__)
+def tool_results_get(ctx: Context, _id: str, offset: int = 0, length: int = api.tool_results.DEFAULT_LENGTH) -> Dict[str, Any]:
+    user, es_client = mcp_auth.get_mcp_auth_from_context(ctx)
+    return dict(api.tool_results.get(_id, offset, length, user=user, es_client=es_client))
+
+
 ####  API: Workspaces  #########################################################
 
 @mcp.tool(description=api.workspaces.search.__doc__)
@@ -88,14 +98,16 @@ def workspaces_search(
         size: Optional[int] = 10,
         page: Optional[int] = 1,
         aggs: Optional[bool] = False,
+        cursor: Optional[str] = None,
+        projection: Optional[Union[str, List[str]]] = "summary",
     ) -> Dict[str, Any]:
     user, es_client = mcp_auth.get_mcp_auth_from_context(ctx)
-    return dict(api.workspaces.search(text, filters, sort, size, page, aggs, es_client=es_client))
+    return dict(api.workspaces.search(text, filters, sort, size, page, aggs, cursor, projection, es_client=es_client))
 
 @mcp.tool(description=api.workspaces.get.__doc__)
-def workspaces_get(ctx: Context, _id: str) -> Dict[str, Any]:
+def workspaces_get(ctx: Context, _id: str, projection: Optional[Union[str, List[str]]] = None) -> Dict[str, Any]:
     user, es_client = mcp_auth.get_mcp_auth_from_context(ctx)
-    return dict(api.workspaces.get(_id, es_client=es_client))
+    return dict(api.workspaces.get(_id, projection, es_client=es_client))
 
 @mcp.tool(description=api.workspaces.create.__doc__ + f"""\n
 JSON schema for doc:\n\n{WorkspaceCreate.model_input_json_schema()}
@@ -129,14 +141,16 @@ def displays_search(
         size: Optional[int] = 10,
         page: Optional[int] = 1,
         aggs: Optional[bool] = False,
+        cursor: Optional[str] = None,
+        projection: Optional[Union[str, List[str]]] = "summary",
     ) -> Dict[str, Any]:
     user, es_client = mcp_auth.get_mcp_auth_from_context(ctx)
-    return dict(api.displays.search(workspace_id, text, filters, sort, size, page, aggs, es_client=es_client))
+    return dict(api.displays.search(workspace_id, text, filters, sort, size, page, aggs, cursor, projection, es_client=es_client))
 
 @mcp.tool(description=api.displays.get.__doc__)
-def displays_get(ctx: Context, _id: str) -> Dict[str, Any]:
+def displays_get(ctx: Context, _id: str, projection: Optional[Union[str, List[str]]] = None) -> Dict[str, Any]:
     user, es_client = mcp_auth.get_mcp_auth_from_context(ctx)
-    return dict(api.displays.get(_id, es_client=es_client))
+    return dict(api.displays.get(_id, projection, es_client=es_client))
 
 @mcp.tool(description=api.displays.create.__doc__ + f"""\n
 JSON schema for doc:\n\n{DisplayCreate.model_input_json_schema()}
@@ -170,9 +184,11 @@ def scenarios_search(
         size: Optional[int] = 10,
         page: Optional[int] = 1,
         aggs: Optional[bool] = False,
+        cursor: Optional[str] = None,
+        projection: Optional[Union[str, List[str]]] = "summary",
     ) -> Dict[str, Any]:
     user, es_client = mcp_auth.get_mcp_auth_from_context(ctx)
-    return dict(api.scenarios.search(workspace_id, text, filters, sort, size, page, aggs, es_client=es_client))
+    return dict(api.scenarios.search(workspace_id, text, filters, sort, size, page, aggs, cursor, projection, es_client=es_client))
 
 @mcp.tool(description=api.scenarios.tags.__doc__)
 def scenarios_tags(ctx: Context, workspace_id: str) -> Dict[str, Any]:
@@ -180,9 +196,9 @@ def scenarios_tags(ctx: Context, workspace_id: str) -> Dict[str, Any]:
     return dict(api.scenarios.tags(workspace_id, es_client=es_client))
 
 @mcp.tool(description=api.scenarios.get.__doc__)
-def scenarios_get(ctx: Context, _id: str) -> Dict[str, Any]:
+def scenarios_get(ctx: Context, _id: str, projection: Optional[Union[str, List[str]]] = None) -> Dict[str, Any]:
     user, es_client = mcp_auth.get_mcp_auth_from_context(ctx)
-    return dict(api.scenarios.get(_id, es_client=es_client))
+    return dict(api.scenarios.get(_id, projection, es_client=es_client))
 
 @mcp.tool(description=api.scenarios.create.__doc__ + f"""\n
 JSON schema for doc:\n\n{ScenarioCreate.model_input_json_schema()}
@@ -203,6 +219,13 @@ def scenarios_delete(ctx: Context, _id: str) -> Dict[str, Any]:
     user, es_client = mcp_auth.get_mcp_auth_from_context(ctx)
     return dict(api.scenarios.delete(_id, es_client=es_client))
 
+@mcp.tool(description=api.scenarios.bulk.__doc__ + f"""\n
+JSON schema for the doc of "create" operations:\n\n{ScenarioCreate.model_input_json_schema()}
+""")
+def scenarios_bulk(ctx: Context, workspace_id: str, operations: List[Dict[str, Any]]) -> Dict[str, Any]:
+    user, es_client = mcp_auth.get_mcp_auth_from_context(ctx)
+    return api.scenarios.bulk(workspace_id, operations, user=user, via="mcp", es_client=es_client)
+
 
 ####  API: Judgements  #########################################################
 
@@ -231,6 +254,11 @@ def judgements_unset(ctx: Context, _id: str) -> Dict[str, Any]:
     user, es_client = mcp_auth.get_mcp_auth_from_context(ctx)
     return dict(api.judgements.unset(_id, es_client=es_client))
 
+@mcp.tool(description=api.judgements.bulk.__doc__)
+def judgements_bulk(ctx: Context, workspace_id: str, operations: List[Dict[str, Any]]) -> Dict[str, Any]:
+    user, es_client = mcp_auth.get_mcp_auth_from_context(ctx)
+    return api.judgements.bulk(workspace_id, operations, user=user, via="mcp", es_client=es_client)
+
 
 ####  API: Strategies  #########################################################
 
@@ -244,9 +272,11 @@ def strategies_search(
         size: Optional[int] = 10,
         page: Optional[int] = 1,
         aggs: Optional[bool] = False,
+        cursor: Optional[str] = None,
+        projection: Optional[Union[str, List[str]]] = "summary",
     ) -> Dict[str, Any]:
     user, es_client = mcp_auth.get_mcp_auth_from_context(ctx)
-    return dict(api.strategies.search(workspace_id, text, filters, sort, size, page, aggs, es_client=es_client))
+    return dict(api.strategies.search(workspace_id, text, filters, sort, size, page, aggs, cursor, projection, es_client=es_client))
 
 @mcp.tool(description=api.strategies.tags.__doc__)
 def strategies_tags(ctx: Context, workspace_id: str) -> Dict[str, Any]:
@@ -254,9 +284,9 @@ def strategies_tags(ctx: Context, workspace_id: str) -> Dict[str, Any]:
     return dict(api.strategies.tags(workspace_id, es_client=es_client))
 
 @mcp.tool(description=api.strategies.get.__doc__)
-def strategies_get(ctx: Context, _id: str) -> Dict[str, Any]:
+def strategies_get(ctx: Context, _id: str, projection: Optional[Union[str, List[str]]] = None) -> Dict[str, Any]:
     user, es_client = mcp_auth.get_mcp_auth_from_context(ctx)
-    return dict(api.strategies.get(_id, es_client=es_client))
+    return dict(api.strategies.get(_id, projection, es_client=es_client))
 
 @mcp.tool(description=api.strategies.create.__doc__ + f"""\n
 JSON schema for doc:\n\n{StrategyCreate.model_input_json_schema()}
@@ -277,6 +307,13 @@ def strategies_delete(ctx: Context, _id: str) -> Dict[str, Any]:
     user, es_client = mcp_auth.get_mcp_auth_from_context(ctx)
     return dict(api.strategies.delete(_id, es_client=es_client))
 
+@mcp.tool(description=api.strategies.bulk.__doc__ + f"""\n
+JSON schema for the doc of "create" operations:\n\n{StrategyCreate.model_input_json_schema()}
+""")
+def strategies_bulk(ctx: Context, workspace_id: str, operations: List[Dict[str, Any]]) -> Dict[str, Any]:
+    user, es_client = mcp_auth.get_mcp_auth_from_context(ctx)
+    return api.strategies.bulk(workspace_id, operations, user=user, via="mcp", es_client=es_client)
+
 
 ####  API: Benchmarks  #########################################################
 
@@ -290,9 +327,11 @@ def benchmarks_search(
         size: Optional[int] = 10,
         page: Optional[int] = 1,
         aggs: Optional[bool] = False,
+        cursor: Optional[str] = None,
+        projection: Optional[Union[str, List[str]]] = "summary",
     ) -> Dict[str, Any]:
     user, es_client = mcp_auth.get_mcp_auth_from_context(ctx)
-    return dict(api.benchmarks.search(workspace_id, text, filters, sort, size, page, aggs, es_client=es_client))
+    return dict(api.benchmarks.search(workspace_id, text, filters, sort, size, page, aggs, cursor, projection, es_client=es_client))
 
 @mcp.tool(description=api.benchmarks.tags.__doc__)
 def benchmarks_tags(ctx: Context, workspace_id: str) -> Dict[str, Any]:
@@ -305,9 +344,9 @@ def benchmarks_make_candidate_pool(ctx: Context, workspace_id: str, task: Dict[s
     return dict(api.benchmarks.make_candidate_pool(workspace_id, task, es_client=es_client))
 
 @mcp.tool(description=api.benchmarks.get.__doc__)
-def benchmarks_get(ctx: Context, _id: str) -> Dict[str, Any]:
+def benchmarks_get(ctx: Context, _id: str, projection: Optional[Union[str, List[str]]] = None) -> Dict[str, Any]:
     user, es_client = mcp_auth.get_mcp_auth_from_context(ctx)
-    return dict(api.benchmarks.get(_id, es_client=es_client))
+    return dict(api.benchmarks.get(_id, projection, es_client=es_client))
 
 @mcp.tool(description=api.benchmarks.create.__doc__ + f"""\n
 JSON schema for doc:\n\n{BenchmarkCreate.model_input_json_schema()}
@@ -342,14 +381,28 @@ def evaluations_search(
         size: Optional[int] = 10,
         page: Optional[int] = 1,
         aggs: Optional[bool] = False,
+        cursor: Optional[str] = None,
+        projection: Optional[Union[str, List[str]]] = "summary",
     ) -> Dict[str, Any]:
     user, es_client = mcp_auth.get_mcp_auth_from_context(ctx)
-    return dict(api.evaluations.search(workspace_id, benchmark_id, text, filters, sort, size, page, aggs, es_client=es_client))
+    return dict(api.evaluations.search(workspace_id, benchmark_id, text, filters, sort, size, page, aggs, cursor, projection, es_client=es_client))
 
 @mcp.tool(description=api.evaluations.get.__doc__)
-def evaluations_get(ctx: Context, _id: str) -> Dict[str, Any]:
+def evaluations_get(ctx: Context, _id: str, projection: Optional[Union[str, List[str]]] = None) -> Dict[str, Any]:
+    user, es_client = mcp_auth.get_mcp_auth_from_context(ctx)
+    return dict(api.evaluations.get(_id, projection, es_client=es_client))
+
+@mcp.tool(description=api.evaluations.results.__doc__)
+def evaluations_results(
+        ctx: Context,
+        _id: str,
+        strategy_id: Optional[str] = None,
+        scenario_id: Optional[str] = None,
+        size: Optional[int] = 10,
+        page: Optional[int] = 1,
+    ) -> Dict[str, Any]:
     user, es_client = mcp_auth.get_mcp_auth_from_context(ctx)
-    return dict(api.evaluations.get(_id, es_client=es_client))
+    return dict(api.evaluations.results(_id, strategy_id, scenario_id, size, page, es_client=es_client))
 
 @mcp.tool(description=api.evaluations.create.__doc__ + f"""\n
 JSON schema for doc:\n\n{EvaluationCreate.model_input_json_schema()}
@@ -12,6 +12,7 @@ from functools import wraps
 import jwt
 from dotenv import load_dotenv
 from flask import Flask, current_app, g, jsonify, make_response, request, Response, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from werkzeug.exceptions import BadRequest, Forbidden
 
@@ -21,6 +22,7 @@ from elasticsearch.exceptions import ApiError, AuthenticationException
 # App packages
 from . import api
 from . import auth
+from . import utils
 from .client import _validate_endpoint_configuration, es, es_from_credentials
 from .models import *
 from .tls import get_tls_config
@@ -37,7 +39,32 @@ AUTH_COOKIE_NAME = "relevance_studio_session"
 
 DEFAULT_STATIC_PATH = os.path.abspath(os.path.join(__file__, "..", "..", "..", "dist"))
 
+class JSONProvider(DefaultJSONProvider):
+    """
+    Serializes compact responses with the JSON backend of utils.dumps(), and
+    falls back to the default provider for indented output (debug mode) or
+    objects that the backend can't serialize.
+    """
+
+    def dumps(self, obj, **kwargs):
+        if "indent" not in kwargs and "cls" not in kwargs:
+            try:
+                return utils.dumps(
+                    obj,
+                    default=kwargs.get("default", self.default),
+                    sort_keys=kwargs.get("sort_keys", self.sort_keys),
+                )
+            except TypeError:
+                pass
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return utils.loads(s)
+
 app = Flask(__name__, static_folder=os.environ.get("STATIC_PATH") or DEFAULT_STATIC_PATH)
+app.json = JSONProvider(app)
 app.config["SECRET_KEY"] = os.getenv("AUTH_JWT_SECRET", "dev-secret")
 CORS(app, supports_credentials=True)
 
@@ -92,6 +119,10 @@ def handle_response(func):
     If so, return the response and HTTP status code from Elasticsearch.
     Otherwise return the response as JSON for dicts and lists, or as-is for
     everything else.
+
+    Responses to GET requests for a single document get an ETag from its
+    _index, _seq_no, _primary_term, and projection, and a 304 when it matches
+    If-None-Match.
     """
     @wraps(func)
     def wrapper(*args, **kwargs):
@@ -106,8 +137,15 @@ def handle_response(func):
             
             # Return Elasticsearch response
             if hasattr(response, "body") and hasattr(response, "meta") and hasattr(response.meta, "status"):
+                etag = utils.make_etag(response.body, _request_projection()) if request.method == "GET" else None
+                if etag:
+                    return _etag_response(etag, jsonify(response.body), response.meta.status)
                 return jsonify(response.body), response.meta.status
             
+            # Return prepared responses (e.g. 304 Not Modified) as-is
+            if isinstance(response, Response) and status is None:
+                return response
+            
             # Otherwise return original response as JSON if it's a dict or list
             if isinstance(response, dict) or isinstance(response, list):
                 return jsonify(response), status or 200
@@ -138,6 +176,18 @@ def handle_response(func):
             return jsonify({"error": "Unexpected error", "message": str(e)}), 500
     return wrapper
 
+def _etag_response(etag, response=None, status=200):
+    """
+    Return a response with the given ETag, which clients must revalidate
+    before reusing. Returns 304 Not Modified when the request's If-None-Match
+    matches the ETag.
+    """
+    response = response if response is not None else current_app.response_class()
+    response.status_code = status
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
 def make_api_route(router):
     """
     Custom API route handler.
@@ -164,6 +214,46 @@ def _request_es_client():
     return getattr(g, "es_client", None)
 
 
+def _request_refresh():
+    """
+    Return the refresh policy given in the "refresh" query parameter of a
+    write request, if any. Otherwise writes use ELASTICSEARCH_REFRESH.
+    """
+    refresh = request.args.get("refresh")
+    if refresh and refresh.strip().lower() not in utils.REFRESH_POLICIES:
+        raise BadRequest(f"Invalid refresh policy: {refresh}. Valid policies: {', '.join(utils.REFRESH_POLICIES)}")
+    return refresh or None
+
+
+def _request_projection():
+    """
+    Return the projection given in the "projection" query parameter of a get
+    request, if any. The value is either the name of a projection (see
+    utils.PROJECTIONS) or a comma-separated list of fields to include.
+    """
+    projection = (request.args.get("projection") or "").strip()
+    if not projection:
+        return None
+    if projection in utils.PROJECTIONS:
+        return projection
+    return [ field.strip() for field in projection.split(",") if field.strip() ]
+
+
+def _request_not_modified(asset_type, _id):
+    """
+    Return a 304 Not Modified response if the request has an If-None-Match
+    header that matches the current ETag of the asset in the requested
+    projection. The ETag is checked with a get that omits the _source, so
+    unchanged assets aren't fetched in full.
+    """
+    if not request.if_none_match:
+        return None
+    etag = utils.get_asset_etag(asset_type, _id, projection=_request_projection(), es_client=_request_es_client())
+    if etag and request.if_none_match.contains(etag):
+        return _etag_response(etag, status=304)
+    return None
+
+
 def validate_workspace_id_match(body, workspace_id_from_url):
     """
     When updating documents, if a workspace_id is given in the request body,
@@ -290,6 +380,15 @@ def conversations_delete(_id):
     return api.conversations.delete(_id, user=_request_user(), es_client=_request_es_client())
 
 
+####  API: Tool Results  #######################################################
+
+@api_route("/api/tool-results/<string:_id>", methods=["GET"])
+def tool_results_get(_id):
+    offset = request.args.get("offset", 0, type=int)
+    length = request.args.get("length", api.tool_results.DEFAULT_LENGTH, type=int)
+    return api.tool_results.get(_id, offset, length, user=_request_user(), es_client=_request_es_client())
+
+
 ####  API: Workspaces  #########################################################
 
 @api_route("/api/workspaces/_search", methods=["POST"])
@@ -299,22 +398,22 @@ def workspaces_search():
 
 @api_route("/api/workspaces/<string:_id>", methods=["GET"])
 def workspaces_get(_id):
-    return api.workspaces.get(_id, es_client=_request_es_client())
+    return _request_not_modified("workspaces", _id) or api.workspaces.get(_id, projection=_request_projection(), es_client=_request_es_client())
 
 @api_route("/api/workspaces", methods=["POST"])
 def workspaces_create():
     doc = request.get_json()
     _id = doc.pop("_id", None) # accept an optional _id if given
-    return api.workspaces.create(doc, _id, user=_request_user(), via="server", es_client=_request_es_client())
+    return api.workspaces.create(doc, _id, user=_request_user(), via="server", refresh=_request_refresh(), es_client=_request_es_client())
 
 @api_route("/api/workspaces/<string:_id>", methods=["PUT"])
 def workspaces_update(_id):
     doc_partial = request.get_json()
-    return api.workspaces.update(_id, doc_partial, user=_request_user(), via="server", es_client=_request_es_client())
+    return api.workspaces.update(_id, doc_partial, user=_request_user(), via="server", refresh=_request_refresh(), es_client=_request_es_client())
 
 @api_route("/api/workspaces/<string:_id>", methods=["DELETE"])
 def workspaces_delete(_id):
-    return api.workspaces.delete(_id, es_client=_request_es_client())
+    return api.workspaces.delete(_id, refresh=_request_refresh(), es_client=_request_es_client())
 
 
 ####  API: Displays  ###########################################################
@@ -326,7 +425,7 @@ def displays_search(workspace_id):
 
 @api_route("/api/workspaces/<string:workspace_id>/displays/<string:_id>", methods=["GET"])
 def displays_get(workspace_id, _id):
-    return api.displays.get(_id, es_client=_request_es_client())
+    return _request_not_modified("displays", _id) or api.displays.get(_id, projection=_request_projection(), es_client=_request_es_client())
 
 @api_route("/api/workspaces/<string:workspace_id>/displays", methods=["POST"])
 def displays_create(workspace_id):
@@ -334,18 +433,18 @@ def displays_create(workspace_id):
     validate_workspace_id_match(doc, workspace_id)
     doc["workspace_id"] = workspace_id # ensure workspace_id from path is in doc
     _id = doc.pop("_id", None) # accept an optional _id if given
-    return api.displays.create(doc, _id, user=_request_user(), via="server", es_client=_request_es_client())
+    return api.displays.create(doc, _id, user=_request_user(), via="server", refresh=_request_refresh(), es_client=_request_es_client())
 
 @api_route("/api/workspaces/<string:workspace_id>/displays/<string:_id>", methods=["PUT"])
 def displays_update(workspace_id, _id):
     doc_partial = request.get_json()
     validate_workspace_id_match(doc_partial, workspace_id)
     doc_partial["workspace_id"] = workspace_id # ensure workspace_id from path is in doc_partial
-    return api.displays.update(_id, doc_partial, user=_request_user(), via="server", es_client=_request_es_client())
+    return api.displays.update(_id, doc_partial, user=_request_user(), via="server", refresh=_request_refresh(), es_client=_request_es_client())
 
 @api_route("/api/workspaces/<string:workspace_id>/displays/<string:_id>", methods=["DELETE"])
 def displays_delete(workspace_id, _id):
-    return api.displays.delete(_id, es_client=_request_es_client())
+    return api.displays.delete(_id, refresh=_request_refresh(), es_client=_request_es_client())
 
 
 ####  API: Scenarios  ##########################################################
@@ -361,25 +460,30 @@ def scenarios_tags(workspace_id):
 
 @api_route("/api/workspaces/<string:workspace_id>/scenarios/<string:_id>", methods=["GET"])
 def scenarios_get(workspace_id, _id):
-    return api.scenarios.get(_id, es_client=_request_es_client())
+    return _request_not_modified("scenarios", _id) or api.scenarios.get(_id, projection=_request_projection(), es_client=_request_es_client())
 
 @api_route("/api/workspaces/<string:workspace_id>/scenarios", methods=["POST"])
 def scenarios_create(workspace_id):
     doc = request.get_json()
     validate_workspace_id_match(doc, workspace_id)
     doc["workspace_id"] = workspace_id # ensure workspace_id from path is in doc
-    return api.scenarios.create(doc, user=_request_user(), via="server", es_client=_request_es_client())
+    return api.scenarios.create(doc, user=_request_user(), via="server", refresh=_request_refresh(), es_client=_request_es_client())
 
 @api_route("/api/workspaces/<string:workspace_id>/scenarios/<string:_id>", methods=["PUT"])
 def scenarios_update(workspace_id, _id):
     doc_partial = request.get_json()
     validate_workspace_id_match(doc_partial, workspace_id)
     doc_partial["workspace_id"] = workspace_id # ensure workspace_id from path is in doc_partial
-    return api.scenarios.update(_id, doc_partial, user=_request_user(), via="server", es_client=_request_es_client())
+    return api.scenarios.update(_id, doc_partial, user=_request_user(), via="server", refresh=_request_refresh(), es_client=_request_es_client())
 
 @api_route("/api/workspaces/<string:workspace_id>/scenarios/<string:_id>", methods=["DELETE"])
 def scenarios_delete(workspace_id, _id):
-    return api.scenarios.delete(_id, es_client=_request_es_client())
+    return api.scenarios.delete(_id, refresh=_request_refresh(), es_client=_request_es_client())
+
+@api_route("/api/workspaces/<string:workspace_id>/scenarios/_bulk", methods=["POST"])
+def scenarios_bulk(workspace_id):
+    body = request.get_json() or {}
+    return api.scenarios.bulk(workspace_id, body.get("operations") or [], user=_request_user(), via="server", refresh=_request_refresh(), es_client=_request_es_client())
 
 
 ####  API: Judgements  #########################################################
@@ -403,12 +507,18 @@ def judgements_set(workspace_id):
         rating=doc["rating"],
         user=_request_user(),
         via="server",
+        refresh=_request_refresh(),
         es_client=_request_es_client(),
     )
 
 @api_route("/api/workspaces/<string:workspace_id>/judgements/<string:_id>", methods=["DELETE"])
 def judgements_unset(workspace_id, _id):
-    return api.judgements.unset(_id, es_client=_request_es_client())
+    return api.judgements.unset(_id, refresh=_request_refresh(), es_client=_request_es_client())
+
+@api_route("/api/workspaces/<string:workspace_id>/judgements/_bulk", methods=["POST"])
+def judgements_bulk(workspace_id):
+    body = request.get_json() or {}
+    return api.judgements.bulk(workspace_id, body.get("operations") or [], user=_request_user(), via="server", refresh=_request_refresh(), es_client=_request_es_client())
 
 
 ####  API: Strategies  #########################################################
@@ -424,7 +534,7 @@ def strategies_tags(workspace_id):
 
 @api_route("/api/workspaces/<string:workspace_id>/strategies/<string:_id>", methods=["GET"])
 def strategies_get(workspace_id, _id):
-    return api.strategies.get(_id, es_client=_request_es_client())
+    return _request_not_modified("strategies", _id) or api.strategies.get(_id, projection=_request_projection(), es_client=_request_es_client())
 
 @api_route("/api/workspaces/<string:workspace_id>/strategies", methods=["POST"])
 def strategies_create(workspace_id):
@@ -432,18 +542,23 @@ def strategies_create(workspace_id):
     validate_workspace_id_match(doc, workspace_id)
     doc["workspace_id"] = workspace_id # ensure workspace_id from path is in doc
     _id = doc.pop("_id", None) # accept an optional _id if given
-    return api.strategies.create(doc, _id, user=_request_user(), via="server", es_client=_request_es_client())
+    return api.strategies.create(doc, _id, user=_request_user(), via="server", refresh=_request_refresh(), es_client=_request_es_client())
 
 @api_route("/api/workspaces/<string:workspace_id>/strategies/<string:_id>", methods=["PUT"])
 def strategies_update(workspace_id, _id):
     doc_partial = request.get_json()
     validate_workspace_id_match(doc_partial, workspace_id)
     doc_partial["workspace_id"] = workspace_id # ensure workspace_id from path is in doc
-    return api.strategies.update(_id, doc_partial, user=_request_user(), via="server", es_client=_request_es_client())
+    return api.strategies.update(_id, doc_partial, user=_request_user(), via="server", refresh=_request_refresh(), es_client=_request_es_client())
 
 @api_route("/api/workspaces/<string:workspace_id>/strategies/<string:_id>", methods=["DELETE"])
 def strategies_delete(workspace_id, _id):
-    return api.strategies.delete(_id, es_client=_request_es_client())
+    return api.strategies.delete(_id, refresh=_request_refresh(), es_client=_request_es_client())
+
+@api_route("/api/workspaces/<string:workspace_id>/strategies/_bulk", methods=["POST"])
+def strategies_bulk(workspace_id):
+    body = request.get_json() or {}
+    return api.strategies.bulk(workspace_id, body.get("operations") or [], user=_request_user(), via="server", refresh=_request_refresh(), es_client=_request_es_client())
 
 
 ####  API: Benchmarks  #########################################################
@@ -464,7 +579,7 @@ def benchmarks_make_candidate_pool(workspace_id):
 
 @api_route("/api/workspaces/<string:workspace_id>/benchmarks/<string:_id>", methods=["GET"])
 def benchmarks_get(workspace_id, _id):
-    return api.benchmarks.get(_id, es_client=_request_es_client())
+    return _request_not_modified("benchmarks", _id) or api.benchmarks.get(_id, projection=_request_projection(), es_client=_request_es_client())
 
 @api_route("/api/workspaces/<string:workspace_id>/benchmarks", methods=["POST"])
 def benchmarks_create(workspace_id):
@@ -472,18 +587,18 @@ def benchmarks_create(workspace_id):
     validate_workspace_id_match(doc, workspace_id)
     doc["workspace_id"] = workspace_id # ensure workspace_id from path is in doc
     _id = doc.pop("_id", None) # accept an optional _id if given
-    return api.benchmarks.create(doc, _id, user=_request_user(), via="server", es_client=_request_es_client())
+    return api.benchmarks.create(doc, _id, user=_request_user(), via="server", refresh=_request_refresh(), es_client=_request_es_client())
 
 @api_route("/api/workspaces/<string:workspace_id>/benchmarks/<string:_id>", methods=["PUT"])
 def benchmarks_update(workspace_id, _id):
     doc_partial = request.get_json()
     validate_workspace_id_match(doc_partial, workspace_id)
     doc_partial["workspace_id"] = workspace_id # ensure workspace_id from path is in doc_partial
-    return api.benchmarks.update(_id, doc_partial, user=_request_user(), via="server", es_client=_request_es_client())
+    return api.benchmarks.update(_id, doc_partial, user=_request_user(), via="server", refresh=_request_refresh(), es_client=_request_es_client())
 
 @api_route("/api/workspaces/<string:workspace_id>/benchmarks/<string:_id>", methods=["DELETE"])
 def benchmarks_delete(workspace_id, _id):
-    return api.benchmarks.delete(_id, es_client=_request_es_client())
+    return api.benchmarks.delete(_id, refresh=_request_refresh(), es_client=_request_es_client())
 
 
 ####  API: Evaluations  ########################################################
@@ -495,12 +610,20 @@ def evaluations_search(workspace_id, benchmark_id):
 
 @api_route("/api/workspaces/<string:workspace_id>/benchmarks/<string:benchmark_id>/evaluations/<string:_id>", methods=["GET"])
 def evaluations_get(workspace_id, benchmark_id, _id):
-    return api.evaluations.get(_id, es_client=_request_es_client())
+    return _request_not_modified("evaluations", _id) or api.evaluations.get(_id, projection=_request_projection(), es_client=_request_es_client())
+
+@api_route("/api/workspaces/<string:workspace_id>/benchmarks/<string:benchmark_id>/evaluations/<string:_id>/results", methods=["GET"])
+def evaluations_results(workspace_id, benchmark_id, _id):
+    strategy_id = request.args.get("strategy_id")
+    scenario_id = request.args.get("scenario_id")
+    size = request.args.get("size", 10, type=int)
+    page = request.args.get("page", 1, type=int)
+    return api.evaluations.results(_id, strategy_id, scenario_id, size, page, es_client=_request_es_client())
 
 @api_route("/api/workspaces/<string:workspace_id>/benchmarks/<string:benchmark_id>/evaluations", methods=["POST"])
 def evaluations_create(workspace_id, benchmark_id):
     task = request.get_json()
-    return api.evaluations.create(workspace_id, benchmark_id, task, user=_request_user(), via="server", es_client=_request_es_client())
+    return api.evaluations.create(workspace_id, benchmark_id, task, user=_request_user(), via="server", refresh=_request_refresh(), es_client=_request_es_client())
 
 @api_route("/api/workspaces/<string:workspace_id>/evaluations/_run", methods=["POST"])
 def evaluations_run(workspace_id):
@@ -513,7 +636,7 @@ def evaluations_run(workspace_id):
 
 @api_route("/api/workspaces/<string:workspace_id>/benchmarks/<string:benchmark_id>/evaluations/<string:_id>", methods=["DELETE"])
 def evaluations_delete(workspace_id, benchmark_id, _id):
-    return api.evaluations.delete(_id, es_client=_request_es_client())
+    return api.evaluations.delete(_id, refresh=_request_refresh(), es_client=_request_es_client())
 
 
 ####  API: Content  ############################################################
@@ -540,7 +663,8 @@ def setup_run():
 
 @api_route("/api/upgrade", methods=["POST"])
 def upgrade_run():
-    return api.setup.upgrade(via="server", es_client=_request_es_client())
+    reindex = (request.args.get("reindex") or "").strip().lower() == "true"
+    return api.setup.upgrade(via="server", reindex=reindex, es_client=_request_es_client())
 
 
 ####  Health checks  ###########################################################
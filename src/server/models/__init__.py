@@ -11,4 +11,5 @@ from .evaluations import EvaluationCreate, EvaluationSkip, EvaluationFail, Evalu
 from .judgements import JudgementCreate
 from .scenarios import ScenarioCreate, ScenarioUpdate
 from .strategies import StrategyCreate, StrategyUpdate
+from .tool_results import ToolResultCreate
 from .workspaces import WorkspaceCreate, WorkspaceUpdate
\ No newline at end of file
@@ -33,6 +33,10 @@ class ModelUsage(BaseModel):
     llm_calls: Optional[int] = None
     input_tokens: Optional[int] = None
     output_tokens: Optional[int] = None
+    history_tokens_before: Optional[int] = None
+    history_tokens_after: Optional[int] = None
+    tool_tokens_before: Optional[int] = None
+    tool_tokens_after: Optional[int] = None
 
 class RoundInput(BaseModel):
     model_config = { "extra": "forbid", "strict": True }
@@ -73,6 +73,11 @@ class ScenarioCreate(AssetCreate):
     def params(self) -> Optional[List[str]]:
         if isinstance(self.values, dict):
             return sorted(list(self.values.keys()))
+
+    @computed_field
+    @property
+    def params_count(self) -> int:
+        return len(self.params or [])
     
 class ScenarioUpdate(AssetUpdate):
     
@@ -62,6 +62,11 @@ class StrategyCreate(AssetCreate):
     @property
     def params(self) -> Optional[List[str]]:
         return utils.extract_params(self.template.source or "") if self.template else []
+
+    @computed_field
+    @property
+    def params_count(self) -> int:
+        return len(self.params or [])
     
 class StrategyUpdate(AssetUpdate):
     
@@ -106,4 +111,9 @@ class StrategyUpdate(AssetUpdate):
     @computed_field
     @property
     def params(self) -> Optional[List[str]]:
-        return utils.extract_params(self.template.source or "") if self.template and self.template.source else None
\ No newline at end of file
+        return utils.extract_params(self.template.source or "") if self.template and self.template.source else None
+
+    @computed_field
+    @property
+    def params_count(self) -> Optional[int]:
+        return len(self.params) if self.params is not None else None
\ No newline at end of file
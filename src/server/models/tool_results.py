@@ -0,0 +1,41 @@
+# Copyright Elasticsearch B.V. and/or licensed to Elasticsearch B.V. under one
+# or more contributor license agreements. Licensed under the Elastic License
+# 2.0; you may not use this file except in compliance with the Elastic License
+# 2.0.
+
+# Standard packages
+from typing import Optional
+
+# Third-party packages
+from pydantic import computed_field, field_validator
+
+# App packages
+from .asset import AssetCreate
+
+class ToolResultCreate(AssetCreate):
+
+    # Required inputs
+    tool_id: str
+    content: str
+
+    # Optional inputs
+    conversation_id: Optional[str] = None
+
+    @field_validator("tool_id")
+    @classmethod
+    def validate_tool_id(cls, value: str):
+        if not value.strip():
+            raise ValueError("tool_id must be a non-empty string")
+        return value
+
+    @field_validator("conversation_id")
+    @classmethod
+    def validate_conversation_id(cls, value: Optional[str]):
+        if value is not None and not value.strip():
+            raise ValueError("conversation_id must be a non-empty string")
+        return value
+
+    @computed_field
+    @property
+    def size(self) -> int:
+        return len(self.content)
@@ -4,16 +4,27 @@
 # 2.0.
 
 # Standard packages
+import base64
 import json
+import math
 import os
 import re
 import time
 import uuid
 from datetime import datetime, timezone
 from hashlib import blake2b
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union, TYPE_CHECKING
 
 # Third-party packages
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Elastic packages
+from elasticsearch import helpers
+
+# App packages
 from .client import es
 
 if TYPE_CHECKING:
@@ -22,6 +33,16 @@ if TYPE_CHECKING:
 # Pre-compiled regular expressions
 RE_PARAMS = re.compile(r"{{\s*([\w.-]+)\s*}}")
 
+# orjson formats a float differently from the json module only when its
+# output has an exponent (e.g. 1e16, 1e-7) or starts with 0.0000 (e.g. 0.00001
+# instead of 1e-05).
+RE_ORJSON_EXPONENT = re.compile(rb'e[-\d]')
+
+# Backend of serialize(), dumps(), and loads(): "orjson" (default, when it's
+# installed) or "json". serialize() gives the same output with either backend,
+# so fingerprints don't depend on it.
+JSON_BACKEND = os.getenv("JSON_BACKEND", "orjson").strip().lower()
+
 ASSET_TYPES = set([
     "conversations",
     "workspaces",
@@ -43,6 +64,52 @@ ASSET_TYPES_RELATIONAL_ID_NAMES = {
     "evaluations": "evaluation_id",
 }
 
+# Default refresh policy of writes to the studio deployment: "true" refreshes
+# the affected shards before responding, "wait_for" waits for the next
+# scheduled refresh, and "false" responds without waiting. Documents are
+# always readable right away by _id (realtime get), but only searchable after
+# a refresh. Each write API also accepts a refresh policy per call.
+REFRESH_POLICIES = ("true", "wait_for", "false")
+ELASTICSEARCH_REFRESH = os.getenv("ELASTICSEARCH_REFRESH", "true").strip().lower()
+
+# Number of actions sent per request by bulk_write()
+BULK_CHUNK_SIZE = 500
+
+# Index templates are loaded once, and the _search copy plan of each template
+# is compiled once, so that the write path doesn't read them from disk.
+PATH_INDEX_TEMPLATES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "elastic", "index_templates")
+_index_templates: Dict[str, Dict[str, Any]] = {}
+_search_copy_plans: Dict[str, Tuple[Tuple[str, ...], ...]] = {}
+
+# Cursor pagination
+CURSOR_START = "start"
+CURSOR_KEEP_ALIVE = "5m"
+
+# Responses of the search() and get() APIs of workspace assets are trimmed to
+# what their consumers use, which drops metadata such as _shards, _index,
+# _score, and _version. Gets keep _index, _seq_no, and _primary_term, which
+# identify the version of the document for ETags (see make_etag).
+FILTER_PATH_GET = "_index,_id,_seq_no,_primary_term,_source"
+FILTER_PATH_ETAG = "_index,_seq_no,_primary_term"
+FILTER_PATH_SEARCH = "took,hits.total,hits.hits._id,hits.hits._source,hits.hits.sort,aggregations,pit_id"
+
+# Named projections of the _source of workspace assets, by the fields that
+# each one excludes per asset type. Callers of the search() and get() APIs can
+# select a projection by name, or give a list of fields to include. "full" is
+# the default. "summary" is for list views, and omits the fields that make
+# assets large. "overview" omits only the fields that have their own paged
+# APIs, such as the results of evaluations (see evaluations.results()).
+PROJECTIONS = {
+    "full": {},
+    "overview": {
+        "evaluations": [ "results" ],
+    },
+    "summary": {
+        "conversations": [ "rounds" ],
+        "evaluations": [ "results", "runtime", "unrated_docs" ],
+    },
+}
+
 def unique_id(input=None):
     """
     Generate a unique ID, either randomly when input=is None or
@@ -62,13 +129,106 @@ def fingerprint(obj):
     """
     return blake2b((serialize(obj)).encode(), digest_size=16).hexdigest()
 
+def client_identity(client: "Elasticsearch") -> str:
+    """
+    Return a fingerprint of the credentials of a client, so that cached
+    values are only served to the identity that fetched them.
+    """
+    headers = getattr(client, "_headers", None) or {}
+    return fingerprint(headers.get("authorization") or "")
+
+def _use_orjson() -> bool:
+    return orjson is not None and JSON_BACKEND == "orjson"
+
+def _is_canonical_orjson(obj, data: bytes) -> bool:
+    """
+    Check whether the output of orjson equals that of the json module, which
+    escapes non-ASCII and DEL characters, formats some floats differently, and
+    writes NaN and Infinity as such instead of null.
+    """
+    if not data.isascii() or b"\x7f" in data:
+        return False
+    if b"null" in data and _has_non_finite_float(obj):
+        return False
+    for match in RE_ORJSON_EXPONENT.finditer(data):
+        if _is_in_number(data, match.start()):
+            return False
+    i = data.find(b"0.0000")
+    while i != -1:
+        if _is_in_number(data, i):
+            return False
+        i = data.find(b"0.0000", i + 1)
+    return True
+
+def _has_non_finite_float(obj) -> bool:
+    """
+    Check whether an object has NaN or Infinity in it, which orjson writes as
+    null.
+    """
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite_float(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite_float(value) for value in obj)
+    return False
+
+def _is_in_number(data: bytes, i: int) -> bool:
+    """
+    Check whether a position of serialized JSON is in a number rather than a
+    string, which is when the characters before it are part of a number that
+    starts a value.
+    """
+    while i > 0 and data[i - 1] in b"0123456789.-":
+        i -= 1
+    return i == 0 or data[i - 1] in b":,["
+
 def serialize(obj):
     """
     Serialize an object as JSON without whitespace and with sorted keys as a
     standard and deterministic form of serialization.
+    
+    The output is that of json.dumps(obj, separators=(',', ':'), sort_keys=True).
+    orjson serializes the object when it can give that exact output, which is
+    when the output is ASCII without DEL characters and has no floats that
+    orjson formats differently, including NaN and Infinity, which orjson writes
+    as null. Otherwise the json module serializes it.
     """
+    if _use_orjson():
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            data = None
+        if data is not None and _is_canonical_orjson(obj, data):
+            return data.decode()
     return json.dumps(obj, separators=(',', ':'), sort_keys=True)
 
+def dumps(obj, default: Optional[Callable[[Any], Any]] = None, sort_keys: bool = False) -> str:
+    """
+    Serialize an object as compact JSON for transport, such as HTTP responses.
+    Unlike serialize(), non-ASCII characters are not escaped, and the
+    formatting of floats depends on the JSON backend. Raises TypeError for
+    objects that can't be serialized.
+    
+    Dates and dataclasses are given to default(), like in the json module.
+    """
+    if _use_orjson():
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=default, option=option).decode()
+    return json.dumps(obj, default=default, separators=(',', ':'), sort_keys=sort_keys, ensure_ascii=False)
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Deserialize JSON with the JSON backend. Raises json.JSONDecodeError for
+    invalid JSON. orjson parses integers beyond 64 bits as floats, so use
+    json.loads() where those must be exact.
+    """
+    if _use_orjson():
+        return orjson.loads(data)
+    return json.loads(data)
+
 def timestamp(t: float = None):
     """
     Generate a @timestamp value, optional from a given time object.
@@ -76,52 +236,101 @@ def timestamp(t: float = None):
     t = t or time.time()
     return datetime.fromtimestamp(t, tz=timezone.utc).isoformat().replace("+00:00", "Z")
 
+def refresh_policy(refresh: Optional[Union[bool, str]] = None, wait_for: bool = True) -> Union[bool, str]:
+    """
+    Return the value of the "refresh" parameter of a write request, given a
+    refresh policy of "true", "wait_for", or "false". Uses ELASTICSEARCH_REFRESH
+    when no policy is given. Set wait_for=False for APIs that don't support
+    "wait_for" (e.g. delete_by_query), which then refresh instead.
+    """
+    policy = ELASTICSEARCH_REFRESH if refresh is None or refresh == "" else refresh
+    if not isinstance(policy, bool):
+        policy = str(policy).strip().lower()
+        if policy not in REFRESH_POLICIES:
+            raise ValueError(f"Invalid refresh policy: {refresh}. Valid policies: {', '.join(REFRESH_POLICIES)}")
+        policy = True if policy == "true" else False if policy == "false" else policy
+    if policy == "wait_for" and not wait_for:
+        return True
+    return policy
+
 def extract_params(obj: Dict[str, Any]):
     """
     Extract Mustache variable params from an object serialized as json.
     """
     return sorted(list(set(re.findall(RE_PARAMS, json.dumps(obj)))))
 
-def copy_fields_to_search(template_name: str, doc: Dict[str, Any]) -> Dict[str, Any]:
+def load_index_template(template_name: str) -> Dict[str, Any]:
     """
-    Copy values from the doc into the _search field, based on the _search fields defined
-    in the specified index template. Automatically infers which fields need stringification.
+    Return the parsed index template from the elastic/index_templates
+    directory. Each template is read from disk once and then served from an
+    in-memory registry. Treat the returned dict as read-only.
     """
-    field_types = get_search_field_types_from_mapping(template_name)
+    template = _index_templates.get(template_name)
+    if template is None:
+        path_index_template = os.path.join(PATH_INDEX_TEMPLATES, f"{template_name}.json")
+        with open(path_index_template, 'r') as f:
+            template = json.load(f)
+        _index_templates[template_name] = template
+    return template
 
-    def is_empty(val: Any) -> bool:
-        return val is None or val == "" or val == {} or val == []
+def _search_properties(template_name: str) -> Dict[str, Any]:
+    return (
+        load_index_template(template_name)
+        .get("template", {})
+        .get("mappings", {})
+        .get("properties", {})
+        .get("_search", {})
+        .get("properties", {})
+    )
 
-    def serialize_leaf(val: Any) -> str:
-        if is_empty(val):
-            return ""
-        if isinstance(val, str):
-            return val
-        return json.dumps(val)
+def _serialize_search_value(val: Any) -> str:
+    if val is None or val == "" or val == {} or val == []:
+        return ""
+    if isinstance(val, str):
+        return val
+    return json.dumps(val)
 
-    def serialize_array(vals: List[Any]) -> List[str]:
-        return [serialize_leaf(v) for v in vals]
+def get_search_copy_plan(template_name: str) -> Tuple[Tuple[str, ...], ...]:
+    """
+    Return the compiled copy plan of the _search fields of an index template:
+    the path of every leaf field under "_search", as a flat tuple of key
+    tuples. Plans are compiled once per template and cached.
+    """
+    plan = _search_copy_plans.get(template_name)
+    if plan is None:
+        def walk(types: Dict[str, Any], path: Tuple[str, ...]):
+            for k, v in types.items():
+                if isinstance(v, dict):
+                    yield from walk(v, path + (k,))
+                else:
+                    yield path + (k,)
+        plan = tuple(walk(get_search_field_types_from_mapping(template_name), ()))
+        _search_copy_plans[template_name] = plan
+    return plan
 
-    def set_nested_value(obj: Dict[str, Any], path: List[str], value: Any):
-        for key in path[:-1]:
-            obj = obj.setdefault(key, {})
-        obj[path[-1]] = value
+def copy_fields_to_search(template_name: str, doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy values from the doc into the _search field, based on the _search fields defined
+    in the specified index template. Automatically infers which fields need stringification.
+    """
+    search = doc.setdefault("_search", {})
+    for path in get_search_copy_plan(template_name):
 
-    def copy_recursively(value: Any, types: Any, path: List[str]):
-        if isinstance(types, str):  # leaf field like "text"
+        # Follow the path through the doc, skipping the field when any part
+        # of it is absent or isn't an object.
+        value = doc
+        for key in path:
+            if not isinstance(value, dict) or key not in value:
+                break
+            value = value[key]
+        else:
+            target = search
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
             if isinstance(value, list):
-                set_nested_value(doc["_search"], path, serialize_array(value))
+                target[path[-1]] = [_serialize_search_value(v) for v in value]
             else:
-                set_nested_value(doc["_search"], path, serialize_leaf(value))
-        elif isinstance(types, dict) and isinstance(value, dict):
-            for k, v in value.items():
-                if k in types:
-                    copy_recursively(v, types[k], path + [k])
-
-    doc.setdefault("_search", {})
-    for field, type_info in field_types.items():
-        if field in doc:
-            copy_recursively(doc[field], type_info, [field])
+                target[path[-1]] = _serialize_search_value(value)
     return doc
 
 def get_search_fields_from_mapping(template_name: str) -> List[str]:
@@ -129,21 +338,7 @@ def get_search_fields_from_mapping(template_name: str) -> List[str]:
     Return a list of top-level field names defined under the "_search" section
     of an index template. These are the names passed to copy_fields_to_search().
     """
-    path_base = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)), "elastic", "index_templates"
-    )
-    path_index_template = os.path.join(path_base, f"{template_name}.json")
-    with open(path_index_template, 'r') as f:
-        data = json.load(f)
-    props = (
-        data
-        .get("template", {})
-        .get("mappings", {})
-        .get("properties", {})
-        .get("_search", {})
-        .get("properties", {})
-    )
-    return sorted(props.keys())
+    return sorted(_search_properties(template_name).keys())
 
 def get_search_field_types_from_mapping(template_name: str) -> Dict[str, Any]:
     """
@@ -151,20 +346,6 @@ def get_search_field_types_from_mapping(template_name: str) -> Dict[str, Any]:
     For example:
       { "template": { "source": "text" }, "tags": "text" }
     """
-    path_base = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)), "elastic", "index_templates"
-    )
-    path_index_template = os.path.join(path_base, f"{template_name}.json")
-    with open(path_index_template, 'r') as f:
-        data = json.load(f)
-    props = (
-        data
-        .get("template", {})
-        .get("mappings", {})
-        .get("properties", {})
-        .get("_search", {})
-        .get("properties", {})
-    )
     def walk(p):
         result = {}
         for k, v in p.items():
@@ -175,7 +356,7 @@ def get_search_field_types_from_mapping(template_name: str) -> Dict[str, Any]:
             else:
                 result[k] = "object"
         return result
-    return walk(props)
+    return walk(_search_properties(template_name))
     
 def remove_empty_values(obj, keep_fields=None, path=""):
     """
@@ -257,11 +438,22 @@ def search_assets(
         size: int = 10,
         page: int = 1,
         counts: List[str] = [],
+        cursor: Optional[str] = None,
+        projection: Optional[Union[str, List[str]]] = None,
         es_client: Optional["Elasticsearch"] = None,
     ) -> Dict[str, Any]:
     """
     Standardizes basic searches and aggs for the search() API of workspace assets.
     
+    The _source of each hit follows the given projection (see PROJECTIONS).
+    
+    Pagination is by page, unless a cursor is given. Give a cursor of "start"
+    to get the first page, and then give the "next_cursor" of each response to
+    get the next page, repeating the same search inputs. Cursor pagination
+    searches a point in time sorted with a tiebreaker and continues with
+    search_after, so each page costs the same no matter how deep it is. The
+    "next_cursor" is null after the last page.
+    
     Structure of the sort input (single field allowed):
     
     {
@@ -277,6 +469,12 @@ def search_assets(
         RELATIONAL_ASSET_TYPE,
         ...
     ]
+
+    The counts are a second search that follows the search, because they
+    count the related assets of only the _ids of the hits. They aren't stored
+    on the assets at write time, which would have every create, set, bulk,
+    and cascading delete of a related asset update its parent assets, and
+    would let the counts drift from the related assets.
     """
     if asset_type not in ASSET_TYPES:
         raise Exception(f"\"{asset_type}\" is not a valid workspace asset type.")
@@ -299,12 +497,13 @@ def search_assets(
         body.setdefault("query", {}).setdefault("bool", {}).setdefault("filter", [])
         body["query"]["bool"]["filter"].append(filter)
     
-    # Exclude fields that exist only for searchability
-    body["_source"] = { "excludes": [ "_search" ]}
+    # Select the fields of the projection
+    body["_source"] = source_projection(asset_type, projection)
     
     # Apply pagination
     body["size"] = size
-    body["from"] = (page - 1) * size
+    if cursor is None:
+        body["from"] = (page - 1) * size
     
     # Apply text if given
     if text:
@@ -325,44 +524,264 @@ def search_assets(
             body["sort"] = [sort]
     
     client = es_client if es_client is not None else es("studio")
+    index = f"esrs-{asset_type}"
+    
+    # Search a point in time after the sort values of the last page
+    if cursor is not None:
+        search_fingerprint = fingerprint(body)
+        if cursor == CURSOR_START:
+            pit_id = client.open_point_in_time(index=index, keep_alive=CURSOR_KEEP_ALIVE).body["id"]
+            search_after = None
+        else:
+            pit_id, search_after = _decode_cursor(cursor, search_fingerprint)
+        body["pit"] = { "id": pit_id, "keep_alive": CURSOR_KEEP_ALIVE }
+        # Break ties by _shard_doc, after the relevance order of searches
+        # that don't give a sort
+        body["sort"] = body.get("sort", [{ "_score": "desc" }]) + [{ "_shard_doc": "asc" }]
+        if search_after:
+            body["search_after"] = search_after
+        index = None
+    
     # Submit search
     es_response = client.search(
-        index=f"esrs-{asset_type}",
-        body=body
+        index=index,
+        body=body,
+        filter_path=FILTER_PATH_SEARCH,
     )
+    _with_hits(getattr(es_response, "body", es_response))
+    if cursor is not None:
+        _set_next_cursor(client, es_response, size, search_fingerprint)
     if not counts:
         return es_response
     
-    # Prepare aggs
-    body = {}
-    body["size"] = 0
+    # Count the related assets of only the hits
+    _ids = [ hit["_id"] for hit in es_response.body["hits"]["hits"] ]
+    if not _ids:
+        return es_response
+    counts_body = _counts_body(asset_type, counts, len(_ids))
+    counts_body["query"] = { "terms": { ASSET_TYPES_RELATIONAL_ID_NAMES[asset_type]: _ids }}
+    aggs_response = client.search(
+        index=",".join(f"esrs-{relational_asset_type}" for relational_asset_type in counts),
+        body=counts_body,
+        filter_path="aggregations",
+    )
+    
+    # Merge aggs with _search response if there were any aggregations found
+    if "aggregations" in aggs_response.body:
+        es_response.body["aggregations"] = aggs_response.body["aggregations"]
+    return es_response
+
+def source_projection(asset_type: str, projection: Optional[Union[str, List[str]]] = None) -> Dict[str, Any]:
+    """
+    Return the _source filter of a projection of an asset type (see
+    PROJECTIONS). Fields that exist only for searchability are always excluded.
+    """
+    source = { "excludes": [ "_search" ]}
+    if projection is None:
+        return source
+    if isinstance(projection, str) and projection in PROJECTIONS:
+        source["excludes"] += PROJECTIONS[projection].get(asset_type, [])
+    elif isinstance(projection, list) and all(isinstance(field, str) for field in projection):
+        source["includes"] = list(projection)
+    else:
+        raise Exception(f"\"projection\" must be one of {sorted(PROJECTIONS.keys())} or a list of fields.")
+    return source
+
+def get_asset(
+        asset_type: str,
+        _id: str,
+        projection: Optional[Union[str, List[str]]] = None,
+        es_client: Optional["Elasticsearch"] = None,
+    ) -> Any:
+    """
+    Standardizes the get() API of workspace assets, with the _source of the
+    given projection.
+    """
+    source = source_projection(asset_type, projection)
+    client = es_client if es_client is not None else es("studio")
+    es_response = client.get(
+        index=f"esrs-{asset_type}",
+        id=_id,
+        source_includes=source.get("includes"),
+        source_excludes=source["excludes"],
+        filter_path=FILTER_PATH_GET,
+    )
+    return es_response
+
+def make_etag(body: Dict[str, Any], projection: Optional[Union[str, List[str]]] = None) -> Optional[str]:
+    """
+    Return the ETag of a document from the _index, _seq_no, and _primary_term
+    of a get response, which change whenever the document changes, and the
+    projection it was returned with. The _index is the backing index behind
+    the alias, because _seq_no and _primary_term restart in the new index of a
+    reindex. Returns None if the response doesn't have them.
     
-    # Filter by _ids of hits
+    Anything hydrated into a document, such as the index metadata of an
+    evaluation or the searches of its results, must be immutable and
+    determined by the document, so that the ETag of the document identifies
+    it too.
+    """
+    if body.get("_index") is None or body.get("_seq_no") is None or body.get("_primary_term") is None:
+        return None
+    etag = f"{body['_index']}-{body['_primary_term']}-{body['_seq_no']}"
+    if projection is not None and projection != "full":
+        etag += f"-{fingerprint(projection)}"
+    return etag
+
+def get_asset_etag(
+        asset_type: str,
+        _id: str,
+        projection: Optional[Union[str, List[str]]] = None,
+        es_client: Optional["Elasticsearch"] = None,
+    ) -> Optional[str]:
+    """
+    Return the current ETag of a workspace asset with the given projection,
+    with a get that omits the _source to validate the freshness of a cached
+    copy cheaply.
+    """
+    client = es_client if es_client is not None else es("studio")
+    es_response = client.get(
+        index=f"esrs-{asset_type}",
+        id=_id,
+        source=False,
+        filter_path=FILTER_PATH_ETAG,
+    )
+    return make_etag(getattr(es_response, "body", es_response), projection)
+
+def _with_hits(body: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Restore the hits of a search response that filter_path removed because
+    they were empty.
+    """
+    body.setdefault("hits", {}).setdefault("hits", [])
+    return body
+
+def _encode_cursor(pit_id: str, search_after: List[Any], search_fingerprint: str) -> str:
+    """
+    Encode the state of cursor pagination as an opaque string.
+    """
+    state = { "pit": pit_id, "search_after": search_after, "search": search_fingerprint }
+    return base64.urlsafe_b64encode(serialize(state).encode("utf-8")).decode("ascii")
+
+def _decode_cursor(cursor: str, search_fingerprint: str) -> Tuple[str, List[Any]]:
+    """
+    Decode a cursor into its point in time _id and search_after values. The
+    cursor must come from the same search inputs that it's given with.
+    """
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        pit_id, search_after = state["pit"], state["search_after"]
+    except (ValueError, TypeError, KeyError):
+        raise Exception("\"cursor\" is invalid.")
+    if state.get("search") != search_fingerprint:
+        raise Exception("\"cursor\" must be given with the same search inputs that returned it.")
+    return pit_id, search_after
+
+def _set_next_cursor(client: "Elasticsearch", es_response: Any, size: int, search_fingerprint: str):
+    """
+    Add the cursor of the next page to a search response. The point in time
+    is closed after the last page.
+    """
+    hits = es_response.body["hits"]["hits"]
+    pit_id = es_response.body.pop("pit_id", None)
+    if hits and len(hits) >= size:
+        es_response.body["next_cursor"] = _encode_cursor(pit_id, hits[-1]["sort"], search_fingerprint)
+    else:
+        es_response.body["next_cursor"] = None
+        if pit_id:
+            client.options(ignore_status=404).close_point_in_time(id=pit_id)
+
+def _counts_body(asset_type: str, counts: List[str], size: int) -> Dict[str, Any]:
+    """
+    Build the aggregation that counts the assets of each relational asset type
+    that reference an asset of the given type by its _id.
+    """
     _id_name = ASSET_TYPES_RELATIONAL_ID_NAMES[asset_type]
-    _ids = [ hit["_id"] for hit in es_response.body["hits"]["hits"] ]
-    body["query"] = { "terms": { _id_name: _ids }}
+    body = {}
+    body["size"] = 0
     body["aggs"] = { "counts": {}}
     
-    # Aggregate by those _ids
+    # Aggregate by the _ids of the given asset type
     body["aggs"]["counts"]["terms"] = { "field": _id_name, "size": size }
     body["aggs"]["counts"]["aggs"] = {}
     
     # Count assets that reference those _ids as a relation
-    indices = []
     for relational_asset_type in counts:
         body["aggs"]["counts"]["aggs"][relational_asset_type] = {
             "filter": { "term": {  "_index": f"esrs-{relational_asset_type}" }}
         }
-        indices.append(f"esrs-{relational_asset_type}")
-    aggs_response = client.search(
-        index=",".join(indices),
-        body=body
-    )
-    
-    # Merge aggs with _search response if there were any aggregations found
-    if "aggregations" in aggs_response.body:
-        es_response.body["aggregations"] = aggs_response.body["aggregations"]
-    return es_response
+    return body
+
+def bulk_write(
+        index: str,
+        actions: List[Union[Dict[str, Any], Exception]],
+        refresh: Optional[str] = None,
+        es_client: Optional["Elasticsearch"] = None,
+    ) -> Dict[str, Any]:
+    """
+    Submit write actions through the bulk helper and refresh the index once at
+    the end, instead of once per document. The refresh follows the given
+    refresh policy (see refresh_policy()).
+
+    Each action is a bulk helper action (with "_op_type" and "_id"). An
+    Exception in place of an action, such as a validation error, is reported
+    as the error of that item without being submitted. Items are returned in
+    the order of the actions:
+
+        {
+            "took": <milliseconds>,
+            "errors": <whether any item failed>,
+            "items": [{ "action", "_id", "status", "result" or "error" }, ...]
+        }
+    """
+    started = time.time()
+    items: List[Optional[Dict[str, Any]]] = [None] * len(actions)
+    submitted = []
+    for i, action in enumerate(actions):
+        if isinstance(action, Exception):
+            items[i] = {
+                "action": None,
+                "_id": None,
+                "status": 400,
+                "error": {"type": type(action).__name__, "reason": str(action)},
+            }
+        else:
+            action.setdefault("_index", index)
+            submitted.append(i)
+
+    refresh = refresh_policy(refresh)
+    client = es_client if es_client is not None else es("studio")
+    succeeded = 0
+    if submitted:
+        results = helpers.streaming_bulk(
+            client,
+            (actions[i] for i in submitted),
+            chunk_size=BULK_CHUNK_SIZE,
+            raise_on_error=False,
+            raise_on_exception=False,
+            **({"refresh": "wait_for"} if refresh == "wait_for" else {}),
+        )
+        for i, (ok, result) in zip(submitted, results):
+            op_type, info = next(iter(result.items()))
+            item = {"action": op_type, "_id": info.get("_id", actions[i].get("_id")), "status": info.get("status")}
+            if ok:
+                item["result"] = info.get("result")
+                succeeded += 1
+            elif "error" in info:
+                item["error"] = info["error"]
+            elif "exception" in info:
+                item["error"] = {"type": type(info["exception"]).__name__, "reason": str(info["exception"])}
+            else:
+                # e.g. "not_found" when deleting a missing document
+                item["error"] = {"type": info.get("result") or "error", "reason": info.get("result") or "error"}
+            items[i] = item
+    if succeeded and refresh is True:
+        client.indices.refresh(index=index)
+    return {
+        "took": int((time.time() - started) * 1000),
+        "errors": any("error" in item for item in items),
+        "items": items,
+    }
 
 def attach_schema_doc(cls):
     """
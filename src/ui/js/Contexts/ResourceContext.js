@@ -18,7 +18,7 @@ const RESOURCE_LOADERS = {
   // Individual resources (by _id)
   workspace: (params) => api.workspaces_get(params.workspace_id),
   benchmark: (params) => api.benchmarks_get(params.workspace_id, params.benchmark_id),
-  evaluation: (params) => api.evaluations_get(params.workspace_id, params.benchmark_id, params.evaluation_id),
+  evaluation: (params) => api.evaluations_get(params.workspace_id, params.benchmark_id, params.evaluation_id, { projection: 'summary' }), // the rest is loaded where it's shown
   display: (params) => api.displays_get(params.workspace_id, params.display_id),
   strategy: (params) => api.strategies_get(params.workspace_id, params.strategy_id),
   scenario: (params) => api.scenarios_get(params.workspace_id, params.scenario_id),
@@ -20,6 +20,7 @@ const useSearchHandler = ({
   searchSortField,
   searchSortOrder = "asc",
   useAggs = false,
+  projection = null, // optional projection of each doc, like 'summary'
   setDocs,
   setAggs,
   setTotal,
@@ -45,6 +46,8 @@ const useSearchHandler = ({
         size: searchSize,
         aggs: useAggs,
       }
+      if (projection)
+        body.projection = projection
       if (searchSortField && searchSortOrder) {
         body.sort = {
           field: searchSortField,
@@ -78,6 +81,7 @@ const useSearchHandler = ({
     searchSortField,
     searchSortOrder,
     useAggs,
+    projection,
     setDocs,
     setAggs,
     setTotal,
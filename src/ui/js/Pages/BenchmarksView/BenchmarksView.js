@@ -95,6 +95,7 @@ const BenchmarksView = () => {
     searchSortField,
     searchSortOrder,
     useAggs: false, // evaluations don't have aggs
+    projection: 'summary', // the table doesn't show results or runtime
     setDocs: (docs) => {
       /**
        * Evaluations as an array for the table component.
@@ -85,7 +85,7 @@ const ChartMetricsHeatmap = (props) => {
    * ]
    */
   useEffect(() => {
-    if (!evaluation.results || !xGroupBy || !xSortBy || !yGroupBy || !ySortBy)
+    if (!evaluation.summary || !xGroupBy || !xSortBy || !yGroupBy || !ySortBy)
       return
     const _data = []
     const summary = { ...evaluation.summary }
@@ -24,12 +24,14 @@ import {
   EuiTitle,
 } from '@elastic/eui'
 import { Page } from '../../Layout'
+import { useAppContext } from '../../Contexts/AppContext'
 import { usePageResources, useResources } from '../../Contexts/ResourceContext'
 import FlyoutRuntime from './FlyoutRuntime'
 import ChartMetricsHeatmap from './ChartMetricsHeatmap'
 import PanelUnratedDocs from './PanelUnratedDocs'
 import TableMetrics from './TableMetrics'
 import { getHistory } from '../../history'
+import api from '../../api'
 import utils from '../../utils'
 
 const EvaluationsView = () => {
@@ -37,12 +39,15 @@ const EvaluationsView = () => {
   ////  Context  ///////////////////////////////////////////////////////////////
 
   const history = getHistory()
+  const { addToast } = useAppContext()
   const { workspace, benchmark, evaluation } = usePageResources()
   const isReady = useResources().hasResources(['workspace', 'benchmark', 'evaluation'])
 
   ////  State  /////////////////////////////////////////////////////////////////
 
   const [strategyInFocus, setStrategyInFocus] = useState(null)
+  const [runtime, setRuntime] = useState(null)
+  const [unratedDocs, setUnratedDocs] = useState(null)
   const [isFlyoutRuntimeOpen, setIsFlyoutRuntimeOpen] = useState(false)
   const [metricOpen, setMetricOpen] = useState(false)
   const [metricOptions, setMetricOptions] = useState([])
@@ -108,8 +113,41 @@ const EvaluationsView = () => {
     setMetricSelected({ _id: first, label: labelForMetric(first), checked: 'on' })
   }, [normalizedBenchmarkMetrics])
 
-  const downloadEvaluation = () => {
-    const blob = new Blob([utils.jsonStringifySortedKeys(evaluation, null, 2)], { type: 'application/json' })
+  /**
+   * Get the strategies and scenarios of the runtime, which the summary of the
+   * evaluation omits, to name them in the metrics. The flyout gets the rest of
+   * the runtime, and the panel gets the unrated docs, when they're shown.
+   */
+  useEffect(() => {
+    if (!evaluation?.summary)
+      return
+    (async () => {
+      let response
+      try {
+        response = await api.evaluations_get(workspace._id, benchmark._id, evaluation._id, { projection: 'runtime.strategies,runtime.scenarios' })
+      } catch (e) {
+        return addToast(api.errorToast(e, { title: 'Failed to get runtime assets' }))
+      }
+      setRuntime(response.data._source?.runtime || {})
+    })()
+  }, [evaluation?._id, !!evaluation?.summary])
+
+  const evaluationWithRuntime = useMemo(() => {
+    if (!evaluation?.summary || !runtime)
+      return null
+    return { ...evaluation, runtime }
+  }, [evaluation, runtime])
+
+  const downloadEvaluation = async () => {
+    // The page loads a summary of the evaluation, so get all of it
+    let response
+    try {
+      response = await api.evaluations_get(workspace._id, benchmark._id, evaluation._id)
+    } catch (e) {
+      return addToast(api.errorToast(e, { title: 'Failed to get evaluation' }))
+    }
+    const fullEvaluation = { ...response.data._source, _id: response.data._id }
+    const blob = new Blob([utils.jsonStringifySortedKeys(fullEvaluation, null, 2)], { type: 'application/json' })
     const url = URL.createObjectURL(blob)
     const a = document.createElement('a')
     a.href = url
@@ -345,9 +383,11 @@ const EvaluationsView = () => {
     }
       buttons={[renderButtonRuntime(), renderButtonDownload()]}
     >
-      {isFlyoutRuntimeOpen &&
+      {isFlyoutRuntimeOpen && !!evaluation &&
         <FlyoutRuntime
-          runtime={evaluation?.runtime}
+          workspaceId={workspace._id}
+          benchmarkId={benchmark._id}
+          evaluationId={evaluation._id}
           onClose={() => setIsFlyoutRuntimeOpen(false)}
         />
       }
@@ -424,7 +464,7 @@ const EvaluationsView = () => {
       }
 
       {/* Metrics */}
-      {evaluation?.summary &&
+      {evaluationWithRuntime &&
         <>
           <EuiPanel paddingSize='none'>
             <EuiPanel color='transparent'>
@@ -438,7 +478,7 @@ const EvaluationsView = () => {
 
                 {/* Table */}
                 <EuiFlexItem>
-                  <TableMetrics evaluation={evaluation} rowOnHover={setStrategyInFocus} />
+                  <TableMetrics evaluation={evaluationWithRuntime} rowOnHover={setStrategyInFocus} />
                 </EuiFlexItem>
               </EuiFlexGroup>
             </EuiPanel>
@@ -448,7 +488,7 @@ const EvaluationsView = () => {
       }
 
       {/* Heatmap */}
-      {evaluation?.summary &&
+      {evaluationWithRuntime &&
         <>
           <EuiPanel paddingSize='none'>
             <EuiPanel color='transparent'>
@@ -463,7 +503,7 @@ const EvaluationsView = () => {
                 <EuiSpacer size='m' />
                 {metricSelected &&
                   <ChartMetricsHeatmap
-                    evaluation={evaluation}
+                    evaluation={evaluationWithRuntime}
                     metric={metricSelected._id}
                     xGroupBy={xGroupBySelected._id}
                     yGroupBy={yGroupBySelected._id}
@@ -478,7 +518,7 @@ const EvaluationsView = () => {
       }
 
       {/* Unrated docs */}
-      {evaluation?.summary &&
+      {evaluationWithRuntime &&
         <>
           <EuiPanel paddingSize='none'>
             <EuiFlexGroup>
@@ -491,9 +531,9 @@ const EvaluationsView = () => {
               </EuiFlexItem>
               <EuiFlexItem grow={false}>
                 <EuiPanel color='transparent' paddingSize='none'>
-                  <EuiButton style={{ margin: '8px 16px' }} onClick={(e) => {
+                  <EuiButton style={{ margin: '8px 16px' }} isDisabled={!unratedDocs} onClick={(e) => {
                     const pairs = []
-                    evaluation.unrated_docs.forEach((doc) => {
+                    unratedDocs.forEach((doc) => {
                       pairs.push(`(_id:"${doc._id}" AND _index:"${doc._index}")`)
                     })
                     const query = encodeURIComponent(pairs.join(' OR '))
@@ -506,7 +546,7 @@ const EvaluationsView = () => {
             </EuiFlexGroup>
             <EuiHorizontalRule margin='none' />
             <EuiPanel color='transparent' style={{ height: '600px', overflowY: 'scroll' }}>
-              <PanelUnratedDocs evaluation={evaluation} />
+              <PanelUnratedDocs evaluation={evaluationWithRuntime} onLoadUnratedDocs={setUnratedDocs} />
             </EuiPanel>
           </EuiPanel>
           <EuiSpacer size='m' />
@@ -5,6 +5,7 @@
  * 2.0.
  */
 
+import { useEffect, useState } from 'react'
 import {
   EuiButtonEmpty,
   EuiFlyout,
@@ -12,6 +13,7 @@ import {
   EuiFlyoutFooter,
   EuiFlyoutHeader,
   EuiNotificationBadge,
+  EuiSkeletonText,
   EuiSpacer,
   EuiTabbedContent,
   EuiTitle,
@@ -20,17 +22,37 @@ import TableRuntimeIndices from './TableRuntimeIndices'
 import TableRuntimeJudgements from './TableRuntimeJudgements'
 import TableRuntimeScenarios from './TableRuntimeScenarios'
 import TableRuntimeStrategies from './TableRuntimeStrategies'
+import { useAppContext } from '../../Contexts/AppContext'
+import api from '../../api'
 
-const FlyoutRuntime = ({ runtime, onClose }) => {
+const FlyoutRuntime = ({ workspaceId, benchmarkId, evaluationId, onClose }) => {
+
+  const { addToast } = useAppContext()
+  const [runtime, setRuntime] = useState(null)
+
+  /**
+   * Get the runtime assets of the evaluation, which the page doesn't load.
+   */
+  useEffect(() => {
+    (async () => {
+      let response
+      try {
+        response = await api.evaluations_get(workspaceId, benchmarkId, evaluationId, { projection: 'runtime' })
+      } catch (e) {
+        return addToast(api.errorToast(e, { title: 'Failed to get runtime assets' }))
+      }
+      setRuntime(response.data._source?.runtime || {})
+    })()
+  }, [workspaceId, benchmarkId, evaluationId])
 
   // Runtime assets as arrays for table components.
-  const indices = Object.entries(runtime.indices || {})
+  const indices = Object.entries(runtime?.indices || {})
     .map(([key, value]) => ({ _id: key, ...value }))
-  const strategies = Object.entries(runtime.strategies || {})
+  const strategies = Object.entries(runtime?.strategies || {})
     .map(([key, value]) => ({ _id: key, ...value }))
-  const scenarios = Object.entries(runtime.scenarios || {})
+  const scenarios = Object.entries(runtime?.scenarios || {})
     .map(([key, value]) => ({ _id: key, ...value }))
-  const judgements = Object.entries(runtime.judgements || {})
+  const judgements = Object.entries(runtime?.judgements || {})
     .map(([key, value]) => ({ _id: key, ...value, scenario: runtime.scenarios?.[value.scenario_id]?.name }))
 
   const renderIndices = () => {
@@ -64,7 +86,7 @@ const FlyoutRuntime = ({ runtime, onClose }) => {
   const renderBadgeCount = (assetType) => {
     return (
       <EuiNotificationBadge color='subdued' style={{ marginLeft: '8px' }}>
-        <small>{Object.keys(runtime[assetType] || []).length || 0}</small>
+        <small>{Object.keys(runtime?.[assetType] || []).length || 0}</small>
       </EuiNotificationBadge>
     )
   }
@@ -77,46 +99,48 @@ const FlyoutRuntime = ({ runtime, onClose }) => {
         </EuiTitle>
       </EuiFlyoutHeader>
       <EuiFlyoutBody>
-        <EuiTabbedContent
-          tabs={[
-            {
-              id: 'indices',
-              name: (
-                <div>
-                  Indices {renderBadgeCount('indices')}
-                </div>
-              ),
-              content: renderIndices()
-            },
-            {
-              id: 'strategies',
-              name: (
-                <div>
-                  Strategies {renderBadgeCount('strategies')}
-                </div>
-              ),
-              content: renderStrategies()
-            },
-            {
-              id: 'scenarios',
-              name: (
-                <div>
-                  Scenarios {renderBadgeCount('scenarios')}
-                </div>
-              ),
-              content: renderScenarios()
-            },
-            {
-              id: 'judgements',
-              name: (
-                <div>
-                  Judgements {renderBadgeCount('judgements')}
-                </div>
-              ),
-              content: renderJudgements()
-            }
-          ]}
-        />
+        <EuiSkeletonText lines={10} isLoading={!runtime}>
+          <EuiTabbedContent
+            tabs={[
+              {
+                id: 'indices',
+                name: (
+                  <div>
+                    Indices {renderBadgeCount('indices')}
+                  </div>
+                ),
+                content: renderIndices()
+              },
+              {
+                id: 'strategies',
+                name: (
+                  <div>
+                    Strategies {renderBadgeCount('strategies')}
+                  </div>
+                ),
+                content: renderStrategies()
+              },
+              {
+                id: 'scenarios',
+                name: (
+                  <div>
+                    Scenarios {renderBadgeCount('scenarios')}
+                  </div>
+                ),
+                content: renderScenarios()
+              },
+              {
+                id: 'judgements',
+                name: (
+                  <div>
+                    Judgements {renderBadgeCount('judgements')}
+                  </div>
+                ),
+                content: renderJudgements()
+              }
+            ]}
+          />
+        </EuiSkeletonText>
       </EuiFlyoutBody>
       <EuiFlyoutFooter>
         <EuiButtonEmpty flush='left' iconType='cross' onClick={onClose}>
@@ -27,7 +27,7 @@ import { usePageResources, useAdditionalResources } from '../../Contexts/Resourc
 import { DocCard, SearchCount } from '../../Layout'
 import api from '../../api'
 
-const PanelUnratedDocs = ({ evaluation }) => {
+const PanelUnratedDocs = ({ evaluation, onLoadUnratedDocs }) => {
 
   ////  Context  ///////////////////////////////////////////////////////////////
 
@@ -41,15 +41,35 @@ const PanelUnratedDocs = ({ evaluation }) => {
   const [isLoadingResults, setIsLoadingResults] = useState(false)
   const [results, setResults] = useState({})
   const [resultsPerRow, setResultsPerRow] = useState(3)
+  const [unratedDocs, setUnratedDocs] = useState(null)
 
   ////  Effects  ///////////////////////////////////////////////////////////////
 
+  /**
+   * Get the unrated docs of the evaluation, which the page doesn't load.
+   */
+  useEffect(() => {
+    if (!evaluation?._id)
+      return
+    (async () => {
+      let response
+      try {
+        response = await api.evaluations_get(workspace._id, evaluation.benchmark_id, evaluation._id, { projection: 'unrated_docs' })
+      } catch (e) {
+        return addToast(api.errorToast(e, { title: 'Failed to get unrated docs' }))
+      }
+      const _unratedDocs = response.data._source?.unrated_docs || []
+      setUnratedDocs(_unratedDocs)
+      onLoadUnratedDocs?.(_unratedDocs)
+    })()
+  }, [evaluation?._id])
+
   /**
    * Get index patterns and source filters from displays,
    * and search unrated docs.
    */
   useEffect(() => {
-    if (!displays)
+    if (!displays || !unratedDocs)
       return
     const _indexPatternMap = {}
     const _sourceFilters = {}
@@ -64,7 +84,7 @@ const PanelUnratedDocs = ({ evaluation }) => {
     })
     setIndexPatternMap(_indexPatternMap)
     onSearchUnratedDocs(Object.keys(_sourceFilters))
-  }, [displays])
+  }, [displays, unratedDocs])
 
   /**
    * Handle searching unrated docs
@@ -84,8 +104,8 @@ const PanelUnratedDocs = ({ evaluation }) => {
         },
         size: 10000
       }
-      for (const i in evaluation.unrated_docs) {
-        const doc = evaluation.unrated_docs[i]
+      for (const i in unratedDocs) {
+        const doc = unratedDocs[i]
         body.query.bool.should.push({
           bool: {
             filter: [
@@ -144,8 +164,8 @@ const PanelUnratedDocs = ({ evaluation }) => {
 
   const renderDocs = () => {
     const docs = []
-    for (const i in evaluation.unrated_docs) {
-      const doc = evaluation.unrated_docs[i]
+    for (const i in unratedDocs) {
+      const doc = unratedDocs[i]
       const template = resolveIndexToDisplay(doc._index)?.template
       const scenarios = (doc.scenarios || [])
         .map(_id => ({ _id, name: runtimeScenario(_id).name }))
@@ -310,7 +330,7 @@ const PanelUnratedDocs = ({ evaluation }) => {
 
   return (
     <EuiPanel color='transparent' paddingSize='none'>
-      {!!evaluation.unrated_docs &&
+      {!!unratedDocs &&
         <>
           {/* Disclaimer */}
           <EuiCallOut>
@@ -323,7 +343,7 @@ const PanelUnratedDocs = ({ evaluation }) => {
 
               {/* Show number of results */}
               <EuiFlexItem grow={5}>
-                <SearchCount showing={evaluation.unrated_docs.length} total={evaluation.unrated_docs.length} />
+                <SearchCount showing={unratedDocs.length} total={unratedDocs.length} />
               </EuiFlexItem>
 
               {/* Change grid size */}
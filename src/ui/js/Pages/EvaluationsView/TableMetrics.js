@@ -60,7 +60,7 @@ const TableMetrics = ({ evaluation, rowOnHover }) => {
    * Create chart data from evaluation results.
    */
   useEffect(() => {
-    if (!evaluation.results)
+    if (!evaluation.summary)
       return
     const rows = []
     for (const _id in evaluation.summary.strategy_id) {
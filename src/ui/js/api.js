@@ -322,13 +322,14 @@ api.judgements_set = async (workspace_id, scenario_id, doc) => {
   validateArgs('api.judgements_set', { workspace_id, scenario_id, doc, })
   doc.workspace_id = workspace_id
   doc.scenario_id = scenario_id
-  const response = await client.put(`/api/workspaces/${workspace_id}/judgements`, { data: clean(doc) })
+  // The judgement card renders the response, so don't wait for a refresh
+  const response = await client.put(`/api/workspaces/${workspace_id}/judgements`, { data: clean(doc), params: { refresh: 'false' } })
   return responseOrFallbackSetup(response)
 }
 
 api.judgements_unset = async (workspace_id, judgement_id) => {
   validateArgs('api.judgements_unset', { workspace_id, judgement_id, })
-  const response = await client.del(`/api/workspaces/${workspace_id}/judgements/${judgement_id}`)
+  const response = await client.del(`/api/workspaces/${workspace_id}/judgements/${judgement_id}`, { params: { refresh: 'false' } })
   return responseOrFallbackSetup(response)
 }
 
@@ -425,9 +426,9 @@ api.evaluations_search = async (workspace_id, benchmark_id, body) => {
   return responseOrFallbackSetup(response)
 }
 
-api.evaluations_get = async (workspace_id, benchmark_id, evaluation_id) => {
+api.evaluations_get = async (workspace_id, benchmark_id, evaluation_id, params) => {
   validateArgs('api.evaluations_get', { workspace_id, benchmark_id, evaluation_id, })
-  const response = await client.get(`/api/workspaces/${workspace_id}/benchmarks/${benchmark_id}/evaluations/${evaluation_id}`)
+  const response = await client.get(`/api/workspaces/${workspace_id}/benchmarks/${benchmark_id}/evaluations/${evaluation_id}`, params ? { params } : {})
   return responseOrFallbackSetup(response)
 }
 
@@ -0,0 +1,84 @@
+# Copyright Elasticsearch B.V. and/or licensed to Elasticsearch B.V. under one
+# or more contributor license agreements. Licensed under the Elastic License
+# 2.0; you may not use this file except in compliance with the Elastic License
+# 2.0.
+
+"""
+Benchmark the compatibility matching of make_candidate_pool, without
+Elasticsearch.
+
+Matches sampled scenarios against strategies whose params are drawn from the
+params of a workspace, in both match modes. Reports the time spent in
+benchmarks.match_candidates next to the time of comparing every strategy with
+every scenario, and checks that both give identical candidates.
+
+Usage:
+
+    python tests/benchmarks/bench_candidate_pool.py [--scenarios 10000] [--strategies 100 500]
+"""
+
+# Standard packages
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+# App packages
+from server.api import benchmarks
+
+
+def match_pairwise(strategies, scenarios, match_mode):
+    """Compare every strategy with every scenario."""
+    candidates = {"strategies": {}, "scenarios": {}}
+    for strategy_id, strategy_doc in strategies.items():
+        for scenario_id, scenario_doc in scenarios.items():
+            if match_mode == "exact":
+                compatible = strategy_doc.get("params", []) == scenario_doc.get("params", [])
+            else:
+                compatible = set(strategy_doc.get("params", [])).issubset(set(scenario_doc.get("params", [])))
+            if compatible:
+                candidates["strategies"][strategy_id] = sorted(strategy_doc.get("tags") or [])
+                candidates["scenarios"][scenario_id] = sorted(scenario_doc.get("tags") or [])
+    return candidates
+
+
+def make_docs(rng, n, params, max_params):
+    return {
+        f"{i:08d}": {
+            "params": sorted(rng.sample(params, rng.randint(1, max_params))),
+            "tags": rng.sample(["head", "torso", "tail", "misspelled"], rng.randint(0, 2)),
+        } for i in range(n)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", type=int, default=10000, help="Number of sampled scenarios")
+    parser.add_argument("--strategies", type=int, nargs="+", default=[100, 500], help="Numbers of strategies")
+    parser.add_argument("--params", type=int, default=8, help="Number of distinct params in the workspace")
+    args = parser.parse_args()
+    rng = random.Random(0)
+    params = [f"param_{i}" for i in range(args.params)]
+    scenarios = make_docs(rng, args.scenarios, params, 4)
+    for n in args.strategies:
+        strategies = make_docs(rng, n, params, 3)
+        for match_mode in ("exact", "subset"):
+            started = time.perf_counter()
+            expected = match_pairwise(strategies, scenarios, match_mode)
+            elapsed_pairwise = time.perf_counter() - started
+            started = time.perf_counter()
+            actual = benchmarks.match_candidates(strategies, scenarios, match_mode)
+            elapsed = time.perf_counter() - started
+            identical = actual == expected and all(list(actual[key]) == list(expected[key]) for key in actual)
+            print(
+                f"{args.scenarios:>6} scenarios x {n:>4} strategies, {match_mode:>6}: "
+                f"{elapsed * 1000:8.1f} ms (pairwise: {elapsed_pairwise * 1000:8.1f} ms), "
+                f"{len(actual['scenarios'])} scenarios, identical: {identical}"
+            )
+
+
+if __name__ == "__main__":
+    main()
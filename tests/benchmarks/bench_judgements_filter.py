@@ -0,0 +1,101 @@
+# Copyright Elasticsearch B.V. and/or licensed to Elasticsearch B.V. under one
+# or more contributor license agreements. Licensed under the Elastic License
+# 2.0; you may not use this file except in compliance with the Elastic License
+# 2.0.
+
+"""
+Benchmark rated/unrated filtering in judgements.search at 10k, 50k and 100k
+judged docs per scenario, without Elasticsearch.
+
+For each filter, reports the time spent in judgements.search and the bytes
+of the request bodies sent to the content deployment, next to the size of a
+single request that filters by every judged doc id. The judgements come from
+a mock studio client and are cached after the first search, like the judging
+UI. The mock content client returns hits where every other doc is judged.
+
+Usage:
+
+    python tests/benchmarks/bench_judgements_filter.py [--sizes 10000 50000 100000]
+"""
+
+# Standard packages
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+# App packages
+from server.api import judgements
+
+
+class _Response:
+    def __init__(self, body):
+        self.body = body
+
+
+class StudioClient:
+    """Mock studio client with n judgements of odd doc ids for one scenario."""
+
+    def __init__(self, n):
+        self.hits = [{
+            "_id": f"j{i}",
+            "_source": {"index": "products", "doc_id": f"d{2 * i + 1}", "rating": i % 4, "@meta": {"updated_at": "2025-01-01T00:00:00Z"}},
+            "sort": ["products", i],
+        } for i in range(n)]
+
+    def search(self, index, body):
+        if body["size"] == 0:
+            return _Response({"hits": {"total": {"value": len(self.hits)}}, "aggregations": {"updated_at": {"value": 0}}})
+        start = body["search_after"][1] + 1 if "search_after" in body else 0
+        return _Response({"hits": {"hits": self.hits[start:start + body["size"]]}})
+
+
+class ContentClient:
+    """Mock content client that counts the bytes of request bodies. Odd doc
+    ids are judged, even ones aren't."""
+
+    def __init__(self):
+        self.bytes = 0
+
+    def _hits(self, start, size):
+        return {"total": {"value": 1000000}, "max_score": 1.0, "hits": [
+            {"_index": "products", "_id": f"d{i}", "_score": 1.0 / (i + 1), "_source": {}}
+            for i in range(start, start + size)
+        ]}
+
+    def search(self, index, body):
+        self.bytes += len(json.dumps(body))
+        return _Response({"hits": self._hits(body.get("from", 0), body["size"])})
+
+    def msearch(self, searches):
+        self.bytes += sum(len(json.dumps(search)) for search in searches)
+        return _Response({"responses": [{"hits": self._hits(0, body["size"])} for body in searches[1::2]]})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000, 100000], help="Numbers of judged docs per scenario")
+    args = parser.parse_args()
+    for n in args.sizes:
+        studio = StudioClient(n)
+        legacy_bytes = len(json.dumps({"ids": {"values": [f"d{2 * i + 1}" for i in range(n)]}}))
+        for filter in ("rated", "unrated"):
+            content = ContentClient()
+            judgements._judgement_maps.clear()
+            judgements.es = lambda deployment: content
+            judgements.search("w", "s", "products", filter=filter, es_client=studio)
+            content.bytes = 0
+            started = time.perf_counter()
+            judgements.search("w", "s", "products", filter=filter, es_client=studio)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{n:>7} judged, {filter:>7}: {elapsed * 1000:8.1f} ms, "
+                f"{content.bytes / 1024:8.1f} KiB sent (single ids filter: {legacy_bytes / 1024:.1f} KiB)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# Copyright Elasticsearch B.V. and/or licensed to Elasticsearch B.V. under one
+# or more contributor license agreements. Licensed under the Elastic License
+# 2.0; you may not use this file except in compliance with the Elastic License
+# 2.0.
+
+"""
+Benchmark judging throughput under each refresh policy.
+
+Sets judgements one at a time with judgements.set(), like rapid judging in
+the UI, against the studio deployment configured in .env. Each refresh
+policy ("true", "wait_for", "false") uses its own throwaway workspace_id,
+whose judgements are deleted at the end.
+
+Usage:
+
+    python tests/benchmarks/bench_judging_throughput.py [--count 500] [--concurrency 1]
+"""
+
+# Standard packages
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+# App packages
+from server import utils
+from server.api import judgements
+from server.client import es
+
+
+def run(refresh: str, count: int, concurrency: int) -> float:
+    workspace_id = utils.unique_id()
+    scenario_id = utils.unique_id()
+
+    def judge(i):
+        judgements.set(workspace_id, scenario_id, "benchmark", str(i), i % 4, user="benchmark", refresh=refresh)
+
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(judge, range(count)))
+        return time.perf_counter() - started
+    finally:
+        es("studio").delete_by_query(
+            index=judgements.INDEX_NAME,
+            query={ "term": { "workspace_id": workspace_id }},
+            refresh=True,
+            conflicts="proceed",
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=500, help="Number of judgements to set per refresh policy")
+    parser.add_argument("--concurrency", type=int, default=1, help="Number of judgements set at once")
+    args = parser.parse_args()
+    for refresh in utils.REFRESH_POLICIES:
+        elapsed = run(refresh, args.count, args.concurrency)
+        print(f"{refresh:>8}: {args.count} judgements in {elapsed:.2f}s ({args.count / elapsed:.1f} judgements/s)")
+
+
+if __name__ == "__main__":
+    main()
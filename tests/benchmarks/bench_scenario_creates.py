@@ -0,0 +1,66 @@
+# Copyright Elasticsearch B.V. and/or licensed to Elasticsearch B.V. under one
+# or more contributor license agreements. Licensed under the Elastic License
+# 2.0; you may not use this file except in compliance with the Elastic License
+# 2.0.
+
+"""
+Benchmark the write path overhead of creating scenarios, without Elasticsearch.
+
+Each create validates the scenario and copies its searchable fields to
+_search. The index call goes to a client that discards the document, so the
+numbers are the overhead the app adds to every write. The "uncached" run
+clears the index template registry before each create to show the cost of
+reading and compiling the template on every write.
+
+Usage:
+
+    python tests/benchmarks/bench_scenario_creates.py [--count 100000]
+"""
+
+# Standard packages
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+# App packages
+from server import utils
+from server.api import scenarios
+
+
+class NullClient:
+    """Client that accepts index requests and discards them."""
+
+    def index(self, **kwargs):
+        return {"result": "created"}
+
+
+def run(count: int, cached: bool) -> float:
+    client = NullClient()
+    started = time.perf_counter()
+    for i in range(count):
+        if not cached:
+            utils._index_templates.clear()
+            utils._search_copy_plans.clear()
+        scenarios.create({
+            "workspace_id": "00000000-0000-0000-0000-000000000000",
+            "name": f"scenario {i}",
+            "values": {"text": f"query {i}"},
+            "tags": ["benchmark"],
+        }, user="benchmark", es_client=client)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100000, help="Number of scenarios to create")
+    args = parser.parse_args()
+    for label, cached in (("cached", True), ("uncached", False)):
+        elapsed = run(args.count, cached)
+        print(f"{label:>8}: {args.count} creates in {elapsed:.2f}s ({elapsed / args.count * 1e6:.1f} µs/create)")
+
+
+if __name__ == "__main__":
+    main()
@@ -40,6 +40,9 @@ ESRS_INDICES = [
     "esrs-strategies",
     "esrs-benchmarks",
     "esrs-evaluations",
+    "esrs-tool-results",
+    "esrs-index-fingerprints",
+    "esrs-evaluation-results",
 ] 
 
 def wait_for_es(url, attempts=30):
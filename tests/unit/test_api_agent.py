@@ -0,0 +1,378 @@
+"""Unit tests for the agent loop helpers."""
+
+# Standard packages
+import asyncio
+import json
+import threading
+import time
+
+# Third-party packages
+import httpx
+
+# App packages
+from server.api import agent
+
+
+def _round(i: int, result_chars: int = 4000):
+    return {
+        "id": f"round-{i}",
+        "input": {"message": f"question {i}"},
+        "steps": [
+            {
+                "type": "tool_call",
+                "tool_id": "scenarios_search",
+                "tool_call_id": f"call-{i}",
+                "params": {"workspace_id": "w"},
+                "results": [{"type": "success", "data": {"message": "x" * result_chars}}],
+            }
+        ],
+        "response": {"message": f"answer {i}"},
+    }
+
+
+def test_estimate_message_tokens_counts_content_and_tool_calls():
+    messages = [
+        {"role": "user", "content": "a" * 40},
+        {"role": "assistant", "tool_calls": [{"id": "1", "function": {"name": "abcd", "arguments": "{}"}}]},
+    ]
+    assert agent._estimate_message_tokens(messages) == (4 + 10) + (4 + 1 + 1)
+
+
+def test_compact_messages_is_noop_within_budget():
+    messages = agent._build_messages_from_rounds([_round(i) for i in range(3)])
+    assert agent._compact_messages(messages, token_budget=100000) is messages
+
+
+def test_compact_messages_keeps_recent_rounds_verbatim():
+    rounds = [_round(i) for i in range(10)]
+    messages = agent._build_messages_from_rounds(rounds)
+    compacted = agent._compact_messages(messages, token_budget=4000, keep_recent_rounds=3)
+
+    assert agent._estimate_message_tokens(compacted) <= 4000
+    recent = agent._build_messages_from_rounds(rounds[-3:])
+    assert compacted[-len(recent):] == recent
+
+
+def test_compact_messages_collapses_tool_results_before_summarizing():
+    rounds = [_round(i) for i in range(5)]
+    messages = agent._build_messages_from_rounds(rounds)
+    budget = agent._estimate_message_tokens(messages) - 500
+    compacted = agent._compact_messages(messages, token_budget=budget, keep_recent_rounds=1)
+
+    # Only the oldest round needed compaction, and collapsing its result was enough
+    assert compacted[0] == messages[0]
+    assert compacted[1] == messages[1]
+    assert "omitted" in json.loads(compacted[2]["content"])
+    assert compacted[3:] == messages[3:]
+
+
+def test_compact_messages_summarizes_distant_rounds():
+    rounds = [_round(i) for i in range(5)]
+    messages = agent._build_messages_from_rounds(rounds)
+    compacted = agent._compact_messages(messages, token_budget=1200, keep_recent_rounds=1)
+
+    assert compacted[0] == {"role": "user", "content": "question 0"}
+    assert compacted[1]["role"] == "assistant"
+    assert "scenarios_search" in compacted[1]["content"]
+    assert "answer 0" in compacted[1]["content"]
+    assert "tool_calls" not in compacted[1]
+    assert agent._sanitize_messages(compacted) == compacted
+
+
+def test_collapsed_tool_results_keep_tool_result_ref():
+    ref = {"_id": "abc", "tool_id": "scenarios_search", "size": 50000}
+    stored = json.dumps({"digest": "x" * 2000, "tool_result_ref": ref})
+    rounds = [_round(i) for i in range(3)]
+    rounds[0]["steps"][0]["results"][0]["data"]["message"] = stored
+    messages = agent._build_messages_from_rounds(rounds)
+    collapsed = agent._collapse_tool_results(messages[:3])
+    assert json.loads(collapsed[2]["content"])["tool_result_ref"] == ref
+
+
+####  MCP Tool Catalogue  ######################################################
+
+def _mcp_tools(*names):
+    return [{"name": n, "description": f"{n} tool", "inputSchema": {"type": "object"}} for n in names]
+
+
+def _reset_tool_catalogues(monkeypatch, loads):
+    monkeypatch.setattr(agent, "_tool_catalogues", {})
+    monkeypatch.setattr(agent, "_tool_catalogues_refreshing", set())
+
+    async def mock_load_tools_from_mcp(mcp_client_auth=None):
+        loads.append(mcp_client_auth)
+        return _mcp_tools("workspaces_get", "scenarios_search")
+
+    monkeypatch.setattr(agent, "_load_tools_from_mcp", mock_load_tools_from_mcp)
+
+
+def _track_refreshes(monkeypatch):
+    threads = []
+    refresh = agent._refresh_tool_catalogue_in_background
+    monkeypatch.setattr(
+        agent, "_refresh_tool_catalogue_in_background",
+        lambda identity, auth=None: threads.append(refresh(identity, auth)),
+    )
+    return threads
+
+
+def _join(threads):
+    for thread in threads:
+        if thread is not None:
+            thread.join(timeout=5)
+
+
+def test_tool_catalogue_is_cached_per_identity(monkeypatch):
+    loads = []
+    _reset_tool_catalogues(monkeypatch, loads)
+    threads = _track_refreshes(monkeypatch)
+
+    # An identity without a catalogue starts without tools while it loads
+    assert asyncio.run(agent._get_mcp_tools("token-a")) == []
+    _join(threads)
+    tools = asyncio.run(agent._get_mcp_tools("token-a"))
+    assert [t["function"]["name"] for t in tools] == ["workspaces_get", "scenarios_search"]
+    assert asyncio.run(agent._get_mcp_tools("token-a")) is tools
+    assert loads == ["token-a"]
+
+    # Credentials are never used as cache keys
+    assert all("token-a" not in identity for identity in agent._tool_catalogues)
+
+
+def test_tool_catalogue_loads_without_waiting_for_the_mcp_server(monkeypatch):
+    monkeypatch.setattr(agent, "_tool_catalogues", {})
+    monkeypatch.setattr(agent, "_tool_catalogues_refreshing", set())
+    listed = threading.Event()
+
+    async def mock_load_tools_from_mcp(mcp_client_auth=None):
+        listed.wait(timeout=5)
+        return _mcp_tools("workspaces_get")
+
+    monkeypatch.setattr(agent, "_load_tools_from_mcp", mock_load_tools_from_mcp)
+    threads = _track_refreshes(monkeypatch)
+
+    assert asyncio.run(agent._get_mcp_tools("token-a")) == []
+    assert asyncio.run(agent._get_mcp_tools("token-a")) == []
+    listed.set()
+    _join(threads)
+    assert threads[1] is None  # one load per identity is in flight
+    assert [t["function"]["name"] for t in asyncio.run(agent._get_mcp_tools("token-a"))] == ["workspaces_get"]
+
+
+def test_tool_catalogue_shares_openai_format_per_version(monkeypatch):
+    loads = []
+    _reset_tool_catalogues(monkeypatch, loads)
+
+    catalogue_a = asyncio.run(agent._load_tool_catalogue("a"))
+    catalogue_b = asyncio.run(agent._load_tool_catalogue("b"))
+    assert catalogue_a["version"] == catalogue_b["version"]
+    assert catalogue_a["tools"] is catalogue_b["tools"]
+
+
+def test_stale_tool_catalogue_is_served_while_refreshing(monkeypatch):
+    loads = []
+    _reset_tool_catalogues(monkeypatch, loads)
+    threads = _track_refreshes(monkeypatch)
+
+    identity = agent._mcp_auth_identity("token-a")
+    tools = asyncio.run(agent._load_tool_catalogue(identity, "token-a"))["tools"]
+    agent._tool_catalogues[identity]["loaded_at"] -= agent.TOOL_CATALOGUE_TTL_SECONDS + 1
+
+    # The stale catalogue is returned without waiting for the MCP server
+    assert asyncio.run(agent._get_mcp_tools("token-a")) is tools
+    _join(threads)
+    assert len(loads) == 2
+    assert time.monotonic() - agent._tool_catalogues[identity]["loaded_at"] < agent.TOOL_CATALOGUE_TTL_SECONDS
+
+
+def test_tool_catalogue_of_another_identity_is_never_served(monkeypatch):
+    loads = []
+    _reset_tool_catalogues(monkeypatch, loads)
+    threads = _track_refreshes(monkeypatch)
+
+    asyncio.run(agent._load_tool_catalogue(agent._mcp_auth_identity("token-a"), "token-a"))
+    assert asyncio.run(agent._get_mcp_tools("token-b")) == []
+    _join(threads)
+    assert loads == ["token-a", "token-b"]
+
+
+def test_tool_catalogues_are_bounded(monkeypatch):
+    loads = []
+    _reset_tool_catalogues(monkeypatch, loads)
+    monkeypatch.setattr(agent, "TOOL_CATALOGUES_MAX_ENTRIES", 2)
+    for token in ("token-a", "token-b", "token-c"):
+        asyncio.run(agent._load_tool_catalogue(agent._mcp_auth_identity(token), token))
+    assert set(agent._tool_catalogues) == {agent._mcp_auth_identity("token-b"), agent._mcp_auth_identity("token-c")}
+
+
+def test_mcp_auth_identity_of_basic_auth_is_a_fingerprint():
+    identity = agent._mcp_auth_identity(httpx.BasicAuth("elastic", "secret"))
+    assert identity == agent._mcp_auth_identity(httpx.BasicAuth("elastic", "secret"))
+    assert identity != agent._mcp_auth_identity(httpx.BasicAuth("elastic", "other"))
+    assert "secret" not in identity
+
+
+####  Tool Execution  ##########################################################
+
+def _tool_call(call_id, name, **args):
+    return {"id": call_id, "function": {"name": name, "arguments": json.dumps(args)}}
+
+
+def _run_tool_calls(tool_calls, tool_memo):
+    async def run():
+        messages = []
+        async for _ in agent._execute_tool_calls(tool_calls, messages, tool_memo=tool_memo):
+            pass
+        return messages
+    return asyncio.run(run())
+
+
+def _mock_call_mcp_tool(monkeypatch, calls, delay=0.0):
+    state = {"running": 0, "max_running": 0}
+
+    async def mock_call_mcp_tool(tool_name, tool_args, mcp_client_auth=None):
+        calls.append((tool_name, tool_args))
+        state["running"] += 1
+        state["max_running"] = max(state["max_running"], state["running"])
+        await asyncio.sleep(delay)
+        state["running"] -= 1
+        return {"tool": tool_name, "args": tool_args}
+
+    monkeypatch.setattr(agent, "_call_mcp_tool", mock_call_mcp_tool)
+    return state
+
+
+def test_read_only_tool_results_are_memoized(monkeypatch):
+    calls = []
+    _mock_call_mcp_tool(monkeypatch, calls)
+    tool_memo = {}
+
+    _run_tool_calls([_tool_call("1", "workspaces_get", _id="w")], tool_memo)
+    messages = _run_tool_calls([_tool_call("2", "workspaces_get", _id="w")], tool_memo)
+    assert calls == [("workspaces_get", {"_id": "w"})]
+    assert json.loads(messages[0]["content"]) == {"tool": "workspaces_get", "args": {"_id": "w"}}
+    assert messages[0]["tool_call_id"] == "2"
+
+    # Different arguments are a different memo entry
+    _run_tool_calls([_tool_call("3", "workspaces_get", _id="x")], tool_memo)
+    assert len(calls) == 2
+
+
+def test_mutating_tools_invalidate_dependent_results(monkeypatch):
+    calls = []
+    _mock_call_mcp_tool(monkeypatch, calls)
+    tool_memo = {}
+
+    _run_tool_calls([
+        _tool_call("1", "scenarios_get", _id="s"),
+        _tool_call("2", "strategies_get", _id="t"),
+    ], tool_memo)
+    _run_tool_calls([_tool_call("3", "scenarios_update", _id="s", doc_partial={})], tool_memo)
+    _run_tool_calls([
+        _tool_call("4", "scenarios_get", _id="s"),
+        _tool_call("5", "strategies_get", _id="t"),
+    ], tool_memo)
+
+    # Tools of the same batch run concurrently, so only the batches are ordered
+    names = [name for name, _ in calls]
+    assert sorted(names[:2]) == ["scenarios_get", "strategies_get"]
+    assert names[2:] == ["scenarios_update", "scenarios_get"]
+
+
+def test_reads_bypass_memo_when_batched_with_writes(monkeypatch):
+    calls = []
+    _mock_call_mcp_tool(monkeypatch, calls)
+    tool_memo = {}
+
+    _run_tool_calls([
+        _tool_call("1", "judgements_set", scenario_id="s", doc_id="d", rating=1),
+        _tool_call("2", "judgements_search", scenario_id="s"),
+    ], tool_memo)
+    assert tool_memo == {}
+
+
+def test_tool_concurrency_is_bounded(monkeypatch):
+    calls = []
+    state = _mock_call_mcp_tool(monkeypatch, calls, delay=0.01)
+    monkeypatch.setattr(agent, "TOOL_CONCURRENCY", 2)
+
+    _run_tool_calls([_tool_call(str(i), "content_search", page=i) for i in range(6)], {})
+    assert len(calls) == 6
+    assert state["max_running"] == 2
+
+
+####  Tool Selection  ##########################################################
+
+def _catalogue(*names):
+    return [
+        {"type": "function", "function": {"name": n, "description": f"{n} tool.\nDetails.", "parameters": {}}}
+        for n in names
+    ]
+
+
+def _ui_context(path):
+    return {"url": {"base": "http://localhost:4096", "path": path, "query": {}}}
+
+
+def test_page_from_ui_context():
+    assert agent._page_from_ui_context(None) is None
+    assert agent._page_from_ui_context(_ui_context("/")) is None
+    assert agent._page_from_ui_context(_ui_context("/workspaces")) is None
+    assert agent._page_from_ui_context(_ui_context("/workspaces/123")) == "workspace"
+    assert agent._page_from_ui_context(_ui_context("/workspaces/123/strategies/456")) == "strategies"
+    assert agent._page_from_ui_context(_ui_context("/workspaces/123/unknown")) == "workspace"
+
+
+def test_select_tools_offers_core_and_page_tools():
+    tools = _catalogue(
+        "workspaces_get", "workspaces_search", "tool_results_get", "strategies_get",
+        "scenarios_search", "benchmarks_get", "content_search", "get_base64_image_from_url",
+        "conversations_get",
+    )
+    selected = agent._select_tools(tools, _ui_context("/workspaces/123/judgements"))
+    assert selected == {
+        "workspaces_get", "workspaces_search", "tool_results_get",
+        "scenarios_search", "content_search", "get_base64_image_from_url",
+    }
+
+    offered = agent._offered_tools(tools, selected)
+    assert offered[-1] is agent.DISCOVER_TOOLS_TOOL
+    assert agent._offered_tools(tools, {t["function"]["name"] for t in tools}) == tools
+
+
+def test_discover_tools_lists_and_enables_hidden_tools():
+    tools = _catalogue("workspaces_get", "benchmarks_get")
+    enabled = {"workspaces_get"}
+    assert agent._discover_tools(tools, enabled) == {
+        "tools": [{"name": "benchmarks_get", "summary": "benchmarks_get tool."}]
+    }
+    assert agent._discover_tools(tools, enabled, ["benchmarks_get", "nope"]) == {
+        "enabled": ["benchmarks_get"], "unknown": ["nope"],
+    }
+    assert enabled == {"workspaces_get", "benchmarks_get"}
+
+
+def test_discover_tools_runs_locally(monkeypatch):
+    calls = []
+    _mock_call_mcp_tool(monkeypatch, calls)
+    tool_selection = {"tools": _catalogue("workspaces_get", "benchmarks_get"), "enabled": {"workspaces_get"}}
+
+    async def run():
+        messages = []
+        async for _ in agent._execute_tool_calls(
+            [_tool_call("1", "discover_tools", names=["benchmarks_get"])],
+            messages,
+            tool_selection=tool_selection,
+        ):
+            pass
+        return messages
+
+    messages = asyncio.run(run())
+    assert calls == []
+    assert json.loads(messages[0]["content"])["enabled"] == ["benchmarks_get"]
+    assert "benchmarks_get" in tool_selection["enabled"]
+
+
+def test_ui_context_is_serialized_compactly():
+    prompt = agent._prepare_system_prompt(_ui_context("/workspaces/123"))
+    assert prompt.endswith('{"url":{"base":"http://localhost:4096","path":"/workspaces/123","query":{}}}')
@@ -0,0 +1,197 @@
+"""Unit tests for benchmarks.match_candidates."""
+
+# Standard packages
+import copy
+import random
+
+# Third-party packages
+import pytest
+
+# App packages
+from server.api import benchmarks
+
+
+def _match_pairwise(strategies, scenarios, match_mode):
+    """Reference implementation that compares every strategy with every scenario."""
+    candidates = {"strategies": {}, "scenarios": {}}
+    for strategy_id, strategy_doc in strategies.items():
+        for scenario_id, scenario_doc in scenarios.items():
+            if match_mode == "exact":
+                compatible = strategy_doc.get("params", []) == scenario_doc.get("params", [])
+            else:
+                compatible = set(strategy_doc.get("params", [])).issubset(set(scenario_doc.get("params", [])))
+            if compatible:
+                candidates["strategies"][strategy_id] = sorted(strategy_doc.get("tags") or [])
+                candidates["scenarios"][scenario_id] = sorted(scenario_doc.get("tags") or [])
+    return candidates
+
+
+def _docs(rng, prefix, n, params):
+    docs = {}
+    for i in range(n):
+        doc = {"params": sorted(rng.sample(params, rng.randint(0, 3)))}
+        if rng.random() < 0.5:
+            doc["tags"] = rng.sample(["b", "a", "c"], rng.randint(0, 2))
+        docs[f"{prefix}{rng.randint(0, 10 ** 6)}-{i}"] = doc
+    return docs
+
+
+@pytest.mark.parametrize("match_mode", ["exact", "subset"])
+@pytest.mark.parametrize("seed", range(20))
+def test_match_candidates_is_identical_to_pairwise_matching(match_mode, seed):
+    rng = random.Random(seed)
+    params = ["text", "size", "category", "brand", "price"]
+    strategies = _docs(rng, "strategy-", 15, params + ["unknown"])
+    scenarios = _docs(rng, "scenario-", 60, params)
+    actual = benchmarks.match_candidates(strategies, scenarios, match_mode)
+    expected = _match_pairwise(strategies, scenarios, match_mode)
+    assert actual == expected
+    assert list(actual["strategies"]) == list(expected["strategies"])
+    assert list(actual["scenarios"]) == list(expected["scenarios"])
+
+
+def test_match_candidates_keeps_scenarios_in_order_of_first_match():
+    strategies = {"s1": {"params": ["b"]}, "s2": {"params": ["a"]}}
+    scenarios = {
+        "x": {"params": ["a"]},
+        "y": {"params": ["b"]},
+        "z": {"params": ["a", "b"]},
+        "w": {"params": ["a"]},
+    }
+    candidates = benchmarks.match_candidates(strategies, scenarios, "subset")
+    assert list(candidates["strategies"]) == ["s1", "s2"]
+    assert list(candidates["scenarios"]) == ["y", "z", "x", "w"]
+
+
+def test_match_candidates_exact_mode_compares_params_in_order():
+    strategies = {"s": {"params": ["a", "b"]}}
+    scenarios = {"x": {"params": ["b", "a"]}, "y": {"params": ["a", "b"]}}
+    candidates = benchmarks.match_candidates(strategies, scenarios, "exact")
+    assert list(candidates["scenarios"]) == ["y"]
+
+
+class MockScenariosClient:
+    """Mock client with scenarios and the _ids of scenarios with positive ratings."""
+
+    def __init__(self, n, rated):
+        self.ids = [f"scenario-{i:06d}" for i in range(n)]
+        self.rated = sorted(rated)
+        self.calls = []
+
+    def options(self, **kwargs):
+        return self
+
+    def open_point_in_time(self, **kwargs):
+        self.calls.append(("open_point_in_time", kwargs))
+        return {"id": "pit-1"}
+
+    def close_point_in_time(self, **kwargs):
+        self.calls.append(("close_point_in_time", kwargs))
+        return {"succeeded": True}
+
+    def search(self, index=None, body=None):
+        self.calls.append(("search", {"index": index, "body": copy.deepcopy(body)}))
+        if index == "esrs-judgements":
+            composite = body["aggs"]["scenarios_with_ratings"]["composite"]
+            after = (composite.get("after") or {}).get("scenario_id", "")
+            keys = [_id for _id in self.rated if _id > after][:composite["size"]]
+            aggregation = {"buckets": [{"key": {"scenario_id": _id}, "doc_count": 1} for _id in keys]}
+            if keys:
+                aggregation["after_key"] = {"scenario_id": keys[-1]}
+            return {"aggregations": {"scenarios_with_ratings": aggregation}}
+        start = body["search_after"][-1] + 1 if "search_after" in body else 0
+        hits = [
+            {"_id": self.ids[i], "_source": {"params": ["text"]}, "sort": [1.0, i]}
+            for i in range(start, min(start + body["size"], len(self.ids)))
+        ]
+        return {"pit_id": "pit-1", "hits": {"hits": hits}}
+
+
+def test_fetch_scenarios_pages_samples_and_ratings_past_a_page(monkeypatch):
+    monkeypatch.setattr(benchmarks, "CANDIDATES_PAGE_SIZE", 4)
+    client = MockScenariosClient(11, rated=["scenario-000001", "scenario-000004", "scenario-000009", "scenario-000020"])
+    scenarios = benchmarks.fetch_scenarios("w", sample_size=10, es_client=client)
+    assert list(scenarios) == ["scenario-000001", "scenario-000004", "scenario-000009"]
+
+    searches = [kwargs for call, kwargs in client.calls if call == "search"]
+    samples = [kwargs["body"] for kwargs in searches if kwargs["index"] is None]
+    assert [body["size"] for body in samples] == [4, 4, 2]
+    assert samples[0]["query"]["function_score"]["random_score"]["seed"]
+    assert [call for call, _ in client.calls if call.endswith("point_in_time")] == [
+        "open_point_in_time", "close_point_in_time",
+    ]
+
+    # Ratings are paged with a composite aggregation in the workspace
+    ratings = [kwargs["body"] for kwargs in searches if kwargs["index"] == "esrs-judgements"]
+    assert len(ratings) == 2
+    assert {"term": {"workspace_id": "w"}} in ratings[0]["query"]["bool"]["filter"]
+
+
+def test_fetch_scenarios_filters_ratings_by_few_sampled_ids():
+    client = MockScenariosClient(3, rated=["scenario-000002"])
+    scenarios = benchmarks.fetch_scenarios("w", sample_size=5, es_client=client)
+    assert list(scenarios) == ["scenario-000002"]
+    assert [call for call, _ in client.calls] == ["search", "search"]
+    filters = client.calls[1][1]["body"]["query"]["bool"]["filter"]
+    assert {"terms": {"scenario_id": ["scenario-000000", "scenario-000001", "scenario-000002"]}} in filters
+
+
+class MockPoolClient(MockScenariosClient):
+    """Mock client with strategies, scenarios, and the stats of their indices."""
+
+    def __init__(self):
+        super().__init__(3, rated=["scenario-000000", "scenario-000002"])
+        self.max_seq_no = 5
+        self.indices = self
+
+    def stats(self, **kwargs):
+        self.calls.append(("stats", kwargs))
+        return {"indices": {"esrs-scenarios": {
+            "uuid": "u1",
+            "primaries": {"refresh": {"external_total": 2}},
+            "shards": {"0": [{"seq_no": {"max_seq_no": self.max_seq_no}}, {"seq_no": {"max_seq_no": 4}}]},
+        }}}
+
+    def search(self, index=None, body=None):
+        if index == "esrs-strategies":
+            self.calls.append(("search", {"index": index, "body": copy.deepcopy(body)}))
+            return {"hits": {"hits": [{"_id": "strategy-1", "_source": {"params": ["text"], "tags": []}}]}}
+        return super().search(index=index, body=body)
+
+
+@pytest.fixture
+def candidate_pools(monkeypatch):
+    monkeypatch.setattr(benchmarks, "_candidate_pools", {})
+    return benchmarks._candidate_pools
+
+
+def test_make_candidate_pool_is_cached_until_assets_change(candidate_pools):
+    client = MockPoolClient()
+    task = {"scenarios": {"sample_size": 10, "sample_seed": "7"}}
+    first = benchmarks.make_candidate_pool("w", task, es_client=client)
+    assert [c["_id"] for c in first["scenarios"]] == ["scenario-000000", "scenario-000002"]
+    searches = len([call for call, _ in client.calls if call == "search"])
+
+    # The same task reuses the pool, and callers can't modify the cached copy
+    first["scenarios"].clear()
+    second = benchmarks.make_candidate_pool("w", dict(task), es_client=client)
+    assert [c["_id"] for c in second["scenarios"]] == ["scenario-000000", "scenario-000002"]
+    assert len([call for call, _ in client.calls if call == "search"]) == searches
+
+    # Another task or a change to the indices selects the pool again
+    benchmarks.make_candidate_pool("w", {"scenarios": {"sample_size": 10, "sample_seed": "8"}}, es_client=client)
+    assert len([call for call, _ in client.calls if call == "search"]) == 2 * searches
+    client.max_seq_no = 6
+    benchmarks.make_candidate_pool("w", task, es_client=client)
+    assert len([call for call, _ in client.calls if call == "search"]) == 3 * searches
+    assert len(candidate_pools) == 2
+
+
+def test_fetch_scenarios_selects_runnable_scenarios_without_params_count():
+    client = MockScenariosClient(1, rated=["scenario-000000"])
+    benchmarks.fetch_scenarios("w", sample_size=5, es_client=client)
+    filters = client.calls[0][1]["body"]["query"]["function_score"]["query"]["bool"]["filter"]
+    runnable = filters[1]["bool"]
+    assert runnable["should"][0] == {"range": {"params_count": {"gt": 0}}}
+    assert runnable["should"][1]["bool"]["must_not"] == [{"exists": {"field": "params_count"}}]
+    assert runnable["minimum_should_match"] == 1
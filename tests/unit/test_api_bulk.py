@@ -0,0 +1,127 @@
+"""Unit tests for the bulk APIs of scenarios, judgements, and strategies."""
+
+# Third-party packages
+import pytest
+
+# App packages
+from server import utils
+from server.api import judgements, scenarios, strategies
+from .test_models_judgement import mock_input_create as mock_judgement
+from .test_models_scenario import mock_input_create as mock_scenario
+
+WORKSPACE_ID = "58278355-f4f3-56d2-aa81-498250f27798"
+
+
+class _Indices:
+    def __init__(self, client):
+        self.client = client
+
+    def refresh(self, **kwargs):
+        self.client.calls.append(("refresh", kwargs))
+
+
+class MockEsClient:
+    def __init__(self):
+        self.calls = []
+        self.indices = _Indices(self)
+
+    def delete_by_query(self, **kwargs):
+        self.calls.append(("delete_by_query", kwargs))
+
+
+@pytest.fixture
+def bulk_actions(monkeypatch):
+    """Capture the actions sent to the bulk helper. Deletes of _id "missing"
+    are reported as not found."""
+    submitted = []
+
+    def streaming_bulk(client, actions, **kwargs):
+        client.calls.append(("bulk", {"refresh": kwargs.get("refresh")}))
+        for action in actions:
+            submitted.append(action)
+            op_type = action["_op_type"]
+            if op_type == "delete" and action["_id"] == "missing":
+                yield False, {op_type: {"_id": action["_id"], "status": 404, "result": "not_found"}}
+            else:
+                yield True, {op_type: {"_id": action["_id"], "status": 200, "result": "updated"}}
+
+    monkeypatch.setattr(utils.helpers, "streaming_bulk", streaming_bulk)
+    return submitted
+
+
+def test_scenarios_bulk_reports_each_item_in_order(bulk_actions):
+    client = MockEsClient()
+    response = scenarios.bulk(WORKSPACE_ID, [
+        {"action": "create", "doc": mock_scenario()},
+        {"action": "create", "doc": {"name": "no values"}},
+        {"action": "update", "_id": "s1", "doc": {"name": "renamed"}},
+        {"action": "delete", "_id": "missing"},
+        {"action": "delete"},
+        {"action": "rename", "_id": "s1"},
+        {"action": "delete", "_id": "s2"},
+    ], user="alice", via="server", es_client=client)
+
+    assert response["errors"] is True
+    items = response["items"]
+    assert [item["status"] for item in items] == [200, 400, 200, 404, 400, 400, 200]
+    assert items[1]["error"]["type"] == "ValidationError"
+    assert items[3]["error"]["type"] == "not_found"
+    assert items[5]["error"]["reason"] == "Unsupported action: rename"
+
+    # Creates use the same deterministic _id as scenarios.create()
+    doc = mock_scenario()
+    assert items[0]["_id"] == utils.unique_id([ WORKSPACE_ID, doc["values"] ])
+    assert bulk_actions[0]["_index"] == scenarios.INDEX_NAME
+    assert bulk_actions[0]["_source"]["_search"]["name"] == doc["name"]
+    assert bulk_actions[1] == {"_op_type": "update", "_id": "s1", "_index": scenarios.INDEX_NAME, "doc": bulk_actions[1]["doc"]}
+
+    # One refresh at the end, and judgements of deleted scenarios are deleted,
+    # but not the judgements of scenarios whose delete failed
+    assert [call for call, _ in client.calls] == ["bulk", "refresh", "delete_by_query"]
+    assert client.calls[2][1]["query"] == {"terms": {"scenario_id": ["s2"]}}
+
+
+def test_scenarios_bulk_keeps_judgements_of_failed_deletes(bulk_actions):
+    client = MockEsClient()
+    response = scenarios.bulk(WORKSPACE_ID, [{"action": "delete", "_id": "missing"}], es_client=client)
+    assert response["items"][0]["status"] == 404
+    assert "delete_by_query" not in [call for call, _ in client.calls]
+
+
+def test_bulk_rejects_docs_of_other_workspaces(bulk_actions):
+    client = MockEsClient()
+    doc = dict(mock_scenario(), workspace_id="other")
+    response = strategies.bulk(WORKSPACE_ID, [{"action": "create", "doc": doc}], es_client=client)
+    assert response["items"][0]["status"] == 400
+    assert bulk_actions == []
+    assert client.calls == []
+
+
+def test_judgements_bulk_sets_with_deterministic_ids(bulk_actions):
+    client = MockEsClient()
+    doc = mock_judgement()
+    doc.pop("workspace_id")
+    response = judgements.bulk(WORKSPACE_ID, [
+        {"action": "set", "doc": doc},
+        {"action": "unset", "_id": "j1"},
+    ], user="alice", via="mcp", es_client=client)
+
+    assert response["errors"] is False
+    expected_id = utils.unique_id([WORKSPACE_ID, doc["scenario_id"], doc["index"], doc["doc_id"]])
+    assert [item["_id"] for item in response["items"]] == [expected_id, "j1"]
+    assert bulk_actions[0]["scripted_upsert"] is True
+    assert bulk_actions[0]["script"]["params"]["rating"] == doc["rating"]
+    assert bulk_actions[0]["script"]["params"]["via"] == "mcp"
+    assert [call for call, _ in client.calls] == ["bulk", "refresh"]
+
+
+@pytest.mark.parametrize("refresh, bulk_refresh, calls", [
+    ("true", None, ["bulk", "refresh"]),
+    ("wait_for", "wait_for", ["bulk"]),
+    ("false", None, ["bulk"]),
+])
+def test_bulk_follows_refresh_policy(bulk_actions, refresh, bulk_refresh, calls):
+    client = MockEsClient()
+    strategies.bulk(WORKSPACE_ID, [{"action": "delete", "_id": "s1"}], refresh=refresh, es_client=client)
+    assert [call for call, _ in client.calls] == calls
+    assert client.calls[0][1]["refresh"] == bulk_refresh
@@ -0,0 +1,172 @@
+"""Unit tests for the cached index metadata and fingerprints of the content deployment."""
+
+# Third-party packages
+import pytest
+
+# App packages
+from server.api import content
+
+
+class _Meta:
+    def __init__(self, status):
+        self.status = status
+
+
+class _Response(dict):
+    def __init__(self, body, status=200):
+        super().__init__(body)
+        self.body = body
+        self.meta = _Meta(status)
+
+
+class MockEsClient:
+    def __init__(self, api_key="key"):
+        self._headers = {"authorization": f"ApiKey {api_key}"}
+        self.calls = []
+        self.mappings_version = 1
+        self.cluster = self
+        self.indices = self
+
+    def options(self, **kwargs):
+        return self
+
+    def state(self, **kwargs):
+        self.calls.append("state")
+        return _Response({"metadata": {"indices": {"products": {
+            "settings": {"index": {"uuid": "u1"}},
+            "mappings_version": self.mappings_version,
+        }}}})
+
+    def get_mapping(self, **kwargs):
+        self.calls.append("get_mapping")
+        return _Response({"products": {"mappings": {"properties": {
+            "title": {"type": "text"},
+            "price": {"properties": {"amount": {"type": "float"}}},
+        }}}})
+
+
+class MockContentClient(MockEsClient):
+    def __init__(self):
+        super().__init__()
+        self.max_seq_no = 7
+
+    def stats(self, **kwargs):
+        self.calls.append(("stats", kwargs["filter_path"]))
+        return _Response({"indices": {"products": {"uuid": "u1", "shards": {
+            "0": [{"seq_no": {"max_seq_no": self.max_seq_no}}, {"seq_no": {"max_seq_no": 5}}],
+            "1": [{"seq_no": {"max_seq_no": 3}}],
+        }}}})
+
+    def get(self, **kwargs):
+        self.calls.append("get")
+        return _Response({"products": {
+            "aliases": {},
+            "settings": {"index": {"uuid": "u1"}},
+            "mappings": {"properties": {"title": {"type": "text"}}},
+        }})
+
+
+class MockStudioClient:
+    def __init__(self):
+        self.docs = {}
+
+    def options(self, **kwargs):
+        return self
+
+    def index(self, **kwargs):
+        assert kwargs["op_type"] == "create"
+        self.docs.setdefault(kwargs["id"], kwargs["document"])
+
+    def mget(self, **kwargs):
+        return _Response({"docs": [
+            {"_id": _id, "found": True, "_source": self.docs[_id]} if _id in self.docs else {"_id": _id, "found": False}
+            for _id in kwargs["ids"]
+        ]})
+
+
+@pytest.fixture(autouse=True)
+def clear_metadata_cache():
+    content._metadata_cache.clear()
+    content._fingerprints.clear()
+    content._index_metadata_stored.clear()
+    yield
+    content._metadata_cache.clear()
+    content._fingerprints.clear()
+    content._index_metadata_stored.clear()
+
+
+def test_mappings_are_served_from_cache_within_ttl():
+    client = MockEsClient()
+    first = content.mappings_browse("products", es_client=client)
+    second = content.mappings_browse("products", es_client=client)
+    assert first == second == {"products": {"fields": {"title": "text", "price.amount": "float"}}}
+    assert client.calls == ["state", "get_mapping"]
+
+
+def test_mappings_are_refetched_only_when_changed(monkeypatch):
+    monkeypatch.setattr(content, "CONTENT_METADATA_TTL_SECONDS", 0)
+    client = MockEsClient()
+    content.mappings_browse("products", es_client=client)
+    content.mappings_browse("products", es_client=client)
+    assert client.calls == ["state", "get_mapping", "state"]
+    client.mappings_version = 2
+    content.mappings_browse("products", es_client=client)
+    assert client.calls == ["state", "get_mapping", "state", "state", "get_mapping"]
+
+
+def test_cache_is_not_shared_across_identities():
+    content.mappings_browse("products", es_client=MockEsClient("alice"))
+    client = MockEsClient("bob")
+    content.mappings_browse("products", es_client=client)
+    assert client.calls == ["state", "get_mapping"]
+
+
+def test_fingerprints_fetch_only_seq_nos_and_store_mappings_once():
+    client = MockContentClient()
+    studio = MockStudioClient()
+    first = content.make_index_relevance_fingerprints("products", es_client=client, studio_client=studio)
+    assert first["products"]["shards"] == [{"id": 0, "max_seq_no": 7}, {"id": 1, "max_seq_no": 3}]
+    assert "mappings" not in first["products"]
+    assert client.calls[0] == ("stats", "indices.*.uuid,indices.*.shards.*.seq_no.max_seq_no")
+    assert client.calls.count("get") == 1
+
+    # An unchanged index is neither refetched nor stored again
+    second = content.make_index_relevance_fingerprints("products", es_client=client, studio_client=studio)
+    assert second == first
+    assert client.calls.count("get") == 1
+    assert len(studio.docs) == 1
+
+    # New writes change the fingerprint, but reuse the stored metadata
+    client.max_seq_no = 8
+    third = content.make_index_relevance_fingerprints("products", es_client=client, studio_client=studio)
+    assert third["products"]["_fingerprint"] != first["products"]["_fingerprint"]
+    assert third["products"]["_metadata"] == first["products"]["_metadata"]
+    assert third["products"]["shards"][0] == {"id": 0, "max_seq_no": 8}
+    assert len(studio.docs) == 1
+
+    # A new mappings version stores the metadata again
+    client.mappings_version = 2
+    fourth = content.make_index_relevance_fingerprints("products", es_client=client, studio_client=studio)
+    assert fourth["products"]["_fingerprint"] == third["products"]["_fingerprint"]
+    assert fourth["products"]["_metadata"] != first["products"]["_metadata"]
+    assert len(studio.docs) == 2
+
+    stored = content.get_index_metadata([first["products"]["_metadata"], "missing"], es_client=studio)
+    assert list(stored.keys()) == [first["products"]["_metadata"]]
+    assert stored[first["products"]["_metadata"]]["mappings"] == {"properties": {"title": {"type": "text"}}}
+    assert stored[first["products"]["_metadata"]]["mappings_version"] == 1
+
+
+def test_fingerprints_store_metadata_per_fingerprint_without_versions():
+    client = MockContentClient()
+
+    def state(**kwargs):
+        raise content.ApiError("forbidden", _Meta(403), {})
+
+    client.state = state
+    studio = MockStudioClient()
+    first = content.make_index_relevance_fingerprints("products", es_client=client, studio_client=studio)
+    assert first["products"]["_metadata"] == first["products"]["_fingerprint"]
+    client.max_seq_no = 8
+    content.make_index_relevance_fingerprints("products", es_client=client, studio_client=studio)
+    assert len(studio.docs) == 2
@@ -114,17 +114,21 @@ class TestSetupEsClientFallback:
                 call_log.append(("get_index_template", kwargs))
                 return _make_es_response({"index_templates": []})
 
-            def exists(self, **kwargs):
-                call_log.append(("exists", kwargs))
-                return True
+            def get(self, **kwargs):
+                call_log.append(("get", kwargs))
+                return _make_es_response({})
 
         class MockClient:
             indices = MockIndices()
 
+            def options(self, **kwargs):
+                return self
+
         monkeypatch.setattr(setup, "es", lambda name: pytest.fail("es() should not be called when es_client provided"))
+        setup._clear_cached_state()
         setup.check_setup_state(es_client=MockClient())
         assert len(call_log) > 0
-        assert all(action in ("get_index_template", "exists") for action, _ in call_log)
+        assert all(action in ("get_index_template", "get") for action, _ in call_log)
 
     def test_check_setup_state_falls_back_to_es_studio_when_es_client_none(self, monkeypatch):
         call_log = []
@@ -134,14 +138,18 @@ class TestSetupEsClientFallback:
                 call_log.append(("get_index_template", kwargs))
                 return _make_es_response({"index_templates": []})
 
-            def exists(self, **kwargs):
-                call_log.append(("exists", kwargs))
-                return True
+            def get(self, **kwargs):
+                call_log.append(("get", kwargs))
+                return _make_es_response({})
 
         class MockClient:
             indices = MockIndices()
 
+            def options(self, **kwargs):
+                return self
+
         monkeypatch.setattr(setup, "es", lambda name: MockClient() if name == "studio" else pytest.fail("expected studio"))
+        setup._clear_cached_state()
         setup.check_setup_state()
         assert len(call_log) > 0
 
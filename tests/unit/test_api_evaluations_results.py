@@ -0,0 +1,198 @@
+"""Unit tests for paged retrieval of evaluation results."""
+
+# App packages
+from server import utils
+from server.api import content, evaluations
+
+
+class _Response:
+    def __init__(self, body):
+        self.body = body
+
+
+class MockEsClient:
+    """Serves an evaluation with results embedded in it, as evaluations were
+    stored before the results index, or with its searches in the results index."""
+
+    def __init__(self, results, stored=None):
+        self.results = results
+        self.stored = stored or []
+        self.calls = []
+        self.searches = []
+
+    def get(self, **kwargs):
+        self.calls.append(kwargs)
+        source = {
+            "results": self.results,
+            "runtime": {"indices": {"products": {"_metadata": "m"}}, "strategies": {}, "scenarios": {}},
+        }
+        if kwargs.get("source_includes"):
+            included = {}
+            for field in kwargs["source_includes"]:
+                key, _, subkey = field.partition(".")
+                if subkey:
+                    included.setdefault(key, {})[subkey] = source[key][subkey]
+                else:
+                    included[key] = source[key]
+            source = included
+        for field in kwargs.get("source_excludes") or []:
+            source.pop(field, None)
+        return _Response({"_id": kwargs["id"], "_source": source})
+
+    def search(self, index, body, **kwargs):
+        self.searches.append(body)
+        assert index == evaluations.RESULTS_INDEX_NAME
+        terms = {}
+        for f in body["query"]["bool"]["filter"]:
+            terms.update(f["term"])
+        hits = [
+            {"_source": doc, "sort": [doc["position"]]}
+            for doc in sorted(self.stored, key=lambda doc: doc["position"])
+            if all(doc[field] == value for field, value in terms.items())
+            and doc["position"] > (body.get("search_after") or [-1])[0]
+        ]
+        total = len(hits)
+        start = body.get("from", 0)
+        hits = hits[start:start + body["size"]]
+        return _Response({"hits": {"total": {"value": total, "relation": "eq"}, "hits": hits}})
+
+
+def _results(strategies=3, scenarios=4):
+    return [
+        {
+            "strategy_id": f"t{i}",
+            "searches": [
+                {"scenario_id": f"s{j}", "metrics": {"ndcg": j / 4}, "hits": []}
+                for j in range(scenarios)
+            ],
+            "failures": [{"type": "timeout"}] if i == 1 else [],
+        }
+        for i in range(strategies)
+    ]
+
+
+def _stored(strategies=3, scenarios=4):
+    """Return the results of an evaluation as stored by run(), and the docs of
+    its searches in the results index."""
+    results = _results(strategies, scenarios)
+    stored = []
+    for strategy_results in results:
+        for search in strategy_results.pop("searches"):
+            stored.append({
+                "evaluation_id": "e",
+                "strategy_id": strategy_results["strategy_id"],
+                "position": len(stored),
+                **search,
+            })
+    return results, stored
+
+
+def test_results_are_paged_across_strategies():
+    client = MockEsClient(_results())
+    response = evaluations.results("e", size=5, page=2, es_client=client)
+    assert client.calls[0]["source_includes"] == ["results"]
+    assert response["total"] == 12
+    assert [(r["strategy_id"], r["scenario_id"]) for r in response["results"]] == [
+        ("t1", "s1"), ("t1", "s2"), ("t1", "s3"), ("t2", "s0"), ("t2", "s1"),
+    ]
+    assert response["failures"] == [{"strategy_id": "t1", "type": "timeout"}]
+
+
+def test_results_are_filtered_by_strategy_and_scenario():
+    client = MockEsClient(_results())
+    response = evaluations.results("e", strategy_id="t2", es_client=client)
+    assert response["total"] == 4
+    assert response["failures"] == []
+    response = evaluations.results("e", scenario_id="s3", es_client=client)
+    assert [r["strategy_id"] for r in response["results"]] == ["t0", "t1", "t2"]
+    response = evaluations.results("e", strategy_id="t1", scenario_id="s2", es_client=client)
+    assert response["results"] == [{"strategy_id": "t1", "scenario_id": "s2", "metrics": {"ndcg": 0.5}, "hits": []}]
+
+
+def test_results_of_an_unfinished_evaluation_are_empty():
+    client = MockEsClient(None)
+    response = evaluations.results("e", size=5000, es_client=client)
+    assert response["total"] == 0
+    assert response["size"] == evaluations.RESULTS_MAX_SIZE
+    assert client.searches == []
+
+
+def test_stored_results_are_paged_in_the_query():
+    results, stored = _stored()
+    client = MockEsClient(results, stored)
+    response = evaluations.results("e", size=5, page=2, es_client=client)
+    assert client.searches == [{
+        "query": {"bool": {"filter": [{"term": {"evaluation_id": "e"}}]}},
+        "sort": [{"position": "asc"}],
+        "from": 5,
+        "size": 5,
+        "track_total_hits": True,
+    }]
+    assert response["total"] == 12
+    assert [(r["strategy_id"], r["scenario_id"]) for r in response["results"]] == [
+        ("t1", "s1"), ("t1", "s2"), ("t1", "s3"), ("t2", "s0"), ("t2", "s1"),
+    ]
+    assert response["failures"] == [{"strategy_id": "t1", "type": "timeout"}]
+
+
+def test_stored_results_are_filtered_in_the_query():
+    results, stored = _stored()
+    client = MockEsClient(results, stored)
+    response = evaluations.results("e", strategy_id="t1", scenario_id="s2", es_client=client)
+    assert client.searches[0]["query"]["bool"]["filter"][1:] == [
+        {"term": {"strategy_id": "t1"}},
+        {"term": {"scenario_id": "s2"}},
+    ]
+    assert response["total"] == 1
+    assert response["results"] == [{"strategy_id": "t1", "scenario_id": "s2", "metrics": {"ndcg": 0.5}, "hits": []}]
+    assert response["failures"] == [{"strategy_id": "t1", "type": "timeout"}]
+
+
+def test_get_hydrates_the_searches_of_stored_results(monkeypatch):
+    monkeypatch.setattr(content, "get_index_metadata", lambda ids, es_client=None: {})
+    monkeypatch.setattr(evaluations, "RESULTS_MAX_SIZE", 5)
+    results, stored = _stored()
+    client = MockEsClient(results, stored)
+    source = evaluations.get("e", es_client=client).body["_source"]
+    assert source["results"] == _results()
+    assert len(client.searches) == 3
+
+
+def test_get_only_hydrates_what_the_projection_includes(monkeypatch):
+    def get_index_metadata(ids, es_client=None):
+        raise AssertionError("index metadata must not be hydrated")
+    monkeypatch.setattr(content, "get_index_metadata", get_index_metadata)
+    results, stored = _stored()
+    client = MockEsClient(results, stored)
+    evaluations.get("e", projection="summary", es_client=client)
+    evaluations.get("e", projection=["runtime.strategies", "runtime.scenarios"], es_client=client)
+    assert client.searches == []
+
+
+def test_store_searches_writes_one_doc_per_strategy_and_scenario(monkeypatch):
+    writes = []
+    def bulk_write(index, actions, refresh=None, es_client=None):
+        writes.append((index, actions, refresh))
+        return {"took": 0, "errors": False, "items": []}
+    monkeypatch.setattr(utils, "bulk_write", bulk_write)
+    evaluation = {"workspace_id": "w", "benchmark_id": "b", "results": _results(2, 2)}
+    evaluations._store_searches("e", evaluation, es_client=object())
+    index, actions, refresh = writes[0]
+    assert index == evaluations.RESULTS_INDEX_NAME
+    assert refresh == "true"
+    assert [a["_source"]["position"] for a in actions] == [0, 1, 2, 3]
+    assert actions[3]["_id"] == utils.unique_id(["e", "t1", "s1"])
+    assert actions[3]["_source"] == {
+        "workspace_id": "w",
+        "benchmark_id": "b",
+        "evaluation_id": "e",
+        "strategy_id": "t1",
+        "position": 3,
+        "scenario_id": "s1",
+        "metrics": {"ndcg": 0.25},
+        "hits": [],
+    }
+
+
+def test_overview_projection_omits_only_results():
+    assert utils.source_projection("evaluations", "overview") == {"excludes": ["_search", "results"]}
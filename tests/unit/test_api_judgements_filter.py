@@ -1,23 +1,83 @@
 # Standard packages
 from unittest.mock import MagicMock, patch
 
+# Third-party packages
+import pytest
+
 # App packages
+from server import utils
 from server.api import judgements
 
 
-def _mock_es_for_search():
-    """Return mock es that returns clients with empty search results."""
+@pytest.fixture(autouse=True)
+def clear_judgement_maps():
+    judgements._judgement_maps.clear()
+    yield
+    judgements._judgement_maps.clear()
+
+
+def _judgement(_id, doc_id, updated_by="alice", updated_via="server", updated_at="2025-01-01T00:00:00Z", seq_no=0):
+    return {
+        "_index": "esrs-judgements-000001",
+        "_id": _id,
+        "_seq_no": seq_no,
+        "_source": {
+            "index": "test",
+            "doc_id": doc_id,
+            "rating": 1,
+            "@meta": {
+                "created_at": "2025-01-01T00:00:00Z",
+                "created_by": updated_by,
+                "updated_at": updated_at,
+                "updated_by": updated_by,
+                "updated_via": updated_via,
+            },
+        },
+    }
+
+
+def _judgements_body(hits):
+    """Return a search response with the given judgements and their version."""
+    seq_nos = [hit["_seq_no"] for hit in hits]
+    return {
+        "hits": {"total": {"value": len(hits)}, "hits": hits},
+        "aggregations": {
+            "indices": {"buckets": [{"key": _index} for _index in sorted(set(hit["_index"] for hit in hits))]},
+            "seq_no_max": {"value": max(seq_nos, default=None)},
+            "seq_no_sum": {"value": float(sum(seq_nos))},
+        },
+    }
+
+
+def _mock_es_for_search(hits=None):
+    """Return mock es that returns clients with the given judgements and
+    empty content search results."""
     mock_studio = MagicMock()
-    mock_studio.search.return_value.body = {"hits": {"hits": []}}
+    mock_studio._headers = {}
+    mock_studio.search.return_value.body = _judgements_body(hits or [])
     mock_content = MagicMock()
     mock_content.search.return_value.body = {"hits": {"hits": []}}
     mock_es = MagicMock(side_effect=lambda x: mock_studio if x == "studio" else mock_content)
-    return mock_es, mock_studio
+    return mock_es, mock_studio, mock_content
+
+
+def _filtered_ids(mock_content):
+    """Return the doc ids that the content search was filtered by."""
+    body = mock_content.search.call_args[1]["body"]
+    clauses = body["query"]["bool"].get("should") or body["query"]["bool"].get("must_not") or []
+    return sorted(_id for clause in clauses for _id in clause["bool"]["filter"][1]["ids"]["values"])
+
+
+HITS = [
+    _judgement("j1", "d1", updated_via="mcp", seq_no=1),
+    _judgement("j2", "d2", updated_by="ai", seq_no=2),
+    _judgement("j3", "d3", seq_no=3),
+]
 
 
 def test_search_rated_ai_matches_via_mcp_or_by_ai():
     """rated-ai filter should match @meta.updated_via=='mcp' OR @meta.updated_by=='ai'."""
-    mock_es, mock_studio = _mock_es_for_search()
+    mock_es, mock_studio, mock_content = _mock_es_for_search(HITS)
     with patch("server.api.judgements.es", mock_es):
         judgements.search(
             workspace_id="w",
@@ -25,18 +85,12 @@ def test_search_rated_ai_matches_via_mcp_or_by_ai():
             index_pattern="test",
             filter="rated-ai",
         )
-    call_body = mock_studio.search.call_args[1]["body"]
-    ai_clause = call_body["query"]["bool"]["filter"][-1]
-    assert "bool" in ai_clause
-    should = ai_clause["bool"]["should"]
-    assert {"term": {"@meta.updated_via": "mcp"}} in should
-    assert {"term": {"@meta.updated_by": "ai"}} in should
-    assert ai_clause["bool"]["minimum_should_match"] == 1
+    assert _filtered_ids(mock_content) == ["d1", "d2"]
 
 
 def test_search_rated_human_excludes_via_mcp_and_by_ai():
     """rated-human filter should exclude @meta.updated_via=='mcp' AND @meta.updated_by=='ai'."""
-    mock_es, mock_studio = _mock_es_for_search()
+    mock_es, mock_studio, mock_content = _mock_es_for_search(HITS)
     with patch("server.api.judgements.es", mock_es):
         judgements.search(
             workspace_id="w",
@@ -44,7 +98,184 @@ def test_search_rated_human_excludes_via_mcp_and_by_ai():
             index_pattern="test",
             filter="rated-human",
         )
-    call_body = mock_studio.search.call_args[1]["body"]
-    must_not = call_body["query"]["bool"]["must_not"]
-    assert {"term": {"@meta.updated_via": "mcp"}} in must_not
-    assert {"term": {"@meta.updated_by": "ai"}} in must_not
+    assert _filtered_ids(mock_content) == ["d3"]
+
+
+def test_search_reuses_judgements_while_version_is_unchanged():
+    mock_es, mock_studio, mock_content = _mock_es_for_search(HITS)
+    with patch("server.api.judgements.es", mock_es):
+        judgements.search(workspace_id="w", scenario_id="s", index_pattern="test")
+        judgements.search(workspace_id="w", scenario_id="s", index_pattern="test", filter="unrated")
+    bodies = [call[1]["body"] for call in mock_studio.search.call_args_list]
+
+    # One version check per search, and one fetch of the judgements
+    assert [body["size"] for body in bodies] == [0, judgements.JUDGEMENTS_PAGE_SIZE, 0]
+    assert _filtered_ids(mock_content) == ["d1", "d2", "d3"]
+
+
+def test_search_refetches_judgements_when_version_changes():
+    mock_es, mock_studio, mock_content = _mock_es_for_search(HITS)
+    with patch("server.api.judgements.es", mock_es):
+        judgements.search(workspace_id="w", scenario_id="s", index_pattern="test")
+        mock_studio.search.return_value.body = _judgements_body(HITS[:1])
+        judgements.search(workspace_id="w", scenario_id="s", index_pattern="test", filter="rated")
+    bodies = [call[1]["body"] for call in mock_studio.search.call_args_list]
+    assert [body["size"] for body in bodies] == [0, judgements.JUDGEMENTS_PAGE_SIZE, 0, judgements.JUDGEMENTS_PAGE_SIZE]
+    assert _filtered_ids(mock_content) == ["d1"]
+
+
+class _Response:
+    def __init__(self, body):
+        self.body = body
+
+
+class MockJudgementsClient:
+    """Mock studio client whose writes are visible to search only after a
+    refresh, as with refresh=false."""
+
+    def __init__(self, hits):
+        self.visible = list(hits)
+        self.seq_no = max(hit["_seq_no"] for hit in hits)
+        self.searches = []
+
+    def search(self, index, body):
+        self.searches.append(body["size"])
+        return _Response(_judgements_body(list(self.visible)))
+
+    def update(self, **kwargs):
+        self.seq_no += 1
+        return _Response({"_index": "esrs-judgements-000001", "result": "created", "_seq_no": self.seq_no})
+
+    def delete(self, **kwargs):
+        self.seq_no += 1
+        return _Response({"_index": "esrs-judgements-000001", "result": "deleted", "_seq_no": self.seq_no})
+
+
+def test_set_and_unset_update_cached_judgements_ahead_of_search():
+    studio = MockJudgementsClient(HITS)
+    mock_es, _, mock_content = _mock_es_for_search()
+    mock_es.side_effect = lambda x: studio if x == "studio" else mock_content
+    with patch("server.api.judgements.es", mock_es):
+        judgements.search(workspace_id="w", scenario_id="s", index_pattern="test")
+        judgements.set("w", "s", "test", "d4", 2, user="alice", refresh="false")
+        judgements.unset("j1", refresh="false")
+
+        # Search doesn't see the writes yet, but the cached judgements do
+        judgements.search(workspace_id="w", scenario_id="s", index_pattern="test", filter="rated")
+        assert studio.searches == [0, judgements.JUDGEMENTS_PAGE_SIZE, 0]
+        assert _filtered_ids(mock_content) == ["d2", "d3", "d4"]
+        entry = judgements._judgement_maps[(utils.client_identity(studio), "w", "s")]
+        assert entry["judgements"]["test"]["d4"]["rating"] == 2
+
+        # Once search sees the writes, the versions match
+        _id = judgements._make_id({"workspace_id": "w", "scenario_id": "s", "index": "test", "doc_id": "d4"})
+        studio.visible = HITS[1:] + [_judgement(_id, "d4", seq_no=4)]
+        judgements.search(workspace_id="w", scenario_id="s", index_pattern="test", filter="rated")
+        assert studio.searches[3:] == [0]
+        assert judgements._judgement_maps[(utils.client_identity(studio), "w", "s")]["past_versions"] == []
+
+        # A write of another process is detected by its _seq_no, whatever
+        # its @meta.updated_at
+        studio.visible[0] = _judgement("j2", "d2", updated_by="ai", seq_no=6)
+        judgements.search(workspace_id="w", scenario_id="s", index_pattern="test", filter="rated")
+        assert studio.searches[4:] == [0, judgements.JUDGEMENTS_PAGE_SIZE]
+
+
+def test_search_refetches_judgements_after_a_reindex_with_the_same_seq_nos():
+    mock_es, mock_studio, mock_content = _mock_es_for_search(HITS)
+    with patch("server.api.judgements.es", mock_es):
+        judgements.search(workspace_id="w", scenario_id="s", index_pattern="test")
+
+        # _seq_no restarts in the new backing index of a reindex
+        reindexed = [dict(hit, _index="esrs-judgements-000002") for hit in HITS]
+        reindexed[0] = dict(_judgement("j4", "d4", seq_no=1), _index="esrs-judgements-000002")
+        mock_studio.search.return_value.body = _judgements_body(reindexed)
+        judgements.search(workspace_id="w", scenario_id="s", index_pattern="test", filter="rated")
+    bodies = [call[1]["body"] for call in mock_studio.search.call_args_list]
+    assert [body["size"] for body in bodies] == [0, judgements.JUDGEMENTS_PAGE_SIZE, 0, judgements.JUDGEMENTS_PAGE_SIZE]
+    assert _filtered_ids(mock_content) == ["d2", "d3", "d4"]
+
+
+def test_cached_judgements_are_kept_per_client_identity():
+    mock_es, mock_studio, mock_content = _mock_es_for_search(HITS)
+    with patch("server.api.judgements.es", mock_es):
+        judgements.search(workspace_id="w", scenario_id="s", index_pattern="test")
+        mock_studio._headers = {"authorization": "ApiKey other"}
+        judgements.search(workspace_id="w", scenario_id="s", index_pattern="test")
+    bodies = [call[1]["body"] for call in mock_studio.search.call_args_list]
+    assert [body["size"] for body in bodies] == [0, judgements.JUDGEMENTS_PAGE_SIZE] * 2
+    assert len(judgements._judgement_maps) == 2
+
+
+def _content_hit(doc_id, score):
+    return {"_index": "test", "_id": doc_id, "_score": score, "_source": {}}
+
+
+def test_search_rated_splits_many_judged_docs_into_chunks(monkeypatch):
+    monkeypatch.setattr(judgements, "FILTER_IDS_MAX", 2)
+    mock_es, mock_studio, mock_content = _mock_es_for_search(HITS)
+    mock_content.msearch.return_value.body = {"responses": [
+        {"hits": {"total": {"value": 2}, "max_score": 2.0, "hits": [_content_hit("d2", 2.0), _content_hit("d1", 1.0)]}},
+        {"hits": {"total": {"value": 1}, "max_score": 3.0, "hits": [_content_hit("d3", 3.0)]}},
+    ]}
+    with patch("server.api.judgements.es", mock_es):
+        response = judgements.search(workspace_id="w", scenario_id="s", index_pattern="test", filter="rated")
+
+    searches = mock_content.msearch.call_args[1]["searches"]
+    chunk_ids = [body["query"]["bool"]["should"][0]["bool"]["filter"][1]["ids"]["values"] for body in searches[1::2]]
+    assert chunk_ids == [["d1", "d2"], ["d3"]]
+    assert mock_content.search.call_count == 0
+
+    # Hits of all chunks are merged by score
+    assert [hit["doc"]["_id"] for hit in response["hits"]["hits"]] == ["d3", "d2", "d1"]
+    assert [hit["_id"] for hit in response["hits"]["hits"]] == ["j3", "j2", "j1"]
+    assert response["hits"]["total"] == {"value": 3, "relation": "eq"}
+
+
+def test_search_rated_merges_chunks_by_the_sort_of_the_search(monkeypatch):
+    monkeypatch.setattr(judgements, "FILTER_IDS_MAX", 2)
+    mock_es, mock_studio, mock_content = _mock_es_for_search(HITS)
+
+    def sorted_hit(doc_id, price, score):
+        return dict(_content_hit(doc_id, score), sort=[price, score])
+
+    mock_content.msearch.return_value.body = {"responses": [
+        {"hits": {"total": {"value": 2}, "max_score": 3.0, "hits": [sorted_hit("d2", 10, 1.0), sorted_hit("d1", 20, 3.0)]}},
+        {"hits": {"total": {"value": 1}, "max_score": 2.0, "hits": [sorted_hit("d3", 10, 2.0)]}},
+    ]}
+    query = {"query": {"bool": {"must": {"match_all": {}}}}, "sort": [{"price": {"order": "asc"}}, "_score"]}
+    with patch("server.api.judgements.es", mock_es):
+        response = judgements.search(workspace_id="w", scenario_id="s", index_pattern="test", query=query, filter="rated")
+
+    # Ascending by price, then descending by score
+    assert [hit["doc"]["_id"] for hit in response["hits"]["hits"]] == ["d3", "d2", "d1"]
+
+
+def test_search_unrated_filters_out_many_judged_docs_from_pages(monkeypatch):
+    monkeypatch.setattr(judgements, "FILTER_IDS_MAX", 2)
+    monkeypatch.setattr(judgements, "UNRATED_PAGE_SIZE", 3)
+    mock_es, mock_studio, mock_content = _mock_es_for_search(HITS)
+    pages = [
+        [_content_hit("d1", 5.0), _content_hit("u1", 4.0), _content_hit("d2", 3.0)],
+        [_content_hit("u2", 2.0), _content_hit("d3", 1.0)],
+    ]
+    mock_content.search.side_effect = lambda index, body: MagicMock(body={"hits": {
+        "total": {"value": 6}, "max_score": 5.0, "hits": pages[body["from"] // 3],
+    }})
+    mock_content.msearch.return_value.body = {"responses": [
+        {"hits": {"total": {"value": 2}, "hits": []}},
+        {"hits": {"total": {"value": 1}, "hits": []}},
+    ]}
+    with patch("server.api.judgements.es", mock_es):
+        response = judgements.search(workspace_id="w", scenario_id="s", index_pattern="test", filter="unrated")
+
+    bodies = [call[1]["body"] for call in mock_content.search.call_args_list]
+    assert all("must_not" not in body["query"]["bool"] for body in bodies)
+    assert [hit["doc"]["_id"] for hit in response["hits"]["hits"]] == ["u1", "u2"]
+    assert all(hit["rating"] is None for hit in response["hits"]["hits"])
+
+    # The total excludes the judged docs that match the search, counted per chunk
+    counts = mock_content.msearch.call_args[1]["searches"][1::2]
+    assert [body["size"] for body in counts] == [0, 0]
+    assert all(body["track_total_hits"] is True for body in counts)
+    assert response["hits"]["total"] == {"value": 3, "relation": "eq"}
@@ -16,6 +16,13 @@ class _Response:
         self.meta = _Meta(status=status)
 
 
+@pytest.fixture(autouse=True)
+def clear_cached_state():
+    setup._clear_cached_state()
+    yield
+    setup._clear_cached_state()
+
+
 def test_load_migration_manifest_requires_sorted_versions(tmp_path, monkeypatch):
     manifest_path = tmp_path / "index_templates.json"
     manifest_path.write_text(
@@ -194,6 +201,82 @@ def test_run_upgrade_applies_put_mapping_for_additive_changes(monkeypatch):
     assert calls["put_mapping"] == 1
 
 
+def test_run_upgrade_backfills_existing_documents(monkeypatch):
+    backfill = {
+        "query": {"bool": {"must_not": [{"exists": {"field": "params_count"}}]}},
+        "script": {"source": "ctx._source.params_count = 0", "lang": "painless"},
+    }
+    manifest = {
+        "schema_version": 1,
+        "versions": [
+            {
+                "version": "1.3.0",
+                "steps": [
+                    {
+                        "template": "esrs-scenarios",
+                        "action": "update_template",
+                        "requires_reindex": False,
+                        "mapping_additions": {"params_count": {"type": "integer"}},
+                        "backfill": backfill,
+                    }
+                ],
+            }
+        ],
+    }
+    template_def = {
+        "esrs-scenarios": {
+            "name": "esrs-scenarios",
+            "index_name": "esrs-scenarios",
+            "body": {"_meta": {"version": "1.3.0"}, "index_patterns": ["esrs-scenarios*"], "template": {"mappings": {}}},
+            "version": "1.3.0",
+        }
+    }
+    calls = []
+
+    class _Indices:
+        def put_index_template(self, name, body):
+            return _Response({"acknowledged": True})
+
+        def exists(self, index):
+            return True
+
+        def put_mapping(self, index, body):
+            calls.append("put_mapping")
+            return _Response({"acknowledged": True})
+
+    class _Client:
+        def __init__(self):
+            self.indices = _Indices()
+
+        def update_by_query(self, **kwargs):
+            calls.append("update_by_query")
+            assert kwargs["index"] == "esrs-scenarios"
+            assert kwargs["query"] == backfill["query"]
+            assert kwargs["script"] == backfill["script"]
+            assert kwargs["conflicts"] == "proceed"
+            return _Response({"updated": 3})
+
+    monkeypatch.setattr(setup, "_load_migration_manifest", lambda: manifest)
+    monkeypatch.setattr(setup, "_load_index_templates", lambda: template_def)
+    monkeypatch.setattr(setup, "_append_applied_version", lambda version, via="api", es_client=None: None)
+    monkeypatch.setattr(
+        setup,
+        "check_upgrade_state",
+        lambda es_client=None: {
+            "pending_versions": ["1.3.0"],
+            "upgrade_needed": True,
+            "reindex_required": False,
+            "blocking_reasons": [],
+        },
+    )
+    monkeypatch.setattr(setup, "es", lambda name: _Client())
+
+    result = setup.run_upgrade(additive_only=True)
+    assert result["upgrade"]["failures"] == 0
+    assert calls == ["put_mapping", "update_by_query"]
+    assert result["upgrade"]["requests"][-1]["action"] == "backfill"
+
+
 def test_read_server_version_returns_stripped_value(tmp_path, monkeypatch):
     version_file = tmp_path / "VERSION"
     version_file.write_text("1.2.3\n")
@@ -304,3 +387,319 @@ def test_check_includes_upgrade_only_setup_failures_flag(monkeypatch):
 
     result = setup.check()
     assert result["setup"]["upgrade_only_failures"] is True
+
+
+class _StateClient:
+    """Mock client with every index template and index deployed at version 1.3.0."""
+
+    def __init__(self, missing=()):
+        self.calls = []
+        self.indices = self
+        self.license = self
+        self.templates = [
+            {"name": name, "index_template": {"_meta": {"version": "1.3.0"}}}
+            for name, _ in setup.PATH_INDEX_TEMPLATES if name not in missing
+        ]
+
+    def options(self, **kwargs):
+        return self
+
+    def info(self):
+        self.calls.append("info")
+        response = _Response({"version": {"build_flavor": "default"}})
+        response.meta.headers = {}
+        return response
+
+    def get(self, **kwargs):
+        if kwargs.get("features"):
+            self.calls.append("indices.get")
+            return _Response({name: {"settings": {"index": {"uuid": name}}} for name, _ in setup.PATH_INDEX_TEMPLATES})
+        if "index" in kwargs:
+            self.calls.append("get")
+            return _Response({"_source": {"applied_versions": ["1.3.0"]}})
+        self.calls.append("license.get")
+        return _Response({"license": {"type": "basic", "status": "active"}})
+
+    def get_index_template(self, name):
+        self.calls.append(f"get_index_template {name}")
+        return _Response({"index_templates": self.templates})
+
+
+def test_check_setup_state_uses_one_request_for_templates_and_indices():
+    client = _StateClient(missing=["esrs-benchmarks"])
+    state = setup.check_setup_state(es_client=client)
+    assert client.calls == ["get_index_template esrs-*", "indices.get"]
+    assert state["failures"] == 1
+    statuses = {
+        (request.get("index_template"), request.get("index")): request["response"]["status"]
+        for request in state["requests"]
+    }
+    assert statuses[("esrs-benchmarks", None)] == 404
+    assert statuses[("esrs-workspaces", None)] == 200
+    assert statuses[(None, "esrs-benchmarks")] == 200
+
+
+def test_check_is_cached_briefly_and_cleared_by_setup():
+    client = _StateClient()
+    first = setup.check(es_client=client)
+    assert first["setup"]["failures"] == 0
+    assert first["upgrade"]["upgrade_needed"] is False
+    assert sorted(client.calls) == sorted([
+        "info", "license.get", "get_index_template esrs-*", "indices.get", "get",
+    ])
+
+    client.calls.clear()
+    assert setup.check(es_client=client) is first
+    assert client.calls == []
+
+    setup._clear_cached_state()
+    setup.check(es_client=client)
+    assert "get_index_template esrs-*" in client.calls
+
+
+class _ReindexClient:
+    """Mock client with a legacy esrs-scenarios index and a reindex task."""
+
+    def __init__(self, ledger=None, polls=2):
+        self.calls = []
+        self.indices = self
+        self.tasks = self
+        self.ledger = dict(ledger or {})
+        self.polls = polls
+        self.max_seq_no = 0
+        self.source_ids = ["a", "b"]
+        self.dest_ids = ["a", "b", "c"]
+
+    def options(self, **kwargs):
+        return self
+
+    # Indices
+    def put_index_template(self, name, body):
+        self.calls.append("put_index_template")
+        return _Response({"acknowledged": True})
+
+    def get_alias(self, name):
+        return _Response({"error": "alias missing"}, status=404)
+
+    def exists(self, index):
+        return index == "esrs-scenarios"
+
+    def create(self, index, **kwargs):
+        if index != setup.LEDGER_INDEX:
+            self.calls.append(f"create {index}")
+        return _Response({"acknowledged": True, "index": index})
+
+    def delete(self, index):
+        self.calls.append(f"delete {index}")
+        return _Response({}, status=404)
+
+    def stats(self, **kwargs):
+        self.max_seq_no += 10
+        return _Response({"indices": {"esrs-scenarios": {"shards": {
+            "0": [{"seq_no": {"max_seq_no": self.max_seq_no}}, {"seq_no": {"max_seq_no": self.max_seq_no - 1}}],
+            "1": [{"seq_no": {"max_seq_no": self.max_seq_no + 3}}],
+        }}}})
+
+    def refresh(self, index):
+        return _Response({})
+
+    def count(self, index):
+        return _Response({"count": len(self.source_ids if index == "esrs-scenarios" else self.dest_ids)})
+
+    def add_block(self, index, block):
+        self.calls.append(f"add_block {index}")
+        return _Response({"acknowledged": True})
+
+    def put_settings(self, index, settings):
+        self.calls.append(f"put_settings {index}")
+        return _Response({"acknowledged": True})
+
+    def update_aliases(self, actions):
+        self.calls.append(("update_aliases", actions))
+        return _Response({"acknowledged": True})
+
+    # Tasks
+    def get(self, **kwargs):
+        if "task_id" in kwargs:
+            self.calls.append(f"tasks.get {kwargs['task_id']}")
+            self.polls -= 1
+            body = {"completed": self.polls <= 0, "task": {"status": {"total": 3, "created": 3 - max(self.polls, 0)}}}
+            if body["completed"]:
+                body["response"] = {"total": 3, "created": 3, "failures": []}
+            return _Response(body)
+        source = self.ledger.get(kwargs["id"])
+        return _Response({"_source": source} if source else {}, status=200 if source else 404)
+
+    # Documents
+    def index(self, index, id, document, refresh):
+        self.ledger[id] = json.loads(json.dumps(document))
+        return _Response({"result": "updated"})
+
+    def reindex(self, **kwargs):
+        self.calls.append(("reindex", kwargs))
+        if kwargs["wait_for_completion"]:
+            return _Response({"total": 1, "created": 1, "failures": []})
+        return _Response({"task": "node:1"})
+
+    def open_point_in_time(self, **kwargs):
+        return _Response({"id": "pit-1"})
+
+    def close_point_in_time(self, **kwargs):
+        return _Response({"succeeded": True})
+
+    def search(self, body):
+        start = body.get("search_after", [-1])[-1] + 1
+        hits = [{"_id": _id, "sort": [i]} for i, _id in enumerate(self.dest_ids) if i >= start][:body["size"]]
+        return _Response({"pit_id": "pit-1", "hits": {"hits": hits}})
+
+    def mget(self, index, ids, source):
+        return _Response({"docs": [{"_id": _id, "found": _id in self.source_ids} for _id in ids]})
+
+    def bulk(self, operations, refresh):
+        self.calls.append(("bulk", operations))
+        deleted = [operation["delete"]["_id"] for operation in operations]
+        self.dest_ids = [_id for _id in self.dest_ids if _id not in deleted]
+        return _Response({"errors": False})
+
+
+def _reindex_template():
+    return {
+        "name": "esrs-scenarios",
+        "index_name": "esrs-scenarios",
+        "body": {"_meta": {"version": "1.4.0"}, "index_patterns": ["esrs-scenarios*"]},
+        "version": "1.4.0",
+    }
+
+
+def _step_calls(client):
+    return [call if isinstance(call, str) else call[0] for call in client.calls]
+
+
+def test_reindex_step_copies_catches_up_and_swaps_alias(monkeypatch):
+    monkeypatch.setattr(setup, "REINDEX_POLL_SECONDS", 0)
+    client = _ReindexClient()
+    step = {"template": "esrs-scenarios", "action": "update_template", "requires_reindex": True}
+    requests = setup._execute_upgrade_step(
+        step, {"esrs-scenarios": _reindex_template()}, client, version="1.4.0", via="server",
+    )
+    assert [request["action"] for request in requests] == [
+        "put_index_template", "create_index", "reindex", "reindex_catch_up", "reindex_catch_up", "swap_alias",
+    ]
+
+    # The bulk copy is a sliced, throttled task
+    reindexes = [call[1] for call in client.calls if call[0] == "reindex"]
+    assert reindexes[0]["source"] == {"index": "esrs-scenarios"}
+    assert reindexes[0]["dest"] == {"index": "esrs-scenarios-1.4.0"}
+    assert reindexes[0]["slices"] == "auto"
+    assert reindexes[0]["requests_per_second"] == setup.REINDEX_REQUESTS_PER_SECOND
+    assert reindexes[0]["wait_for_completion"] is False
+
+    # Writes during the copy are caught up and deletes are reconciled before
+    # writes are blocked. Under the block, only writes since the second
+    # checkpoint are caught up.
+    assert reindexes[1]["source"]["query"] == {"range": {"_seq_no": {"gt": 9}}}
+    assert reindexes[2]["source"]["query"] == {"range": {"_seq_no": {"gt": 19}}}
+    assert _step_calls(client)[-5:] == ["reindex", "bulk", "add_block esrs-scenarios", "reindex", "update_aliases"]
+    assert ("bulk", [{"delete": {"_index": "esrs-scenarios-1.4.0", "_id": "c"}}]) in client.calls
+
+    # The legacy index is swapped for an alias atomically
+    assert client.calls[-1] == ("update_aliases", [
+        {"add": {"index": "esrs-scenarios-1.4.0", "alias": "esrs-scenarios", "is_write_index": True}},
+        {"remove_index": {"index": "esrs-scenarios"}},
+    ])
+
+    record = client.ledger["reindex-esrs-scenarios-1.4.0"]
+    assert record["status"] == "completed"
+    assert record["task_id"] == "node:1"
+    assert record["progress"]["created"] == 3
+    assert record["deleted"] == 1
+    assert record["@meta"]["updated_via"] == "server"
+
+
+def test_reindex_step_reconciles_deletes_again_if_counts_differ_under_the_block(monkeypatch):
+    monkeypatch.setattr(setup, "REINDEX_POLL_SECONDS", 0)
+    client = _ReindexClient(polls=1)
+    add_block = client.add_block
+
+    # A document is deleted after the reconciliation, before the block
+    def delete_then_add_block(index, block):
+        client.source_ids.remove("b")
+        return add_block(index, block)
+
+    client.add_block = delete_then_add_block
+    setup._execute_reindex_step(
+        {"template": "esrs-scenarios", "requires_reindex": True}, "1.4.0", _reindex_template(), "api", client,
+    )
+    assert _step_calls(client)[-4:] == ["add_block esrs-scenarios", "reindex", "bulk", "update_aliases"]
+    assert client.calls[-2] == ("bulk", [{"delete": {"_index": "esrs-scenarios-1.4.0", "_id": "b"}}])
+    assert client.ledger["reindex-esrs-scenarios-1.4.0"]["deleted"] == 2
+
+
+def test_reindex_step_resumes_a_running_task(monkeypatch):
+    monkeypatch.setattr(setup, "REINDEX_POLL_SECONDS", 0)
+    client = _ReindexClient(ledger={"reindex-esrs-scenarios-1.4.0": {
+        "status": "reindexing",
+        "source": "esrs-scenarios",
+        "dest": "esrs-scenarios-1.4.0",
+        "task_id": "node:7",
+        "source_max_seq_no": 3,
+    }}, polls=1)
+    setup._execute_reindex_step(
+        {"template": "esrs-scenarios", "requires_reindex": True}, "1.4.0", _reindex_template(), "api", client,
+    )
+    assert "create esrs-scenarios-1.4.0" not in client.calls
+    assert "tasks.get node:7" in client.calls
+    reindexes = [call[1] for call in client.calls if call[0] == "reindex"]
+    assert reindexes[0]["source"]["query"] == {"range": {"_seq_no": {"gt": 3}}}
+
+
+def test_reindex_step_lifts_a_block_left_by_an_interrupted_upgrade(monkeypatch):
+    client = _ReindexClient(ledger={"reindex-esrs-scenarios-1.4.0": {
+        "status": "blocked",
+        "source": "esrs-scenarios",
+        "dest": "esrs-scenarios-1.4.0",
+        "task_id": "node:7",
+        "source_max_seq_no": 30,
+    }})
+    setup._execute_reindex_step(
+        {"template": "esrs-scenarios", "requires_reindex": True}, "1.4.0", _reindex_template(), "api", client,
+    )
+
+    # The copy isn't restarted. Writes are unblocked while catching up again.
+    calls = _step_calls(client)
+    assert calls[0] == "put_settings esrs-scenarios"
+    assert "create esrs-scenarios-1.4.0" not in calls
+    assert not any(call.startswith("tasks.get") for call in calls)
+    reindexes = [call[1] for call in client.calls if call[0] == "reindex"]
+    assert reindexes[0]["source"]["query"] == {"range": {"_seq_no": {"gt": 30}}}
+    assert calls.index("bulk") < calls.index("add_block esrs-scenarios")
+    assert client.ledger["reindex-esrs-scenarios-1.4.0"]["status"] == "completed"
+
+
+def test_reindex_step_unblocks_writes_when_the_swap_fails(monkeypatch):
+    monkeypatch.setattr(setup, "REINDEX_POLL_SECONDS", 0)
+    client = _ReindexClient(polls=1)
+
+    def update_aliases(actions):
+        raise ValueError("alias swap failed")
+
+    client.update_aliases = update_aliases
+    with pytest.raises(ValueError, match="alias swap failed"):
+        setup._execute_reindex_step(
+            {"template": "esrs-scenarios", "requires_reindex": True}, "1.4.0", _reindex_template(), "api", client,
+        )
+    assert client.calls[-1] == "put_settings esrs-scenarios"
+    assert client.ledger["reindex-esrs-scenarios-1.4.0"]["status"] == "failed"
+
+
+def test_is_release_applied_requires_the_alias_of_a_reindex_step(monkeypatch):
+    release = {"version": "1.4.0", "steps": [{"template": "esrs-scenarios", "requires_reindex": True}]}
+    monkeypatch.setattr(setup, "_get_deployed_template_version", lambda name, es_client=None: "1.4.0")
+    monkeypatch.setattr(setup, "_get_deployed_indices", lambda es_client=None: {"esrs-scenarios": {}})
+    assert setup._is_release_applied(release) is False
+
+    backing_index = {"aliases": {"esrs-scenarios": {}}}
+    monkeypatch.setattr(setup, "_get_deployed_indices", lambda es_client=None: {
+        "esrs-scenarios-1.4.0": backing_index, "esrs-scenarios": backing_index,
+    })
+    assert setup._is_release_applied(release) is True
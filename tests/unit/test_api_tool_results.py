@@ -0,0 +1,107 @@
+"""Unit tests for out-of-line storage of large agent tool results."""
+
+# Standard packages
+import asyncio
+import json
+
+# Third-party packages
+import pytest
+from werkzeug.exceptions import Forbidden
+
+# App packages
+from server.api import agent, tool_results
+
+
+class MockEsClient:
+    def __init__(self, owner: str = "alice"):
+        self.owner = owner
+        self.docs = {}
+        self.index_calls = []
+
+    def options(self, **kwargs):
+        return self
+
+    def index(self, **kwargs):
+        self.index_calls.append(kwargs)
+        self.docs.setdefault(kwargs["id"], kwargs["document"])
+        return {"result": "created"}
+
+    def get(self, **kwargs):
+        source = dict(self.docs[kwargs["id"]])
+        source["@meta"] = {"created_by": self.owner}
+        return {"_source": source}
+
+
+def _large_search_response(hits: int = 200) -> str:
+    return json.dumps({
+        "hits": {
+            "total": {"value": hits},
+            "hits": [
+                {"_id": str(i), "_source": {"name": f"scenario {i}", "values": {"text": "x" * 300}}}
+                for i in range(hits)
+            ],
+        }
+    })
+
+
+def test_digest_is_capped_and_keeps_structure():
+    content = _large_search_response()
+    digest = agent._make_tool_result_digest(content, max_chars=2000)
+    assert len(json.dumps(digest)) <= 2000
+    assert digest["hits"]["total"]["value"] == 200
+    assert digest["hits"]["hits"][0]["_id"] == "0"
+    assert digest["hits"]["hits"][-1].endswith("more items)")
+
+
+def test_digest_truncates_plain_text():
+    assert agent._make_tool_result_digest("a" * 5000, max_chars=100) == "a" * 100
+
+
+def test_small_results_stay_inline():
+    client = MockEsClient()
+    content = json.dumps({"hits": {"hits": []}})
+    result = asyncio.run(agent._offload_tool_result("scenarios_search", content, es_client=client))
+    assert result == content
+    assert client.index_calls == []
+
+
+def test_exempt_tools_stay_inline():
+    client = MockEsClient()
+    content = _large_search_response()
+    result = asyncio.run(agent._offload_tool_result("tool_results_get", content, es_client=client))
+    assert result == content
+    assert client.index_calls == []
+
+
+def test_large_results_are_stored_and_expandable():
+    client = MockEsClient(owner="alice")
+    content = _large_search_response()
+    result = asyncio.run(agent._offload_tool_result(
+        "scenarios_search", content, conversation_id="conv-1", user="alice", es_client=client,
+    ))
+    assert len(result) < len(content)
+    ref = json.loads(result)["tool_result_ref"]
+    assert ref["size"] == len(content)
+    assert client.index_calls[0]["op_type"] == "create"
+
+    # Identical results in the same conversation share one document
+    asyncio.run(agent._offload_tool_result(
+        "scenarios_search", content, conversation_id="conv-1", user="alice", es_client=client,
+    ))
+    assert len(client.docs) == 1
+
+    # Read the full content back in slices
+    parts = []
+    offset = 0
+    while offset is not None:
+        response = tool_results.get(ref["_id"], offset=offset, length=10000, user="alice", es_client=client)
+        parts.append(response["content"])
+        offset = response["next_offset"]
+    assert "".join(parts) == content
+
+
+def test_get_forbidden_when_owner_differs():
+    client = MockEsClient(owner="bob")
+    _id = tool_results.create("{}", "scenarios_search", user="bob", es_client=client)
+    with pytest.raises(Forbidden):
+        tool_results.get(_id, user="alice", es_client=client)
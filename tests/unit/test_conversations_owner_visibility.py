@@ -86,7 +86,7 @@ def test_fastmcp_conversations_search_passes_user(monkeypatch):
         lambda _ctx: ("alice", object()),
     )
 
-    def mock_search(text, filters, sort, size, page, aggs, user=None, es_client=None):
+    def mock_search(text, filters, sort, size, page, aggs, cursor=None, projection=None, user=None, es_client=None):
         captured["user"] = user
         return {"hits": {"hits": []}}
 
@@ -0,0 +1,115 @@
+# Copyright Elasticsearch B.V. and/or licensed to Elasticsearch B.V. under one
+# or more contributor license agreements. Licensed under the Elastic License
+# 2.0; you may not use this file except in compliance with the Elastic License
+# 2.0.
+
+"""Unit tests for conditional gets of workspace assets with ETags."""
+
+# Standard packages
+from types import SimpleNamespace
+
+# Third-party packages
+import pytest
+
+# App packages
+import server.client as client_mod
+from server import auth, utils
+from server.flask import app
+
+
+class _MockResponse:
+    def __init__(self, body):
+        self.body = body
+        self.meta = SimpleNamespace(status=200)
+
+
+class MockEsClient:
+    def __init__(self):
+        self.index = "esrs-workspaces-000001"
+        self.seq_no = 4
+        self.calls = []
+
+    def get(self, **kwargs):
+        self.calls.append(kwargs)
+        body = {"_index": self.index, "_id": kwargs["id"], "_seq_no": self.seq_no, "_primary_term": 1}
+        if kwargs.get("source") is not False:
+            body["_source"] = {"name": "Workspace"}
+        return _MockResponse(body)
+
+
+@pytest.fixture
+def es_client(monkeypatch):
+    monkeypatch.setattr(auth, "AUTH_ENABLED", False)
+    mock = MockEsClient()
+    monkeypatch.setattr(client_mod, "_es_clients", {"studio": mock, "content": mock})
+    return mock
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+def test_make_etag():
+    assert utils.make_etag({"_index": "esrs-workspaces-000001", "_seq_no": 0, "_primary_term": 2}) == "esrs-workspaces-000001-2-0"
+    assert utils.make_etag({"_seq_no": 0, "_primary_term": 2}) is None
+    assert utils.make_etag({"_id": "a", "_source": {}}) is None
+
+
+def test_get_returns_etag(client, es_client):
+    r = client.get("/api/workspaces/w")
+    assert r.status_code == 200
+    assert r.headers["ETag"] == '"esrs-workspaces-000001-1-4"'
+    assert "no-cache" in r.headers["Cache-Control"]
+    assert r.get_json()["_source"] == {"name": "Workspace"}
+    assert len(es_client.calls) == 1
+
+
+def test_get_with_matching_etag_is_not_modified(client, es_client):
+    r = client.get("/api/workspaces/w", headers={"If-None-Match": '"esrs-workspaces-000001-1-4"'})
+    assert r.status_code == 304
+    assert r.headers["ETag"] == '"esrs-workspaces-000001-1-4"'
+    assert r.data == b""
+
+    # Freshness is validated without fetching the _source
+    assert es_client.calls == [{
+        "index": "esrs-workspaces",
+        "id": "w",
+        "source": False,
+        "filter_path": utils.FILTER_PATH_ETAG,
+    }]
+
+
+def test_get_with_stale_etag_returns_document(client, es_client):
+    es_client.seq_no = 5
+    r = client.get("/api/workspaces/w/displays/d", headers={"If-None-Match": '"esrs-workspaces-000001-1-4"'})
+    assert r.status_code == 200
+    assert r.headers["ETag"] == '"esrs-workspaces-000001-1-5"'
+    assert r.get_json()["_source"] == {"name": "Workspace"}
+    assert es_client.calls[0]["index"] == "esrs-displays"
+
+
+def test_etag_changes_when_alias_moves_to_a_new_index(client, es_client):
+    r = client.get("/api/workspaces/w")
+    etag = r.headers["ETag"]
+
+    # A reindex restarts _seq_no and _primary_term in the new backing index
+    es_client.index = "esrs-workspaces-000002"
+    r = client.get("/api/workspaces/w", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["ETag"] == '"esrs-workspaces-000002-1-4"'
+
+
+def test_etag_depends_on_the_projection(client, es_client):
+    full = client.get("/api/workspaces/w").headers["ETag"]
+    summary = client.get("/api/workspaces/w?projection=summary").headers["ETag"]
+    fields = client.get("/api/workspaces/w?projection=name").headers["ETag"]
+    assert len({full, summary, fields}) == 3
+    assert client.get("/api/workspaces/w?projection=full").headers["ETag"] == full
+
+    # A representation that the client didn't receive is never not modified
+    r = client.get("/api/workspaces/w?projection=summary", headers={"If-None-Match": full})
+    assert r.status_code == 200
+    assert r.headers["ETag"] == summary
+    r = client.get("/api/workspaces/w?projection=summary", headers={"If-None-Match": summary})
+    assert r.status_code == 304
@@ -230,6 +230,9 @@ def test_create_computes_params_from_values():
         "text",
     ])
     
+    # "params_count" must be the number of params
+    assert model.params_count == 1
+    
 ####  Test Serialization  ######################################################
     
 def test_create_serialization_has_all_given_inputs():
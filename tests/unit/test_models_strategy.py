@@ -106,6 +106,7 @@ def test_create_is_valid_without_optional_inputs():
     assert model.template.lang == "mustache"
     assert model.template.source == ""
     assert model.params == []
+    assert model.params_count == 0
 
 def test_update_is_valid_without_optional_inputs():
     
@@ -229,6 +230,18 @@ def test_create_computes_params_from_template():
         "text",
     ])
     
+    # "params_count" must be the number of params
+    assert model.params_count == 1
+
+def test_update_computes_params_count_only_with_template():
+    model = StrategyUpdate.model_validate(mock_input_update(), context=mock_context())
+    assert model.params_count == 1
+    input = mock_input_update()
+    input.pop("template", None)
+    model = StrategyUpdate.model_validate(input, context=mock_context())
+    assert model.params_count is None
+    assert "params_count" not in model.serialize()
+    
 ####  Test Serialization  ######################################################
     
 def test_create_serialization_has_all_given_inputs():
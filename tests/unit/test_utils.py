@@ -2,6 +2,8 @@
 - utils.remove_empty_values
 - utils.get_search_fields_from_mapping
 - utils.copy_fields_to_search
+- utils.get_search_copy_plan
+- utils.refresh_policy
 - utils.extract_params
 - utils.timestamp
 - utils.timestamp_given
@@ -11,6 +13,9 @@
 import re
 import uuid
 
+# Third-party packages
+import pytest
+
 # App packages
 from .test_models_workspace import mock_input_create
 from server import utils
@@ -146,4 +151,37 @@ class TestUtils:
             "tags": expected["tags"],
             "description": expected["description"],
         }
-        assert actual == expected
\ No newline at end of file
+        assert actual == expected
+    
+    def test_copy_fields_to_search_nested(self):
+        given = {"name": "s", "tags": ["a", "b"], "template": {"source": {"query": {}}, "lang": "mustache"}}
+        actual = utils.copy_fields_to_search("strategies", given)
+        assert actual["_search"] == {
+            "name": "s",
+            "tags": ["a", "b"],
+            "template": {"source": '{"query": {}}'},
+        }
+    
+    def test_copy_fields_to_search_skips_absent_and_non_object_parents(self):
+        actual = utils.copy_fields_to_search("strategies", {"name": "s", "template": "x"})
+        assert actual["_search"] == {"name": "s"}
+    
+    def test_refresh_policy(self, monkeypatch):
+        assert utils.refresh_policy("true") is True
+        assert utils.refresh_policy("false") is False
+        assert utils.refresh_policy("wait_for") == "wait_for"
+        assert utils.refresh_policy("wait_for", wait_for=False) is True
+        monkeypatch.setattr(utils, "ELASTICSEARCH_REFRESH", "false")
+        assert utils.refresh_policy() is False
+        assert utils.refresh_policy("") is False
+        with pytest.raises(ValueError):
+            utils.refresh_policy("sometimes")
+    
+    def test_search_copy_plan_is_compiled_once(self, monkeypatch):
+        utils.get_search_copy_plan("strategies")
+        def fail(*args, **kwargs):
+            raise AssertionError("index template was read from disk again")
+        monkeypatch.setattr("builtins.open", fail)
+        plan = utils.get_search_copy_plan("strategies")
+        assert ("template", "source") in plan
+        utils.copy_fields_to_search("strategies", {"name": "s"})
\ No newline at end of file
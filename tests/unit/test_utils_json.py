@@ -0,0 +1,106 @@
+"""Unit tests for the JSON backends of utils.serialize(), dumps(), and loads()."""
+
+# Standard packages
+import datetime
+import json
+
+# Third-party packages
+import pytest
+
+# App packages
+from server import utils
+from server.flask import app
+
+# Objects and their fingerprints from json.dumps(obj, separators=(',', ':'),
+# sort_keys=True). These must never change, because fingerprints are stored
+# in evaluations and compared across evaluations.
+CORPUS = {
+    "strategy_template": {"source": {"query": {"multi_match": {"query": "{{ text }}", "fields": ["title^2", "description"], "boost": 1.5}}}, "lang": "mustache"},
+    "scenario_values": {"text": "wireless headphones", "category": "electronics", "min_price": 49.99},
+    "judgement": {"workspace_id": "f0d4a7a4-6b4c-4f7e-9a53-d1b8c7f3e6a2", "scenario_id": "3e4f1a2b-0000-4000-8000-000000000000", "index": "products", "doc_id": "123", "rating": 3},
+    "index_mapping": {"properties": {"title": {"type": "text", "fields": {"keyword": {"type": "keyword", "ignore_above": 256}}}, "price": {"type": "scaled_float", "scaling_factor": 100.0}, "embedding": {"type": "dense_vector", "dims": 384, "similarity": "cosine"}}},
+    "index_shards": {"index": "products", "uuid": "aBcD1234", "shards": [{"id": 0, "max_seq_no": 41}, {"id": 1, "max_seq_no": -1}]},
+    "unsorted_keys": {"b": 1, "a": 2, "B": 3, "_": 4, "aa": {"z": None, "y": True, "x": False}},
+    "unicode": {"text": "caf\u00e9 \u2615 \u65e5\u672c \U0001F600", "caf\u00e9": 1, "\u00e9": 2, "e\u0301": 3},
+    "control_characters": {"text": "line\nbreak\ttab\r\x00\x1f\x7f\"quote\\slash/"},
+    "floats": [0.0, -0.0, 0.1, 1.5, -2.25, 1e-4, 1e-5, 0.00012345, 2.5e-07, 123456789.123, 1e15, 1e16, 1.7976931348623157e308, 5e-324],
+    "non_finite": {"nan": float("nan"), "inf": float("inf"), "-inf": float("-inf"), "none": None},
+    "non_finite_list": [float("nan"), None, 1.5, float("-inf")],
+    "integers": [0, -1, 2 ** 31, 2 ** 53 + 1, 2 ** 63 - 1, 2 ** 64, -(2 ** 70)],
+    "number_like_strings": ["1e5", "0.00001", "12345678901234567890", "3e4f"],
+    "empty": {"list": [], "dict": {}, "string": ""},
+    "nested_lists": [[1, [2, [3, {"k": [4, {"z": 5, "a": 6}]}]]]],
+    "scalar_string": "scenario",
+    "scalar_none": None,
+}
+GOLDEN_FINGERPRINTS = {
+    "strategy_template": "b886d91362f35dd622f48ce89941ab53",
+    "scenario_values": "94e98a476d4bf42897008b5c93c82168",
+    "judgement": "7d0d395433199106ea31b5851da5cf33",
+    "index_mapping": "7cd655dd2834f4f67dfb186fad75fe72",
+    "index_shards": "13cebceb5d5670f4af49e0c438e1fb95",
+    "unsorted_keys": "3ccdeb7d2610bb797b1faf4f7c5e7341",
+    "unicode": "c84565e027da736fee019cfddb3da6a9",
+    "control_characters": "8a93ce8856ae22258e6c27ef398a6fcb",
+    "floats": "76fb0c7100fb8e83bd763ff973ee259e",
+    "non_finite": "8a5d8d370ebb5ccf21ecffcc05d68641",
+    "non_finite_list": "de20f0e286aa7eff2166c33046aed0c3",
+    "integers": "5e16e06dfc97caaf5e3747b0803a4669",
+    "number_like_strings": "bdc1fdb6a7084e2652075a534f172be3",
+    "empty": "36006d02cf2cbc3369699c2bcca21249",
+    "nested_lists": "21a30dc102106d6ce0e220741426ee6d",
+    "scalar_string": "1fa97d627acd28552e4de8cade9ddf46",
+    "scalar_none": "941dffce4e4308ceb33e87326003257d",
+}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    if request.param == "orjson" and utils.orjson is None:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(utils, "JSON_BACKEND", request.param)
+    return request.param
+
+
+@pytest.mark.parametrize("name", sorted(CORPUS))
+def test_fingerprints_match_golden_corpus(backend, name):
+    obj = CORPUS[name]
+    assert utils.serialize(obj) == json.dumps(obj, separators=(',', ':'), sort_keys=True)
+    assert utils.fingerprint(obj) == GOLDEN_FINGERPRINTS[name]
+
+
+def test_serialize_uses_orjson_for_canonical_output(monkeypatch):
+    if utils.orjson is None:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(utils, "JSON_BACKEND", "orjson")
+    monkeypatch.setattr(utils.json, "dumps", lambda *args, **kwargs: pytest.fail("json.dumps should not be called"))
+    for name in ["strategy_template", "scenario_values", "judgement", "index_mapping", "index_shards"]:
+        assert utils.fingerprint(CORPUS[name]) == GOLDEN_FINGERPRINTS[name]
+
+
+def test_fingerprints_distinguish_non_finite_floats_from_null(backend):
+    fingerprints = {utils.fingerprint({"a": value}) for value in [float("nan"), float("inf"), float("-inf"), None]}
+    assert len(fingerprints) == 4
+
+
+def test_serialize_raises_for_unserializable_objects(backend):
+    with pytest.raises(TypeError):
+        utils.serialize({"a": object()})
+
+
+def test_dumps_and_loads_round_trip(backend):
+    obj = {"b": [1, 2.5, None], "a": "caf\u00e9"}
+    assert utils.loads(utils.dumps(obj)) == obj
+    assert utils.dumps(obj, sort_keys=True).index('"a"') < utils.dumps(obj, sort_keys=True).index('"b"')
+    with pytest.raises(json.JSONDecodeError):
+        utils.loads("{not json")
+
+
+def test_flask_responses_match_default_provider(backend):
+    obj = {"b": 2 ** 70, "a": datetime.datetime(2026, 1, 2, 3, 4, 5), "c": "caf\u00e9"}
+    with app.app_context():
+        response = app.json.response(obj)
+        assert json.loads(response.get_data(as_text=True)) == {
+            "a": "Fri, 02 Jan 2026 03:04:05 GMT", "b": 2 ** 70, "c": "caf\u00e9",
+        }
+        assert app.json.loads('{"a": [1]}') == {"a": [1]}
@@ -0,0 +1,216 @@
+"""Unit tests for utils.search_assets."""
+
+# Third-party packages
+import pytest
+
+# App packages
+from server import utils
+
+
+def _hit(_id):
+    return {"_id": _id, "_source": {"name": _id}}
+
+
+def _bucket(key, judgements):
+    return {"key": key, "doc_count": judgements, "judgements": {"doc_count": judgements}}
+
+
+class _MockResponse:
+    def __init__(self, body):
+        self.body = body
+        self.meta = None
+
+
+class MockEsClient:
+    def __init__(self, hits, buckets):
+        self.hits = hits
+        self.buckets = buckets
+        self.calls = []
+
+    def search(self, **kwargs):
+        self.calls.append(("search", kwargs))
+        if "aggs" in kwargs["body"]:
+            return _MockResponse({"aggregations": {"counts": {"buckets": self.buckets}}})
+        return _MockResponse({"hits": {"hits": self.hits}})
+
+
+def test_search_without_counts_is_a_single_search():
+    client = MockEsClient([_hit("a")], [])
+    response = utils.search_assets("scenarios", "w", es_client=client)
+    assert [call for call, _ in client.calls] == ["search"]
+    assert response.body["hits"]["hits"] == [_hit("a")]
+
+
+def test_search_with_counts_counts_only_the_hits():
+    client = MockEsClient([_hit("a"), _hit("b")], [_bucket("a", 5), _bucket("b", 1)])
+    response = utils.search_assets("scenarios", "w", counts=["judgements"], es_client=client)
+
+    assert [call for call, _ in client.calls] == ["search", "search"]
+    counts = client.calls[1][1]
+    assert counts["index"] == "esrs-judgements"
+    assert counts["filter_path"] == "aggregations"
+    assert counts["body"]["query"] == {"terms": {"scenario_id": ["a", "b"]}}
+    assert counts["body"]["aggs"]["counts"]["terms"] == {"field": "scenario_id", "size": 2}
+    assert response.body["aggregations"]["counts"]["buckets"] == [_bucket("a", 5), _bucket("b", 1)]
+
+
+def test_search_with_counts_skips_counts_without_hits():
+    client = MockEsClient([], [])
+    response = utils.search_assets("scenarios", "w", counts=["judgements"], es_client=client)
+    assert [call for call, _ in client.calls] == ["search"]
+    assert "aggregations" not in response.body
+
+
+def test_workspace_counts_are_not_scoped_to_a_workspace():
+    client = MockEsClient([_hit("w")], [_bucket("w", 3)])
+    utils.search_assets("workspaces", counts=["scenarios", "judgements"], es_client=client)
+    counts = client.calls[1][1]
+    assert counts["index"] == "esrs-scenarios,esrs-judgements"
+    assert counts["body"]["query"] == {"terms": {"workspace_id": ["w"]}}
+
+
+class MockPitClient:
+    """Mock client that pages through a point in time with search_after."""
+
+    def __init__(self, ids):
+        self.ids = ids
+        self.calls = []
+
+    def options(self, **kwargs):
+        return self
+
+    def open_point_in_time(self, **kwargs):
+        self.calls.append(("open_point_in_time", kwargs))
+        return _MockResponse({"id": "pit-1"})
+
+    def close_point_in_time(self, **kwargs):
+        self.calls.append(("close_point_in_time", kwargs))
+        return _MockResponse({"succeeded": True})
+
+    def search(self, **kwargs):
+        self.calls.append(("search", kwargs))
+        body = kwargs["body"]
+        start = body.get("search_after", [-1])[-1] + 1
+        hits = [
+            {"_id": self.ids[i], "_source": {}, "sort": [i]}
+            for i in range(start, min(start + body["size"], len(self.ids)))
+        ]
+        return _MockResponse({"pit_id": body["pit"]["id"], "hits": {"hits": hits}})
+
+
+def test_search_with_cursor_pages_through_a_point_in_time():
+    client = MockPitClient(["a", "b", "c", "d", "e"])
+    pages = []
+    cursor = "start"
+    while cursor:
+        response = utils.search_assets("scenarios", "w", text="x", size=2, cursor=cursor, es_client=client)
+        pages.append([hit["_id"] for hit in response.body["hits"]["hits"]])
+        cursor = response.body["next_cursor"]
+    assert pages == [["a", "b"], ["c", "d"], ["e"]]
+
+    searches = [kwargs for call, kwargs in client.calls if call == "search"]
+    assert [kwargs["index"] for kwargs in searches] == [None, None, None]
+    assert all("from" not in kwargs["body"] for kwargs in searches)
+    assert searches[0]["body"]["sort"] == [{"_score": "desc"}, {"_shard_doc": "asc"}]
+    assert searches[0]["body"]["pit"] == {"id": "pit-1", "keep_alive": utils.CURSOR_KEEP_ALIVE}
+    assert "search_after" not in searches[0]["body"]
+    assert searches[2]["body"]["search_after"] == [3]
+    assert [call for call, _ in client.calls if call.endswith("point_in_time")] == [
+        "open_point_in_time", "close_point_in_time",
+    ]
+
+
+class MockScoredPitClient(MockPitClient):
+    """Mock client that sorts hits by the sort of the search, like a point in time."""
+
+    def __init__(self, scores):
+        super().__init__(list(scores))
+        self.scores = scores
+
+    def search(self, **kwargs):
+        self.calls.append(("search", kwargs))
+        body = kwargs["body"]
+        assert body["sort"] == [{"_score": "desc"}, {"_shard_doc": "asc"}]
+        docs = sorted(
+            ([-self.scores[_id], shard_doc] for shard_doc, _id in enumerate(self.ids)),
+        )
+        if body.get("search_after"):
+            score, shard_doc = body["search_after"]
+            docs = [doc for doc in docs if doc > [-score, shard_doc]]
+        hits = [
+            {"_id": self.ids[shard_doc], "_source": {}, "sort": [-score, shard_doc]}
+            for score, shard_doc in docs[:body["size"]]
+        ]
+        return _MockResponse({"pit_id": body["pit"]["id"], "hits": {"hits": hits}})
+
+
+def test_search_with_cursor_keeps_score_order_across_pages():
+    client = MockScoredPitClient({"a": 0.5, "b": 2.0, "c": 1.0, "d": 2.0, "e": 0.1})
+    pages = []
+    cursor = "start"
+    while cursor:
+        response = utils.search_assets("scenarios", "w", text="x", size=2, cursor=cursor, es_client=client)
+        pages.append([hit["_id"] for hit in response.body["hits"]["hits"]])
+        cursor = response.body["next_cursor"]
+    assert pages == [["b", "d"], ["c", "a"], ["e"]]
+
+
+def test_search_with_cursor_keeps_the_given_sort_first():
+    client = MockPitClient(["a"])
+    utils.search_assets(
+        "scenarios", "w", sort={"field": "name", "order": "asc"}, cursor="start", es_client=client,
+    )
+    body = client.calls[1][1]["body"]
+    assert body["sort"] == [{"name": "asc"}, {"_shard_doc": "asc"}]
+
+
+def test_search_with_cursor_rejects_cursor_from_other_search():
+    client = MockPitClient(["a", "b", "c"])
+    response = utils.search_assets("scenarios", "w", text="x", size=2, cursor="start", es_client=client)
+    with pytest.raises(Exception, match="same search inputs"):
+        utils.search_assets("scenarios", "w", text="y", size=2, cursor=response.body["next_cursor"], es_client=client)
+    with pytest.raises(Exception, match="invalid"):
+        utils.search_assets("scenarios", "w", cursor="not a cursor", es_client=client)
+
+
+def test_search_is_trimmed_with_filter_path_and_projection():
+    client = MockEsClient([], [])
+    response = utils.search_assets("evaluations", "w", projection="summary", es_client=client)
+    kwargs = client.calls[0][1]
+    assert kwargs["filter_path"] == utils.FILTER_PATH_SEARCH
+    assert kwargs["body"]["_source"] == {"excludes": ["_search", "results", "runtime", "unrated_docs"]}
+    assert response.body["hits"]["hits"] == []
+
+
+@pytest.mark.parametrize("projection, expected", [
+    (None, {"excludes": ["_search"]}),
+    ("full", {"excludes": ["_search"]}),
+    ("summary", {"excludes": ["_search", "rounds"]}),
+    (["title", "@meta"], {"excludes": ["_search"], "includes": ["title", "@meta"]}),
+])
+def test_source_projection(projection, expected):
+    assert utils.source_projection("conversations", projection) == expected
+
+
+@pytest.mark.parametrize("projection", ["everything", [1, 2], {"includes": ["name"]}])
+def test_source_projection_rejects_unknown_projections(projection):
+    with pytest.raises(Exception, match="projection"):
+        utils.source_projection("scenarios", projection)
+
+
+def test_get_asset_is_trimmed_with_filter_path_and_projection():
+    calls = []
+
+    class MockGetClient:
+        def get(self, **kwargs):
+            calls.append(kwargs)
+            return _MockResponse({"_id": kwargs["id"], "_source": {}})
+
+    utils.get_asset("evaluations", "e", projection=["@meta.status"], es_client=MockGetClient())
+    assert calls == [{
+        "index": "esrs-evaluations",
+        "id": "e",
+        "source_includes": ["@meta.status"],
+        "source_excludes": ["_search"],
+        "filter_path": utils.FILTER_PATH_GET,
+    }]